@@ -0,0 +1,312 @@
+from typing import List, Dict, Iterable, Iterator
+from functools import partial
+from transcript_cache import get_transcript
+from profiling import stage, timed, timed_iter
+from search_index import index_segments
+from stage_cache import capture_output, run_staged_analysis
+from windowing import TranscriptWindower, topic_shift_boundaries
+from columnar_transcript import as_columnar
+from topic_classifier import get_topic_classifier
+from cognitive_scorer import get_cognitive_scorer
+from pipeline import AnalysisStages
+import random
+from datetime import timedelta
+
+def format_timestamp(seconds: float) -> str:
+    """Convert seconds to HH:MM:SS format"""
+    return str(timedelta(seconds=int(seconds))).zfill(8)
+
+# Bounds for the random segment length, in seconds
+MIN_SEGMENT_DURATION = 30
+MAX_SEGMENT_DURATION = 120
+# random: lengths drawn between the bounds; topic: cut where the vocabulary changes
+SEGMENTATION_MODES = ("random", "topic")
+
+def get_random_segment_duration(min_duration: int = MIN_SEGMENT_DURATION,
+                                max_duration: int = MAX_SEGMENT_DURATION) -> int:
+    """Generate random segment duration between 30 and 120 seconds"""
+    return random.randint(min_duration, max_duration)
+
+# Topics per subject; other subjects are classified against Math's
+TOPICS = {
+    "Math": [
+        "Number Operations",
+        "Problem Solving",
+        "Logical Reasoning",
+        "Pattern Recognition",
+        "Mathematical Concepts",
+        "Practical Applications"
+    ],
+    "Science": [
+        "Scientific Principles",
+        "Natural Phenomena",
+        "Experimental Methods",
+        "Scientific Reasoning",
+        "Real-world Applications",
+        "Data Analysis"
+    ]
+}
+
+def get_topics_by_subject(texts: List[str], subject: str) -> List[str]:
+    """Classify the topic of each segment text (deterministic, cached by text)"""
+    return get_topic_classifier(TOPICS, default_subject="Math").classify_batch(texts, subject)
+
+# Cognitive abilities with their descriptions
+COGNITIVE_TYPES = {
+    "attention": "Ability to focus on specific details and maintain concentration",
+    "memory": "Ability to retain and recall information effectively",
+    "logic_and_reasoning": "Ability to analyze problems and think critically",
+    "auditory_processing": "Ability to understand and process spoken information",
+    "visual_processing": "Ability to interpret and understand visual information",
+    "processing_speed": "Speed at which information is processed and understood"
+}
+
+def get_cognitive_types(windows: List[tuple], transcript, count: int = 2) -> List[List[tuple]]:
+    """The most demanded cognitive abilities, with descriptions, for each window"""
+    rankings = get_cognitive_scorer().rank_windows(as_columnar(transcript), windows)
+    return [[(ability, COGNITIVE_TYPES[ability]) for ability in ranked[:count]] for ranked in rankings]
+
+def analyze_video(youtube_id: str, subject: str,
+                  min_duration: int = MIN_SEGMENT_DURATION,
+                  max_duration: int = MAX_SEGMENT_DURATION,
+                  segmentation: str = "random"):
+    """
+    Analyze video and generate three different analyses:
+    1. Transcript with timestamps
+    2. Topics with timestamps
+    3. Cognitive abilities with timestamps
+    """
+    try:
+        # Get the transcript
+        print("\nFetching video transcript...")
+        transcript = get_transcript(youtube_id)
+        
+        print("Processing video segments...")
+        return analyze_transcript(transcript, subject, min_duration, max_duration, segmentation)
+        
+    except Exception as e:
+        print(f"Error processing video: {e}")
+        return [], [], []
+
+def iter_windows(transcript,
+                 min_duration: int = MIN_SEGMENT_DURATION,
+                 max_duration: int = MAX_SEGMENT_DURATION,
+                 segmentation: str = "random") -> Iterator[tuple]:
+    """
+    Yield (start_time, end_time, text) for each window: random lengths
+    between the bounds, or with segmentation="topic" windows that end
+    where the vocabulary changes, still between the bounds. Topic windows
+    also carry the caption range first, stop they were cut from.
+    """
+    transcript = as_columnar(transcript)
+    total_duration = transcript.end_time
+    
+    if segmentation == "topic":
+        starts = transcript.starts
+        boundaries = topic_shift_boundaries(transcript, min_duration, max_duration)
+        for first, stop in boundaries:
+            # Windows tile the video like the random ones: each runs to the next one's start
+            start_time = starts[first] if first else 0
+            end_time = starts[stop] if stop < len(transcript) else total_duration
+            yield start_time, end_time, transcript.text_range(first, stop), first, stop
+        return
+    windower = TranscriptWindower(transcript)
+    
+    current_time = 0
+    while current_time < total_duration:
+        # Get random duration for this segment
+        segment_duration = get_random_segment_duration(min_duration, max_duration)
+        end_time = min(current_time + segment_duration, total_duration)
+        
+        # Collect transcript text for this segment
+        yield current_time, end_time, windower.text_between(current_time, end_time)
+        
+        current_time = end_time
+
+@timed("tag")
+def tag_segments(windows: List[tuple], subject: str, transcript) -> List[Dict]:
+    """Pick the topic and cognitive abilities for a batch of (start, end, text) windows"""
+    topics = get_topics_by_subject([window[2] for window in windows], subject)
+    return [
+        {'topic': topic, 'cognitive_types': cognitive_types}
+        for topic, cognitive_types in zip(topics, get_cognitive_types(windows, transcript))
+    ]
+
+def tag_segment(window: tuple, subject: str, transcript) -> Dict:
+    """Pick the topic and cognitive abilities for one window"""
+    return tag_segments([window], subject, transcript)[0]
+
+def make_analysis(start_time: float, end_time: float, text: str, tags: Dict) -> tuple:
+    """Split a tagged window into its transcript, topic and cognitive entries"""
+    # Create timestamp string
+    timestamp = f"{format_timestamp(start_time)} - {format_timestamp(end_time)}"
+    return (
+        {'timestamp': timestamp, 'text': text, 'start_time': start_time, 'end_time': end_time},
+        {'timestamp': timestamp, 'topic': tags['topic']},
+        {'timestamp': timestamp, 'cognitive_types': tags['cognitive_types']}
+    )
+
+def iter_analysis(transcript, subject: str,
+                  min_duration: int = MIN_SEGMENT_DURATION,
+                  max_duration: int = MAX_SEGMENT_DURATION,
+                  segmentation: str = "random") -> Iterator[tuple]:
+    """
+    Yield (transcript, topic, cognitive) entries for one segment at a time,
+    as soon as its window closes
+    """
+    transcript = as_columnar(transcript)
+    windows = timed_iter(iter_windows(transcript, min_duration, max_duration, segmentation), "window")
+    for window in windows:
+        yield make_analysis(*window[:3], tag_segment(window, subject, transcript))
+
+def analyze_transcript(transcript, subject: str,
+                       min_duration: int = MIN_SEGMENT_DURATION,
+                       max_duration: int = MAX_SEGMENT_DURATION,
+                       segmentation: str = "random"):
+    """Run the three analyses over an already fetched transcript"""
+    # Initialize our analysis segments
+    transcript_segments = []
+    topic_segments = []
+    cognitive_segments = []
+    
+    # Tag every window in one batch rather than one at a time
+    transcript = as_columnar(transcript)
+    windows = list(timed_iter(iter_windows(transcript, min_duration, max_duration, segmentation), "window"))
+    tags = tag_segments(windows, subject, transcript)
+    analyses = (make_analysis(*window[:3], tag) for window, tag in zip(windows, tags))
+    for transcript_segment, topic_segment, cognitive_segment in analyses:
+        # Add to our three analyses
+        transcript_segments.append(transcript_segment)
+        topic_segments.append(topic_segment)
+        cognitive_segments.append(cognitive_segment)
+    
+    return transcript_segments, topic_segments, cognitive_segments
+
+def stream_analysis(youtube_id: str, subject: str,
+                    min_duration: int = MIN_SEGMENT_DURATION,
+                    max_duration: int = MAX_SEGMENT_DURATION,
+                    segmentation: str = "random") -> Iterator[tuple]:
+    """analyze_video as a generator, for incremental display"""
+    try:
+        print("\nFetching video transcript...")
+        transcript = get_transcript(youtube_id)
+        
+        print("Processing video segments...")
+        yield from iter_analysis(transcript, subject, min_duration, max_duration, segmentation)
+        
+    except Exception as e:
+        print(f"Error processing video: {e}")
+
+@timed("render")
+def display_analysis(transcript_segments, topic_segments, cognitive_segments):
+    """Display all three analyses in a clear, formatted way"""
+    
+    print("\n1. TRANSCRIPT ANALYSIS")
+    print("=" * 80)
+    for segment in transcript_segments:
+        print(f"\nTimestamp: {segment['timestamp']}")
+        print(f"Transcript: {segment['text']}")
+        print("-" * 80)
+    
+    print("\n2. TOPIC ANALYSIS")
+    print("=" * 80)
+    for segment in topic_segments:
+        print(f"\nTimestamp: {segment['timestamp']}")
+        print(f"Topic: {segment['topic']}")
+        print("-" * 80)
+    
+    print("\n3. COGNITIVE ABILITY ANALYSIS")
+    print("=" * 80)
+    for segment in cognitive_segments:
+        print(f"\nTimestamp: {segment['timestamp']}")
+        print("Cognitive Types:")
+        for cog_type, description in segment['cognitive_types']:
+            print(f"  - {cog_type.replace('_', ' ').title()}: {description}")
+        print("-" * 80)
+
+def display_analysis_stream(segments: Iterable[tuple]) -> int:
+    """
+    Render segments lazily as they arrive, with all three analyses of a
+    segment printed together. Returns how many segments were shown.
+    """
+    shown = 0
+    # Timed per segment, like display_segments: the upstream stages time themselves
+    for transcript_segment, topic_segment, cognitive_segment in segments:
+        with stage("render"):
+            if shown == 0:
+                print("\nSEGMENT ANALYSIS")
+                print("=" * 80)
+            shown += 1
+            print(f"\nSegment {shown} | Timestamp: {transcript_segment['timestamp']}")
+            print(f"Transcript: {transcript_segment['text']}")
+            print(f"Topic: {topic_segment['topic']}")
+            print("Cognitive Types:")
+            for cog_type, description in cognitive_segment['cognitive_types']:
+                print(f"  - {cog_type.replace('_', ' ').title()}: {description}")
+            print("-" * 80)
+    return shown
+
+def staged_analysis(youtube_id: str, subject: str,
+                    min_duration: int = MIN_SEGMENT_DURATION,
+                    max_duration: int = MAX_SEGMENT_DURATION,
+                    segmentation: str = "random") -> str:
+    """Analysis through the stage cache; returns the rendered output"""
+    def render(windows, tags):
+        analyses = [make_analysis(*window[:3], tag) for window, tag in zip(windows, tags)]
+        return capture_output(display_analysis, *zip(*analyses))
+    
+    window_config = {'min_duration': min_duration, 'max_duration': max_duration}
+    if segmentation != "random":
+        # Random windows keep their existing cache entries
+        window_config['segmentation'] = segmentation
+    return run_staged_analysis(
+        youtube_id, subject, "analysis",
+        window_fn=lambda transcript, min_duration, max_duration, segmentation="random": list(
+            iter_windows(transcript, min_duration, max_duration, segmentation)
+        ),
+        window_config=window_config,
+        tag_fn=lambda windows, subject: tag_segments(windows, subject, get_transcript(youtube_id)),
+        render_fn=render
+    )
+
+def list_windows(transcript,
+                 min_duration: int = MIN_SEGMENT_DURATION,
+                 max_duration: int = MAX_SEGMENT_DURATION,
+                 segmentation: str = "random") -> List[tuple]:
+    """Every window of a transcript, timed as the window stage"""
+    return list(timed_iter(iter_windows(transcript, min_duration, max_duration, segmentation), "window"))
+
+def render_batch(windows: List[tuple], tags: List[Dict]) -> Dict:
+    """Tagged windows in the shape written by --batch"""
+    analyses = [make_analysis(*window[:3], tag) for window, tag in zip(windows, tags)]
+    transcript_segments, topic_segments, cognitive_segments = (
+        [list(column) for column in zip(*analyses)] if analyses else ([], [], [])
+    )
+    return {
+        'transcript': transcript_segments,
+        'topics': topic_segments,
+        'cognitive': cognitive_segments
+    }
+
+def analysis_stages(min_duration: int = MIN_SEGMENT_DURATION,
+                    max_duration: int = MAX_SEGMENT_DURATION,
+                    segmentation: str = "random") -> AnalysisStages:
+    """The --batch analysis as window, tag and render stages for the pipeline"""
+    return AnalysisStages(
+        window=partial(list_windows, min_duration=min_duration, max_duration=max_duration,
+                       segmentation=segmentation),
+        tag=tag_segments,
+        render=render_batch
+    )
+
+def batch_analysis(transcript, subject: str,
+                   min_duration: int = MIN_SEGMENT_DURATION,
+                   max_duration: int = MAX_SEGMENT_DURATION,
+                   segmentation: str = "random") -> Dict:
+    """analyze_transcript output in the shape written by --batch"""
+    return analysis_stages(min_duration, max_duration, segmentation).analyze(transcript, subject)
+
+def index_analysis(youtube_id: str, analysis: Dict):
+    """Replace this video's segments in the search index"""
+    index_segments(youtube_id, ((segment['start_time'], segment['end_time'], segment['text'])
+                                for segment in analysis['transcript']))
@@ -0,0 +1,206 @@
+import asyncio
+import inspect
+import json
+import random
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List, Optional, Sequence
+from urllib.parse import quote, urlsplit
+
+from transcript_cache import DEFAULT_LANGUAGES, TranscriptCache, fetch_from_youtube
+
+DEFAULT_CONCURRENCY = 16
+DEFAULT_TIMEOUT = 30.0  # seconds per attempt
+DEFAULT_RETRIES = 3
+DEFAULT_BACKOFF_BASE = 0.5
+DEFAULT_BACKOFF_MAX = 10.0
+
+# youtube_transcript_api errors that no amount of retrying will fix
+PERMANENT_ERRORS = {
+    "TranscriptsDisabled",
+    "NoTranscriptFound",
+    "NoTranscriptAvailable",
+    "VideoUnavailable",
+    "InvalidVideoId",
+}
+
+
+class PermanentFetchError(Exception):
+    """Raised by a transcript source when retrying cannot help"""
+
+
+def is_retryable(error: Exception) -> bool:
+    """Decide whether a failed fetch is worth another attempt"""
+    if isinstance(error, PermanentFetchError):
+        return False
+    return type(error).__name__ not in PERMANENT_ERRORS
+
+
+class HTTPTranscriptSource:
+    """
+    Async transcript source that reads JSON from an HTTP endpoint:
+        GET <base_url>/transcripts/<youtube_id>?languages=en,de
+    Uses plain asyncio streams so many requests can be in flight without
+    extra dependencies. Meant for a local stand-in server or a mirror.
+    """
+    def __init__(self, base_url: str):
+        parts = urlsplit(base_url)
+        if parts.scheme != "http":
+            raise ValueError("HTTPTranscriptSource only supports http:// URLs")
+        self.host = parts.hostname
+        self.port = parts.port or 80
+        self.prefix = parts.path.rstrip("/")
+
+    async def __call__(self, youtube_id: str, languages: Sequence[str]) -> List[Dict]:
+        path = f"{self.prefix}/transcripts/{quote(youtube_id)}?languages={quote(','.join(languages))}"
+        reader, writer = await asyncio.open_connection(self.host, self.port)
+        try:
+            writer.write(
+                f"GET {path} HTTP/1.0\r\nHost: {self.host}\r\nAccept: application/json\r\n\r\n".encode("ascii")
+            )
+            await writer.drain()
+            response = await reader.read()
+        finally:
+            writer.close()
+
+        head, _, body = response.partition(b"\r\n\r\n")
+        status = int(head.split(b" ", 2)[1])
+        if status == 404:
+            raise PermanentFetchError(f"no transcript for {youtube_id}")
+        if status != 200:
+            raise ConnectionError(f"HTTP {status} fetching {youtube_id}")
+        return json.loads(body)
+
+
+class AsyncTranscriptFetcher:
+    """
+    Fetches many transcripts concurrently.
+    - a semaphore bounds how many requests are in flight
+    - every attempt gets its own timeout
+    - failures are retried with exponential backoff and full jitter
+    - results go through the TranscriptCache when one is given
+    The source can be a plain function or an async function, e.g.
+    HTTPTranscriptSource. Plain functions run on the fetcher's own pool
+    of max_concurrency threads; a thread cannot be cancelled, so one that
+    outlives its timeout keeps its slot until it returns, and hung
+    fetches never push the number of running calls past the bound.
+    close() shuts the pool down.
+    """
+    def __init__(self,
+                 source: Callable = fetch_from_youtube,
+                 cache: Optional[TranscriptCache] = None,
+                 max_concurrency: int = DEFAULT_CONCURRENCY,
+                 timeout: float = DEFAULT_TIMEOUT,
+                 retries: int = DEFAULT_RETRIES,
+                 backoff_base: float = DEFAULT_BACKOFF_BASE,
+                 backoff_max: float = DEFAULT_BACKOFF_MAX):
+        self.source = source
+        self.cache = cache
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.attempts = 0
+        self.retried = 0
+        self._semaphore = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._is_async = inspect.iscoroutinefunction(source) or inspect.iscoroutinefunction(
+            getattr(source, "__call__", None))
+
+    async def _attempt(self, youtube_id: str, languages: Sequence[str]) -> List[Dict]:
+        """One call to the source, holding a concurrency slot while it runs"""
+        if self._is_async:
+            async with self._semaphore:
+                return await asyncio.wait_for(self.source(youtube_id, languages), self.timeout)
+
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_concurrency,
+                                                thread_name_prefix="transcript-fetch")
+        await self._semaphore.acquire()
+        try:
+            future = asyncio.get_running_loop().run_in_executor(
+                self._executor, self.source, youtube_id, languages)
+        except BaseException:
+            self._semaphore.release()
+            raise
+
+        def finished(done):
+            # The slot belongs to the thread, not to whoever stopped waiting for it
+            self._semaphore.release()
+            if not done.cancelled():
+                done.exception()  # retrieved, so an abandoned failure is not reported as unhandled
+
+        future.add_done_callback(finished)
+        # shield: a timeout stops our wait but must not mark the running call done
+        return await asyncio.wait_for(asyncio.shield(future), self.timeout)
+
+    def backoff_delay(self, attempt: int) -> float:
+        """Full-jitter exponential backoff for the given retry number"""
+        ceiling = min(self.backoff_max, self.backoff_base * (2 ** attempt))
+        return random.uniform(0, ceiling)
+
+    async def _fetch_from_source(self, youtube_id: str, languages: Sequence[str]) -> List[Dict]:
+        attempt = 0
+        while True:
+            self.attempts += 1
+            try:
+                return await self._attempt(youtube_id, languages)
+            except Exception as e:
+                if attempt >= self.retries or not is_retryable(e):
+                    raise
+            self.retried += 1
+            # Sleep outside the semaphore so waiting retries don't hold a slot
+            await asyncio.sleep(self.backoff_delay(attempt))
+            attempt += 1
+
+    async def fetch(self, youtube_id: str, languages: Sequence[str] = DEFAULT_LANGUAGES) -> List[Dict]:
+        """Fetch one transcript, consulting the cache first"""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        languages = tuple(languages)
+        if self.cache is not None:
+            cached = await asyncio.to_thread(self.cache.lookup, youtube_id, languages)
+            if cached is not None:
+                return cached
+
+        try:
+            transcript = await self._fetch_from_source(youtube_id, languages)
+        except Exception:
+            if self.cache is None:
+                raise
+            stale = await asyncio.to_thread(self.cache.lookup_stale, youtube_id, languages)
+            if stale is None:
+                raise
+            return stale
+
+        if self.cache is not None:
+            await asyncio.to_thread(self.cache.store, youtube_id, languages, transcript)
+        return transcript
+
+    def close(self):
+        """Shut down the thread pool for blocking sources; hung calls are left to finish on their own"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    async def fetch_many(self, youtube_ids: Iterable[str],
+                         languages: Sequence[str] = DEFAULT_LANGUAGES) -> Dict[str, object]:
+        """
+        Fetch every id concurrently. The result maps each youtube_id to its
+        transcript, or to the exception that made it fail.
+        """
+        youtube_ids = list(dict.fromkeys(youtube_ids))
+        results = await asyncio.gather(
+            *(self.fetch(youtube_id, languages) for youtube_id in youtube_ids),
+            return_exceptions=True
+        )
+        return dict(zip(youtube_ids, results))
+
+
+def fetch_all(youtube_ids: Iterable[str], **fetcher_options) -> Dict[str, object]:
+    """Blocking convenience wrapper around AsyncTranscriptFetcher.fetch_many"""
+    fetcher = AsyncTranscriptFetcher(**fetcher_options)
+    try:
+        return asyncio.run(fetcher.fetch_many(youtube_ids))
+    finally:
+        fetcher.close()
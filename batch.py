@@ -0,0 +1,244 @@
+import json
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import asdict
+from datetime import datetime
+from functools import partial
+from typing import Callable, Dict, List, Optional
+
+from pipeline import DEFAULT_QUEUE_SIZE, analyze_videos
+from transcript_cache import atomic_write, format_cache_stats, get_default_cache, get_transcript
+
+DEFAULT_OUTPUT = "batch_results.json"
+DEFAULT_WORKERS = 8
+
+
+def fetch_transcripts(youtube_ids: List[str], max_workers: int = DEFAULT_WORKERS,
+                      fetcher: str = "threads"):
+    """
+    Fetch each transcript once, either on a bounded thread pool or through
+    the asyncio fetcher with max_workers requests in flight.
+    Returns (transcripts, errors, latencies) keyed by youtube_id.
+    """
+    if fetcher == "async":
+        return fetch_transcripts_async(youtube_ids, max_workers)
+
+    transcripts, errors, latencies = {}, {}, {}
+
+    def timed_fetch(youtube_id):
+        started = time.perf_counter()
+        try:
+            return get_transcript(youtube_id)
+        finally:
+            latencies[youtube_id] = time.perf_counter() - started
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = {pool.submit(timed_fetch, youtube_id): youtube_id for youtube_id in youtube_ids}
+        for future in as_completed(futures):
+            youtube_id = futures[future]
+            try:
+                transcripts[youtube_id] = future.result()
+            except Exception as e:
+                errors[youtube_id] = str(e)
+    return transcripts, errors, latencies
+
+
+def fetch_transcripts_async(youtube_ids: List[str], max_concurrency: int = DEFAULT_WORKERS):
+    """fetch_transcripts on top of AsyncTranscriptFetcher"""
+    # asyncio is only worth importing when the async fetcher is picked
+    import asyncio
+    from async_fetch import AsyncTranscriptFetcher
+
+    cache = get_default_cache()
+    fetcher = AsyncTranscriptFetcher(source=cache.source, cache=cache, max_concurrency=max_concurrency)
+    transcripts, errors, latencies = {}, {}, {}
+
+    async def timed_fetch(youtube_id):
+        started = time.perf_counter()
+        try:
+            transcripts[youtube_id] = await fetcher.fetch(youtube_id)
+        except Exception as e:
+            errors[youtube_id] = str(e)
+        finally:
+            latencies[youtube_id] = time.perf_counter() - started
+
+    async def fetch_everything():
+        await asyncio.gather(*(timed_fetch(youtube_id) for youtube_id in youtube_ids))
+
+    try:
+        asyncio.run(fetch_everything())
+    finally:
+        fetcher.close()
+    return transcripts, errors, latencies
+
+
+def run_batch(catalog,
+              analyze_fn,
+              output_path: str = DEFAULT_OUTPUT,
+              max_workers: int = DEFAULT_WORKERS,
+              fetcher: str = "threads",
+              on_result: Optional[Callable] = None,
+              queue_size: int = DEFAULT_QUEUE_SIZE,
+              processes: int = 0) -> Dict:
+    """
+    Analyze every video in the catalog without prompting and write all
+    results to a single JSON file. analyze_fn is the script's
+    AnalysisStages, or any analyze_fn(transcript, subject); the result
+    must be JSON serializable. on_result(youtube_id, analysis), if given,
+    is called after each successful analysis.
+
+    By default videos stream through the analysis pipeline, so later
+    transcripts are fetched while earlier ones are tagged and rendered.
+    With processes > 0 every transcript is fetched first, placed in
+    shared memory, and analyzed on that many worker processes.
+    """
+    wall_started = time.perf_counter()
+    videos = list(catalog)
+    unique_ids = list(dict.fromkeys(video.youtube_id for video in videos))
+
+    print(f"\nBatch analysis: {len(videos)} videos, {len(unique_ids)} unique transcripts")
+    if processes:
+        outcomes = _process_outcomes(videos, unique_ids, analyze_fn, max_workers, fetcher, processes)
+    else:
+        outcomes = _pipelined_outcomes(videos, unique_ids, analyze_fn, max_workers, fetcher, queue_size)
+
+    results: List[Optional[Dict]] = [None] * len(videos)
+    for index, analysis, error, fetch_seconds, analyze_seconds in outcomes:
+        video = videos[index]
+        record = asdict(video)
+        if error is not None:
+            record['error'] = error
+        else:
+            record['analysis'] = analysis
+            if on_result is not None:
+                try:
+                    on_result(video.youtube_id, analysis)
+                except Exception as e:
+                    record['error'] = str(e)
+        record['fetch_seconds'] = fetch_seconds
+        record['analyze_seconds'] = analyze_seconds
+        results[index] = record
+
+    wall_seconds = time.perf_counter() - wall_started
+    summary = summarize(results, wall_seconds)
+    summary['transcript_cache'] = get_default_cache().stats()
+
+    payload = {
+        'generated_at': datetime.now().isoformat(timespec='seconds'),
+        'summary': summary,
+        'videos': results
+    }
+    atomic_write(output_path, json.dumps(payload, indent=2).encode('utf-8'))
+
+    print_summary(summary)
+    print(f"\nResults written to {output_path}")
+    return summary
+
+
+def _pipelined_outcomes(videos, unique_ids, analyze_fn, max_workers, fetcher, queue_size):
+    """(index, analysis, error, fetch seconds, analyze seconds) per video, from the pipeline"""
+    fetch, fetch_latencies = get_transcript, {}
+    if fetcher == "async":
+        # The async fetcher works on the whole list at once, so it runs first
+        print(f"Fetching transcripts with {max_workers} async workers...")
+        transcripts, errors, fetch_latencies = fetch_transcripts_async(unique_ids, max_workers)
+        fetch = partial(_prefetched, transcripts, errors)
+        print("Analyzing videos...")
+    else:
+        print(f"Fetching and analyzing with {max_workers} fetch threads...")
+
+    for item in analyze_videos(videos, analyze_fn, fetch, max_workers, queue_size):
+        job = item.value
+        yield (item.index, job.result, item.error,
+               fetch_latencies.get(job.video.youtube_id, item.seconds.get('fetch', 0.0)),
+               sum(seconds for stage, seconds in item.seconds.items() if stage != 'fetch'))
+
+
+def _process_outcomes(videos, unique_ids, analyze_fn, max_workers, fetcher, processes):
+    """The same outcomes, analyzed on a process pool over shared-memory transcripts"""
+    # multiprocessing and its executor cost a noticeable share of startup; only --processes needs them
+    from process_pool import analyze_in_processes
+    from shared_transcripts import SharedTranscripts
+
+    print(f"Fetching transcripts with {max_workers} {fetcher} workers...")
+    transcripts, errors, fetch_latencies = fetch_transcripts(unique_ids, max_workers, fetcher)
+    for index, video in enumerate(videos):
+        if video.youtube_id in errors:
+            yield index, None, errors[video.youtube_id], fetch_latencies.get(video.youtube_id, 0.0), 0.0
+
+    print(f"Analyzing videos on {processes} processes...")
+    jobs = [(video.youtube_id, video.subject) for video in videos if video.youtube_id in transcripts]
+    positions = [index for index, video in enumerate(videos) if video.youtube_id in transcripts]
+    with SharedTranscripts.create(transcripts) as shared:
+        # The columnar copies in shared memory are all the workers need
+        transcripts.clear()
+        for job, analysis, error, seconds in analyze_in_processes(jobs, analyze_fn, shared, processes):
+            index = positions[job]
+            yield index, analysis, error, fetch_latencies.get(videos[index].youtube_id, 0.0), seconds
+
+
+def _prefetched(transcripts: Dict, errors: Dict, youtube_id: str):
+    """Fetch stage for transcripts the async fetcher already got"""
+    if youtube_id in errors:
+        raise RuntimeError(errors[youtube_id])
+    return transcripts[youtube_id]
+
+
+def summarize(results: List[Dict], wall_seconds: float) -> Dict:
+    """Wall time plus per-video latency statistics"""
+    totals = [r['fetch_seconds'] + r['analyze_seconds'] for r in results]
+    return {
+        'videos': len(results),
+        'failed': sum(1 for r in results if 'error' in r),
+        'wall_seconds': wall_seconds,
+        'latency_seconds': {
+            'min': min(totals, default=0.0),
+            'median': statistics.median(totals) if totals else 0.0,
+            'max': max(totals, default=0.0)
+        },
+        'per_video': [
+            {
+                'title': r['title'],
+                'youtube_id': r['youtube_id'],
+                'fetch_seconds': r['fetch_seconds'],
+                'analyze_seconds': r['analyze_seconds'],
+                'ok': 'error' not in r
+            }
+            for r in results
+        ]
+    }
+
+
+def print_summary(summary: Dict):
+    """Print the batch summary table"""
+    print("\nBATCH SUMMARY")
+    print("=" * 80)
+    for row in summary['per_video']:
+        status = "ok" if row['ok'] else "FAILED"
+        print(f"{row['title'][:40]:<40} {row['youtube_id']:<12} "
+              f"fetch {row['fetch_seconds']:7.3f}s  analyze {row['analyze_seconds']:7.3f}s  {status}")
+    print("-" * 80)
+    latency = summary['latency_seconds']
+    print(f"Videos: {summary['videos']} ({summary['failed']} failed)")
+    print(f"Wall time: {summary['wall_seconds']:.3f}s")
+    print(f"Per-video latency: min {latency['min']:.3f}s, "
+          f"median {latency['median']:.3f}s, max {latency['max']:.3f}s")
+    print(format_cache_stats(summary['transcript_cache']))
+
+
+def add_batch_arguments(parser):
+    """Register the --batch options on a script's argument parser"""
+    parser.add_argument('--batch', action='store_true',
+                        help='analyze every video in the catalog without prompting')
+    parser.add_argument('--output', default=DEFAULT_OUTPUT,
+                        help=f'where --batch writes its results (default: {DEFAULT_OUTPUT})')
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS,
+                        help=f'concurrent transcript fetches in --batch mode (default: {DEFAULT_WORKERS})')
+    parser.add_argument('--fetcher', choices=['threads', 'async'], default='threads',
+                        help='how --batch fetches transcripts (default: threads)')
+    parser.add_argument('--processes', type=int, default=0,
+                        help='analyze on this many worker processes over shared-memory transcripts '
+                             '(default: 0, the threaded pipeline)')
+    parser.add_argument('--queue-size', type=int, default=DEFAULT_QUEUE_SIZE,
+                        help=f'videos a --batch stage may run ahead of the next one (default: {DEFAULT_QUEUE_SIZE})')
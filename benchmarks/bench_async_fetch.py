@@ -0,0 +1,63 @@
+"""
+Compare sequential blocking transcript fetches with AsyncTranscriptFetcher
+against the local stand-in server (no network needed).
+
+    python benchmarks/bench_async_fetch.py --videos 200 --latency 0.1
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from urllib.request import urlopen
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from async_fetch import AsyncTranscriptFetcher, HTTPTranscriptSource  # noqa: E402
+from stand_in_server import start_server  # noqa: E402
+
+
+def fetch_sequential(base_url, youtube_ids):
+    for youtube_id in youtube_ids:
+        with urlopen(f"{base_url}/transcripts/{youtube_id}") as response:
+            json.load(response)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark transcript fetching")
+    parser.add_argument('--videos', type=int, default=200)
+    parser.add_argument('--latency', type=float, default=0.1)
+    parser.add_argument('--failure-rate', type=float, default=0.05)
+    parser.add_argument('--concurrency', type=int, default=32)
+    args = parser.parse_args()
+
+    server = start_server(latency=args.latency, failure_rate=args.failure_rate)
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    youtube_ids = [f"vid{i:06d}" for i in range(args.videos)]
+    results = {'videos': args.videos, 'latency': args.latency, 'failure_rate': args.failure_rate}
+
+    # Sequential baseline runs without injected failures so it can finish
+    server.RequestHandlerClass.failure_rate = 0.0
+    started = time.perf_counter()
+    fetch_sequential(base_url, youtube_ids)
+    results['sequential_seconds'] = time.perf_counter() - started
+    server.RequestHandlerClass.failure_rate = args.failure_rate
+
+    fetcher = AsyncTranscriptFetcher(source=HTTPTranscriptSource(base_url),
+                                     max_concurrency=args.concurrency,
+                                     timeout=5.0, backoff_base=0.05)
+    started = time.perf_counter()
+    fetched = asyncio.run(fetcher.fetch_many(youtube_ids))
+    results['async_seconds'] = time.perf_counter() - started
+    results['async_failed'] = sum(1 for value in fetched.values() if isinstance(value, Exception))
+    results['async_attempts'] = fetcher.attempts
+    results['async_retried'] = fetcher.retried
+    results['speedup'] = results['sequential_seconds'] / results['async_seconds']
+
+    server.shutdown()
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
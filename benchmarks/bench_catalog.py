@@ -0,0 +1,66 @@
+"""
+Catalog startup and lookup cost as the catalog grows, JSON vs SQLite.
+
+    python benchmarks/bench_catalog.py --videos 1000 10000 100000
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from catalog import Video, load_catalog  # noqa: E402
+from synthetic import synthetic_catalog  # noqa: E402
+
+
+def elapsed(fn):
+    started = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - started, result
+
+
+def measure(path, lookup_id):
+    """Open, first menu listing and id lookup timings for one catalog file"""
+    open_seconds, catalog = elapsed(lambda: load_catalog(path))
+
+    def first_menu():
+        grade = catalog.grades()[0]
+        return catalog.videos(grade, catalog.subjects(grade)[0])
+
+    menu_seconds, _ = elapsed(first_menu)
+    lookups = 1000
+    lookup_seconds, _ = elapsed(lambda: [catalog.get(lookup_id) for _ in range(lookups)])
+    return {
+        'open_ms': open_seconds * 1000,
+        'first_menu_ms': menu_seconds * 1000,
+        'lookup_us': lookup_seconds / lookups * 1e6
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark catalog loading and lookups")
+    parser.add_argument('--videos', type=int, nargs='+', default=[1_000, 10_000, 100_000])
+    args = parser.parse_args()
+
+    results = []
+    with tempfile.TemporaryDirectory() as workdir:
+        for size in args.videos:
+            records = synthetic_catalog(size, seed=size)
+            json_path = os.path.join(workdir, f"catalog_{size}.json")
+            with open(json_path, 'w', encoding='utf-8') as f:
+                json.dump(records, f)
+            db_path = os.path.join(workdir, f"catalog_{size}.db")
+            load_catalog(db_path).replace_all([Video(**record) for record in records])
+
+            lookup_id = records[size // 2]['youtube_id']
+            for backend, path in (('json', json_path), ('sqlite', db_path)):
+                results.append({'videos': size, 'backend': backend, **measure(path, lookup_id)})
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
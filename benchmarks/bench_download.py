@@ -0,0 +1,79 @@
+"""
+Range downloader against the local stand-in server: one connection vs
+parallel ranges under a per-connection bandwidth cap, plus an interrupted
+download that is resumed from its journal.
+
+    python benchmarks/bench_download.py --size 16777216 --bandwidth 4194304
+"""
+import argparse
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from range_download import DownloadError, RangeDownloader, file_sha256  # noqa: E402
+from stand_in_server import start_server  # noqa: E402
+from synthetic import synthetic_video  # noqa: E402
+
+
+def timed_download(url, path, **options):
+    downloader = RangeDownloader(url, path, **options)
+    started = time.perf_counter()
+    downloader.download()
+    return time.perf_counter() - started, downloader
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the resumable range downloader")
+    parser.add_argument('--size', type=int, default=16 * 1024 * 1024, help='video size in bytes')
+    parser.add_argument('--bandwidth', type=int, default=4 * 1024 * 1024,
+                        help='per-connection cap in bytes/s')
+    parser.add_argument('--chunk-size', type=int, default=1024 * 1024)
+    parser.add_argument('--workers', type=int, default=8)
+    args = parser.parse_args()
+
+    expected = hashlib.sha256(synthetic_video('bench', args.size)).hexdigest()
+    results = {'size': args.size, 'bandwidth': args.bandwidth}
+
+    with tempfile.TemporaryDirectory() as workdir:
+        server = start_server(video_size=args.size, bandwidth=args.bandwidth)
+        url = f"http://127.0.0.1:{server.server_address[1]}/videos/bench"
+
+        seconds, _ = timed_download(url, os.path.join(workdir, 'single.mp4'), sha256=expected,
+                                    chunk_size=args.size, max_workers=1)
+        results['single_connection_seconds'] = seconds
+        seconds, _ = timed_download(url, os.path.join(workdir, 'parallel.mp4'), sha256=expected,
+                                    chunk_size=args.chunk_size, max_workers=args.workers)
+        results['parallel_seconds'] = seconds
+        results['speedup'] = results['single_connection_seconds'] / seconds
+        server.shutdown()
+
+        # Interrupted run: every request fails half the time and nothing is retried
+        flaky = start_server(video_size=args.size, failure_rate=0.5)
+        flaky_url = f"http://127.0.0.1:{flaky.server_address[1]}/videos/bench"
+        path = os.path.join(workdir, 'resumed.mp4')
+        attempts = 0
+        while True:
+            attempts += 1
+            try:
+                _, downloader = timed_download(flaky_url, path, sha256=expected,
+                                               chunk_size=args.chunk_size, retries=0)
+                break
+            except (DownloadError, OSError):
+                if attempts > 100:
+                    raise
+        flaky.shutdown()
+        results['resume_attempts'] = attempts
+        results['resumed_bytes_on_last_attempt'] = downloader.resumed_bytes
+        results['resumed_file_verified'] = file_sha256(path) == expected
+        results['leftover_part_files'] = [name for name in os.listdir(workdir) if '.part' in name]
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
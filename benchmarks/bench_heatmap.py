@@ -0,0 +1,73 @@
+"""
+Cross-session heatmap aggregation: replaying session logs and folding
+them into per-second histograms, numpy vs pure Python.
+
+    python benchmarks/bench_heatmap.py --sessions 1000 10000 100000
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from array import array
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from heatmap import HeatmapBuilder  # noqa: E402
+from interaction_logger import ACTIONS, normalize_action  # noqa: E402
+from interaction_sink import iter_sessions, session_path, write_session  # noqa: E402
+from synthetic import synthetic_interactions  # noqa: E402
+
+YOUTUBE_ID = "benchvideo01"
+CODES = {name: code for code, name in enumerate(ACTIONS)}
+
+
+def write_sessions(log_dir, sessions, events):
+    for i in range(sessions):
+        trace = synthetic_interactions(events, video_length_ms=1_200_000, seed=i)
+        write_session(session_path(log_dir, YOUTUBE_ID, f"s{i:08d}"), {"youtube_id": YOUTUBE_ID}, ACTIONS,
+                      array('d', (step * 7.5 for step in range(len(trace)))),
+                      array('q', (position for _, position in trace)),
+                      array('H', (CODES[normalize_action(action)] for action, _ in trace)))
+
+
+def measure(log_dir, sessions, events, with_numpy):
+    started = time.perf_counter()
+    logs = list(iter_sessions(log_dir, YOUTUBE_ID))
+    replay_seconds = time.perf_counter() - started
+
+    builder = HeatmapBuilder(YOUTUBE_ID)
+    if not with_numpy:
+        builder._np = None
+    started = time.perf_counter()
+    heatmap = builder.add_all(logs).build()
+    fold_seconds = time.perf_counter() - started
+    return {
+        'sessions': sessions,
+        'events': heatmap.events,
+        'numpy': with_numpy and builder._np is not None,
+        'replay_s': replay_seconds,
+        'aggregate_s': fold_seconds,
+        'total_s': replay_seconds + fold_seconds,
+        'peak_pauses_second': max(range(heatmap.seconds), key=heatmap.pauses.__getitem__)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark cross-session heatmap aggregation")
+    parser.add_argument('--sessions', type=int, nargs='+', default=[1_000, 10_000, 100_000])
+    parser.add_argument('--events', type=int, default=40, help='events per session')
+    args = parser.parse_args()
+
+    results = []
+    for sessions in args.sessions:
+        with tempfile.TemporaryDirectory() as log_dir:
+            write_sessions(log_dir, sessions, args.events)
+            for with_numpy in (True, False):
+                results.append(measure(log_dir, sessions, args.events, with_numpy))
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
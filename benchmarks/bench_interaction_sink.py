@@ -0,0 +1,59 @@
+"""
+Cost of logging through the interaction sink on the caller's thread, and
+how fast finished session logs replay.
+
+    python benchmarks/bench_interaction_sink.py --events 1000 100000 1000000
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from interaction_logger import ACTIONS, InteractionLogger  # noqa: E402
+from interaction_sink import InteractionSink, read_session  # noqa: E402
+
+
+def measure(workdir, events):
+    # Queue sized to hold the whole burst, so this times logging rather than drops
+    sink = InteractionSink(os.path.join(workdir, f"session_{events}.log"), {"youtube_id": "bench"},
+                           actions=ACTIONS, queue_size=events + 1)
+    logger = InteractionLogger(sink=sink)
+    started = time.perf_counter()
+    for i in range(events):
+        logger.log_interaction(ACTIONS[i % len(ACTIONS)], i * 250)
+    log_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    logger.close()
+    close_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    replayed = read_session(sink.path)
+    replay_seconds = time.perf_counter() - started
+    assert len(replayed) == events and replayed.complete
+    return {
+        'events': events,
+        'log_us_per_event': log_seconds / events * 1e6,
+        'close_ms': close_seconds * 1000,
+        'file_kb': os.path.getsize(sink.path) / 1024,
+        'replay_ms': replay_seconds * 1000,
+        'replay_events_per_s': events / replay_seconds if replay_seconds else float('inf')
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark interaction logging and replay")
+    parser.add_argument('--events', type=int, nargs='+', default=[1_000, 100_000, 1_000_000])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        results = [measure(workdir, events) for events in args.events]
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+"""
+Batch analysis throughput: the sequential flow (fetch one transcript,
+analyze it, then the next), fetching everything up front and then
+analyzing, and the pipelined engine, with a simulated fetch latency.
+
+    python benchmarks/bench_pipeline.py --videos 200 --latency 0.05
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import cognitive_scorer  # noqa: E402
+import topic_classifier  # noqa: E402
+from catalog import Video  # noqa: E402
+from main import analysis_stages  # noqa: E402
+from pipeline import DEFAULT_QUEUE_SIZE, analyze_videos  # noqa: E402
+from synthetic import synthetic_catalog, synthetic_transcript  # noqa: E402
+
+
+def slow_fetch(latency, captions):
+    """A transcript source that waits like the network, then builds a unique transcript"""
+    def fetch(youtube_id):
+        time.sleep(latency)
+        return synthetic_transcript(captions, seed=youtube_id)
+    return fetch
+
+
+def run_sequential(videos, analysis, fetch, workers, queue_size):
+    return [analysis.analyze(fetch(video.youtube_id), video.subject) for video in videos]
+
+
+def run_prefetch(videos, analysis, fetch, workers, queue_size):
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        transcripts = list(pool.map(fetch, [video.youtube_id for video in videos]))
+    return [analysis.analyze(transcript, video.subject) for transcript, video in zip(transcripts, videos)]
+
+
+def run_pipelined(videos, analysis, fetch, workers, queue_size):
+    results = [None] * len(videos)
+    for item in analyze_videos(videos, analysis, fetch, workers, queue_size):
+        if item.error is not None:
+            raise RuntimeError(item.error)
+        results[item.index] = item.value.result
+    return results
+
+
+FLOWS = {'sequential': run_sequential, 'prefetch': run_prefetch, 'pipelined': run_pipelined}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the pipelined analysis engine")
+    parser.add_argument('--videos', type=int, default=200)
+    parser.add_argument('--captions', type=int, default=600, help='captions per transcript')
+    parser.add_argument('--latency', type=float, default=0.05, help='seconds per transcript fetch')
+    parser.add_argument('--workers', type=int, default=8)
+    parser.add_argument('--queue-size', type=int, default=DEFAULT_QUEUE_SIZE)
+    args = parser.parse_args()
+
+    videos = [Video(**record) for record in synthetic_catalog(args.videos)]
+    fetch = slow_fetch(args.latency, args.captions)
+    results = {'videos': args.videos, 'captions': args.captions, 'latency': args.latency,
+               'workers': args.workers}
+    outputs = {}
+    for name, flow in FLOWS.items():
+        # Empty tagging caches, so no flow is served from another's results
+        topic_classifier._classifiers.clear()
+        cognitive_scorer._default_scorer = None
+        analysis = analysis_stages()
+        started = time.perf_counter()
+        outputs[name] = flow(videos, analysis, fetch, args.workers, args.queue_size)
+        seconds = time.perf_counter() - started
+        results[f'{name}_seconds'] = seconds
+        results[f'{name}_videos_per_s'] = args.videos / seconds
+    results['identical'] = outputs['pipelined'] == outputs['sequential'] == outputs['prefetch']
+    results['speedup_vs_sequential'] = results['sequential_seconds'] / results['pipelined_seconds']
+    results['speedup_vs_prefetch'] = results['prefetch_seconds'] / results['pipelined_seconds']
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+"""
+Catalog-wide analysis on a process pool: in-process baseline vs worker
+processes reading transcripts from shared memory, for each pool size,
+plus a pool that pickles every transcript into its task for comparison.
+
+    python benchmarks/bench_process_pool.py --videos 10000 --processes 1 2 4 8
+"""
+import argparse
+import json
+import os
+import pickle
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import cognitive_scorer  # noqa: E402
+import topic_classifier  # noqa: E402
+from main import analysis_stages  # noqa: E402
+from process_pool import DEFAULT_CHUNK_SIZE, analyze_in_processes, default_processes  # noqa: E402
+from shared_transcripts import SharedTranscripts  # noqa: E402
+from synthetic import synthetic_catalog, synthetic_transcript  # noqa: E402
+
+
+def reset_caches():
+    """Empty tagging caches, so no run (or forked worker) starts warm"""
+    topic_classifier._classifiers.clear()
+    cognitive_scorer._default_scorer = None
+
+
+def analyze_pickled(chunk):
+    analysis = analysis_stages()
+    return [analysis.analyze(transcript, subject) for transcript, subject in chunk]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark process-pool analysis")
+    parser.add_argument('--videos', type=int, default=10_000)
+    parser.add_argument('--captions', type=int, default=200, help='captions per transcript')
+    parser.add_argument('--processes', type=int, nargs='+',
+                        default=sorted({1, 2, 4, default_processes()}))
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE)
+    args = parser.parse_args()
+
+    catalog = synthetic_catalog(args.videos)
+    jobs = [(record['youtube_id'], record['subject']) for record in catalog]
+    transcripts = {youtube_id: synthetic_transcript(args.captions, seed=youtube_id) for youtube_id, _ in jobs}
+    results = {'videos': args.videos, 'captions': args.captions, 'cpus': default_processes(),
+               'pickled_bytes': len(pickle.dumps(transcripts))}
+
+    started = time.perf_counter()
+    shared = SharedTranscripts.create(transcripts)
+    results['pack_seconds'] = time.perf_counter() - started
+    results['shared_bytes'] = shared.size
+
+    reset_caches()
+    analysis = analysis_stages()
+    started = time.perf_counter()
+    expected = [analysis.analyze(transcripts[youtube_id], subject) for youtube_id, subject in jobs]
+    baseline = time.perf_counter() - started
+    results['in_process_seconds'] = baseline
+
+    runs = []
+    for processes in args.processes:
+        reset_caches()
+        actual = [None] * len(jobs)
+        started = time.perf_counter()
+        for index, result, error, _ in analyze_in_processes(jobs, analysis_stages(), shared,
+                                                             processes, args.chunk_size):
+            if error is not None:
+                raise RuntimeError(error)
+            actual[index] = result
+        seconds = time.perf_counter() - started
+        runs.append({
+            'processes': processes,
+            'seconds': seconds,
+            'videos_per_s': args.videos / seconds,
+            'speedup': baseline / seconds,
+            'efficiency': baseline / seconds / processes,
+            'identical': actual == expected
+        })
+    results['shared_memory'] = runs
+
+    # Same pool, but every task carries its transcripts pickled
+    processes = max(args.processes)
+    reset_caches()
+    chunks = [[(transcripts[youtube_id], subject) for youtube_id, subject in jobs[start:start + args.chunk_size]]
+              for start in range(0, len(jobs), args.chunk_size)]
+    started = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        pickled = [result for chunk in pool.map(analyze_pickled, chunks) for result in chunk]
+    results['pickled_tasks'] = {'processes': processes, 'seconds': time.perf_counter() - started,
+                                'identical': pickled == expected}
+    shared.close()
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
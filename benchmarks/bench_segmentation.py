@@ -0,0 +1,65 @@
+"""
+Fixed-duration segmentation: Python loop vs numpy cumulative-sum search,
+on synthetic transcripts of up to a million captions.
+
+    python benchmarks/bench_segmentation.py --captions 1000000
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from array import array
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from windowing import fixed_duration_boundaries  # noqa: E402
+
+DISTRIBUTIONS = {
+    # Caption durations as YouTube usually reports them (two decimals)
+    'rounded': lambda rng: round(rng.uniform(1.0, 6.0), 2),
+    'uniform': lambda rng: rng.uniform(1.0, 6.0),
+    # Few distinct values, so segment totals often tie the threshold exactly
+    'ties': lambda rng: rng.choice([0.1, 0.2, 0.3, 0.7, 1.5]),
+}
+
+
+def best_of(repeats, fn, *args):
+    best, result = float('inf'), None
+    for _ in range(repeats):
+        started = time.perf_counter()
+        result = fn(*args)
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark fixed-duration segmentation")
+    parser.add_argument('--captions', type=int, default=1_000_000)
+    parser.add_argument('--segment-duration', type=float, default=180)
+    parser.add_argument('--repeats', type=int, default=3)
+    args = parser.parse_args()
+
+    results = []
+    for name, draw in DISTRIBUTIONS.items():
+        rng = random.Random(name)
+        durations = array('d', (draw(rng) for _ in range(args.captions)))
+        loop_seconds, expected = best_of(args.repeats, fixed_duration_boundaries,
+                                         durations, args.segment_duration, 'loop')
+        vector_seconds, actual = best_of(args.repeats, fixed_duration_boundaries,
+                                         durations, args.segment_duration, 'vectorized')
+        results.append({
+            'distribution': name,
+            'captions': args.captions,
+            'segments': len(expected),
+            'identical': actual == expected,
+            'loop_seconds': loop_seconds,
+            'vectorized_seconds': vector_seconds,
+            'speedup': loop_seconds / vector_seconds
+        })
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
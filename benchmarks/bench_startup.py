@@ -0,0 +1,48 @@
+"""
+Startup cost of main3.py per mode, each measured in a fresh interpreter:
+analysis only, CLI player and GUI player (player modules plus downloader).
+
+    python benchmarks/bench_startup.py --repeats 5
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MODES = {
+    'interpreter': "pass",
+    'analysis': "import main3",
+    'cli': "import main3, players; players.get_downloader(); players.get_player_class('cli')",
+    'gui': "import main3, players; players.get_downloader(); players.get_player_class('gui')",
+}
+
+
+def time_startup(code, repeats):
+    """Median wall time of a fresh `python -c code`, or the import error"""
+    timings = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        result = subprocess.run([sys.executable, "-c", code], cwd=REPO_ROOT,
+                                capture_output=True, text=True)
+        timings.append(time.perf_counter() - started)
+        if result.returncode != 0:
+            return {'error': result.stderr.strip().splitlines()[-1]}
+    return {'median_ms': statistics.median(timings) * 1000, 'best_ms': min(timings) * 1000}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark main3.py startup per mode")
+    parser.add_argument('--repeats', type=int, default=5)
+    args = parser.parse_args()
+
+    results = {mode: time_startup(code, args.repeats) for mode, code in MODES.items()}
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
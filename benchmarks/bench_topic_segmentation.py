@@ -0,0 +1,76 @@
+"""
+Topic-shift segmentation: time per caption as transcripts grow (it should
+stay flat, the pass being linear), and how many planted topic changes
+get a boundary within a few captions.
+
+    python benchmarks/bench_topic_segmentation.py --captions 10000 100000
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from columnar_transcript import as_columnar  # noqa: E402
+from synthetic import WORDS  # noqa: E402
+from topic_classifier import TOPIC_KEYWORDS  # noqa: E402
+from windowing import topic_shift_boundaries  # noqa: E402
+
+
+def planted_transcript(captions, topic_seconds=(120, 240), seed=0):
+    """
+    Captions drawing half their words from one topic's cue words, the
+    topic changing every 120-240 s; returns the transcript and the
+    caption indexes where a new topic starts
+    """
+    rng = random.Random(seed)
+    vocabularies = [words.split() for words in TOPIC_KEYWORDS.values()]
+    transcript, shifts = [], []
+    start, topic, topic_end = 0.0, rng.randrange(len(vocabularies)), rng.uniform(*topic_seconds)
+    for i in range(captions):
+        if start >= topic_end:
+            topic = (topic + rng.randrange(1, len(vocabularies))) % len(vocabularies)
+            topic_end = start + rng.uniform(*topic_seconds)
+            shifts.append(i)
+        words = [rng.choice(vocabularies[topic]) if rng.random() < 0.5 else rng.choice(WORDS)
+                 for _ in range(rng.randint(5, 12))]
+        duration = round(rng.uniform(2.0, 5.0), 2)
+        transcript.append({'text': " ".join(words), 'start': start, 'duration': duration})
+        start += duration
+    return as_columnar(transcript), shifts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark topic-shift segmentation")
+    parser.add_argument('--captions', type=int, nargs='+', default=[10_000, 100_000])
+    parser.add_argument('--min-segment', type=float, default=90)
+    parser.add_argument('--max-segment', type=float, default=300)
+    parser.add_argument('--tolerance', type=int, default=3, help='captions a boundary may be off by')
+    args = parser.parse_args()
+
+    results = []
+    for count in args.captions:
+        transcript, shifts = planted_transcript(count, seed=count)
+        started = time.perf_counter()
+        boundaries = topic_shift_boundaries(transcript, args.min_segment, args.max_segment)
+        seconds = time.perf_counter() - started
+        cuts = sorted(first for first, _ in boundaries[1:])
+        found = sum(any(abs(cut - shift) <= args.tolerance for cut in cuts) for shift in shifts)
+        results.append({
+            'captions': count,
+            'segments': len(boundaries),
+            'seconds': seconds,
+            'us_per_caption': seconds / count * 1e6,
+            'topic_changes': len(shifts),
+            'changes_found': found,
+            'boundaries_on_a_change': sum(any(abs(cut - shift) <= args.tolerance for shift in shifts)
+                                          for cut in cuts) / max(len(cuts), 1)
+        })
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+"""
+Topic classification throughput: one segment at a time vs batched,
+numpy vs pure Python, and repeat lookups served from the text-hash cache.
+
+    python benchmarks/bench_topics.py --segments 1000 10000
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from main import TOPIC_MAPPING  # noqa: E402
+from synthetic import WORDS  # noqa: E402
+from topic_classifier import TOPIC_KEYWORDS, TopicClassifier  # noqa: E402
+
+
+def synthetic_segments(count, words_per_segment=450, seed=0):
+    """Segment-sized texts mixing filler words with topic cue words"""
+    rng = random.Random(seed)
+    cues = " ".join(TOPIC_KEYWORDS.values()).split()
+    return [" ".join(rng.choice(cues) if rng.random() < 0.1 else rng.choice(WORDS)
+                     for _ in range(words_per_segment))
+            for _ in range(count)]
+
+
+def throughput(fn, count):
+    started = time.perf_counter()
+    fn()
+    return count / (time.perf_counter() - started)
+
+
+def measure(texts, with_numpy):
+    def classifier():
+        c = TopicClassifier(TOPIC_MAPPING)
+        if not with_numpy:
+            c._np = None
+        return c
+
+    single = classifier()
+    batched = classifier()
+    return {
+        'segments': len(texts),
+        'numpy': with_numpy and batched._np is not None,
+        'single_per_s': throughput(lambda: [single.classify(text, "Math") for text in texts], len(texts)),
+        'batch_per_s': throughput(lambda: batched.classify_batch(texts, "Math"), len(texts)),
+        'cached_per_s': throughput(lambda: batched.classify_batch(texts, "Math"), len(texts))
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark topic classification")
+    parser.add_argument('--segments', type=int, nargs='+', default=[1_000, 10_000])
+    args = parser.parse_args()
+
+    results = []
+    for count in args.segments:
+        texts = synthetic_segments(count, seed=count)
+        for with_numpy in (True, False):
+            results.append(measure(texts, with_numpy))
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
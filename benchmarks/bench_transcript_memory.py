@@ -0,0 +1,50 @@
+"""
+Memory per 10k captions: list-of-dicts transcript vs ColumnarTranscript.
+
+    python benchmarks/bench_transcript_memory.py --captions 10000
+"""
+import argparse
+import json
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from columnar_transcript import ColumnarTranscript  # noqa: E402
+from synthetic import synthetic_transcript  # noqa: E402
+
+
+def measure(build):
+    """Bytes still allocated after build() returns, and the object itself"""
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    obj = build()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    allocated = sum(stat.size_diff for stat in after.compare_to(before, 'filename'))
+    return allocated, obj
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare transcript memory footprints")
+    parser.add_argument('--captions', type=int, default=10000)
+    args = parser.parse_args()
+
+    # Round-trip through JSON so the dicts look like what the cache returns
+    payload = json.dumps(synthetic_transcript(args.captions, seed='memory-bench'))
+
+    dict_bytes, entries = measure(lambda: json.loads(payload))
+    columnar_bytes, _ = measure(lambda: ColumnarTranscript.from_entries(entries))
+
+    per_10k = 10000 / args.captions
+    print(json.dumps({
+        'captions': args.captions,
+        'dict_bytes_per_10k': int(dict_bytes * per_10k),
+        'columnar_bytes_per_10k': int(columnar_bytes * per_10k),
+        'ratio': dict_bytes / columnar_bytes
+    }, indent=2))
+
+
+if __name__ == '__main__':
+    main()
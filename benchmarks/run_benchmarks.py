@@ -0,0 +1,148 @@
+"""
+Benchmark suite for the analysis and interaction-logging hot paths.
+
+Runs fully offline: transcripts come from a stub source instead of
+YouTube. Results are written as JSON so runs can be compared across
+releases:
+
+    python benchmarks/run_benchmarks.py --output bench.json
+    python benchmarks/run_benchmarks.py --compare bench.json --tolerance 0.2
+"""
+import argparse
+import contextlib
+import json
+import os
+import platform
+import random
+import sys
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main  # noqa: E402
+import main2  # noqa: E402
+import transcript_cache  # noqa: E402
+from search_index import SegmentIndex, set_default_index  # noqa: E402
+from interaction_logger import InteractionLogger  # noqa: E402
+from synthetic import synthetic_interactions, synthetic_transcript  # noqa: E402
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000, 1_000_000]
+DEFAULT_TRACE_SIZES = [100, 1_000, 10_000, 100_000]
+
+
+class StubTranscriptCache:
+    """Stands in for TranscriptCache: serves a prepared transcript from memory"""
+    def __init__(self):
+        self.transcript = []
+
+    def get(self, youtube_id, languages=transcript_cache.DEFAULT_LANGUAGES):
+        return self.transcript
+
+    def stats(self):
+        return {}
+
+
+def time_call(fn, repeats):
+    """Best and mean wall time of fn() over repeats runs"""
+    timings = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return {'best_seconds': min(timings), 'mean_seconds': sum(timings) / len(timings)}
+
+
+def quiet(fn, *args):
+    """Call fn with its progress and report output discarded"""
+    def call():
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            return fn(*args)
+    return call
+
+
+def run_suite(sizes, trace_sizes, repeats):
+    stub = StubTranscriptCache()
+    transcript_cache.set_default_cache(stub)
+    # Nothing here should touch search_index.db in the working directory
+    set_default_index(SegmentIndex(":memory:"))
+    results = []
+
+    for size in sizes:
+        stub.transcript = synthetic_transcript(size, seed=size)
+        random.seed(size)
+        analysis = quiet(main2.analyze_video, 'bench', 'Math')()
+        cases = {
+            'get_video_segments': quiet(main.get_video_segments, 'bench', 'Math'),
+            'analyze_video': quiet(main2.analyze_video, 'bench', 'Math'),
+            'display_analysis': quiet(main2.display_analysis, *analysis),
+        }
+        for name, fn in cases.items():
+            results.append({'benchmark': name, 'size': size, **time_call(fn, repeats)})
+
+    for events in trace_sizes:
+        logger = InteractionLogger()
+        for action, video_time in synthetic_interactions(events, seed=events):
+            logger.log_interaction(action, video_time)
+        results.append({
+            'benchmark': 'generate_summary',
+            'size': events,
+            **time_call(logger.generate_summary, repeats)
+        })
+
+    return results
+
+
+def compare(results, baseline_path, tolerance):
+    """Return the benchmarks that got slower than baseline by more than tolerance"""
+    with open(baseline_path, 'r', encoding='utf-8') as f:
+        baseline = {(r['benchmark'], r['size']): r for r in json.load(f)['results']}
+    regressions = []
+    for result in results:
+        before = baseline.get((result['benchmark'], result['size']))
+        if before is None:
+            continue
+        ratio = result['best_seconds'] / before['best_seconds']
+        if ratio > 1 + tolerance:
+            regressions.append({**result, 'baseline_seconds': before['best_seconds'], 'ratio': ratio})
+    return regressions
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description="CLIP benchmark suite")
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES,
+                        help='transcript sizes in captions')
+    parser.add_argument('--trace-sizes', type=int, nargs='+', default=DEFAULT_TRACE_SIZES,
+                        help='interaction trace sizes in events')
+    parser.add_argument('--repeats', type=int, default=3)
+    parser.add_argument('--output', help='write results JSON here (default: stdout)')
+    parser.add_argument('--compare', metavar='BASELINE', help='results JSON from an earlier run')
+    parser.add_argument('--tolerance', type=float, default=0.2,
+                        help='allowed slowdown vs baseline before failing (default: 0.2 = 20%%)')
+    args = parser.parse_args()
+
+    results = run_suite(args.sizes, args.trace_sizes, args.repeats)
+    payload = {
+        'generated_at': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'results': results
+    }
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(payload, f, indent=2)
+    else:
+        print(json.dumps(payload, indent=2))
+
+    if args.compare:
+        regressions = compare(results, args.compare, args.tolerance)
+        for r in regressions:
+            print(f"REGRESSION {r['benchmark']} size={r['size']}: "
+                  f"{r['baseline_seconds']:.4f}s -> {r['best_seconds']:.4f}s ({r['ratio']:.2f}x)",
+                  file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main_cli()
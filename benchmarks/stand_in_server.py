@@ -0,0 +1,122 @@
+"""
+Local stand-in for the transcript and video services so fetch and
+download benchmarks run offline.
+
+    python benchmarks/stand_in_server.py --port 8765 --latency 0.2
+
+Serves GET /transcripts/<youtube_id> with a synthetic transcript and
+GET /videos/<youtube_id> with synthetic video bytes (honouring Range
+requests), after an artificial delay, failing a configurable share of
+requests with HTTP 503. Video responses can be throttled per connection.
+"""
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+from synthetic import synthetic_transcript, synthetic_video
+
+
+class TranscriptHandler(BaseHTTPRequestHandler):
+    latency = 0.0
+    failure_rate = 0.0
+    captions = 500
+    video_size = 16 * 1024 * 1024
+    bandwidth = 0  # bytes per second per connection for videos; 0 = unthrottled
+
+    def do_GET(self):
+        path = urlsplit(self.path).path
+        if not path.startswith(('/transcripts/', '/videos/')):
+            self.send_error(404)
+            return
+        time.sleep(self.latency)
+        if random.random() < self.failure_rate:
+            self.send_error(503)
+            return
+        youtube_id = path.rsplit('/', 1)[1]
+        if path.startswith('/videos/'):
+            self.send_video(synthetic_video(youtube_id, self.video_size))
+            return
+        body = json.dumps(synthetic_transcript(self.captions, seed=youtube_id)).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_video(self, data):
+        """Whole body, or a single "Range: bytes=first-last" slice of it"""
+        first, last = 0, len(data) - 1
+        requested = self.headers.get('Range')
+        if requested and requested.startswith('bytes='):
+            start, _, end = requested[len('bytes='):].partition('-')
+            first = int(start) if start else 0
+            last = min(int(end), last) if end else last
+            if first > last:
+                self.send_response(416)
+                self.send_header('Content-Range', f'bytes */{len(data)}')
+                self.end_headers()
+                return
+            self.send_response(206)
+            self.send_header('Content-Range', f'bytes {first}-{last}/{len(data)}')
+        else:
+            self.send_response(200)
+        self.send_header('Content-Type', 'video/mp4')
+        self.send_header('Accept-Ranges', 'bytes')
+        self.send_header('Content-Length', str(last - first + 1))
+        self.end_headers()
+
+        block = 64 * 1024
+        for offset in range(first, last + 1, block):
+            self.wfile.write(data[offset:min(offset + block, last + 1)])
+            if self.bandwidth:
+                time.sleep(block / self.bandwidth)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_server(port: int = 0, latency: float = 0.0, failure_rate: float = 0.0,
+                 captions: int = 500, handler=TranscriptHandler, **options):
+    """
+    Start the stand-in server on a background thread; returns the server.
+    options override other handler settings, e.g. video_size or bandwidth.
+    """
+    handler_class = type('ConfiguredHandler', (handler,), {
+        'latency': latency,
+        'failure_rate': failure_rate,
+        'captions': captions,
+        **options
+    })
+    server = ThreadingHTTPServer(('127.0.0.1', port), handler_class)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local stand-in transcript and video server")
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', type=float, default=0.2, help='seconds to wait before answering')
+    parser.add_argument('--failure-rate', type=float, default=0.0, help='share of requests answered with 503')
+    parser.add_argument('--captions', type=int, default=500)
+    parser.add_argument('--video-size', type=int, default=TranscriptHandler.video_size,
+                        help='bytes served for each /videos/<id>')
+    parser.add_argument('--bandwidth', type=int, default=0,
+                        help='per-connection video throughput cap in bytes/s (0 = none)')
+    args = parser.parse_args()
+
+    server = start_server(args.port, args.latency, args.failure_rate, args.captions,
+                          video_size=args.video_size, bandwidth=args.bandwidth)
+    print(f"Serving synthetic transcripts and videos on http://127.0.0.1:{server.server_address[1]}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+"""Synthetic transcripts and interaction traces for offline benchmarks."""
+import functools
+import random
+from typing import Dict, List, Tuple
+
+WORDS = (
+    "the number we add subtract multiply divide fraction energy force matter "
+    "look at this diagram remember that because so if then why what how step "
+    "first second next finally example problem answer equals plus minus times"
+).split()
+
+# Actions as the GUI and CLI players actually log them
+PLAYER_ACTIONS = ["play", "pause", "seek", "seek forward", "seek backward", "seek_forward", "seek_backward"]
+
+
+def synthetic_transcript(captions: int, seed=0) -> List[Dict]:
+    """Transcript shaped like YouTubeTranscriptApi output, deterministic per seed"""
+    rng = random.Random(seed)
+    transcript = []
+    start = 0.0
+    for _ in range(captions):
+        duration = round(rng.uniform(1.5, 6.0), 2)
+        text = " ".join(rng.choice(WORDS) for _ in range(rng.randint(4, 12)))
+        transcript.append({'text': text, 'start': round(start, 2), 'duration': duration})
+        start += duration
+    return transcript
+
+
+def synthetic_interactions(events: int, video_length_ms: int = 3_600_000,
+                           seed=0) -> List[Tuple[str, int]]:
+    """(action, video_time_ms) pairs resembling a viewing session"""
+    rng = random.Random(seed)
+    position = 0
+    trace = []
+    for _ in range(events):
+        action = rng.choice(PLAYER_ACTIONS)
+        if action.startswith("seek"):
+            position = max(0, min(video_length_ms, position + rng.randint(-30_000, 30_000)))
+        else:
+            position = min(video_length_ms, position + rng.randint(0, 60_000))
+        trace.append((action, position))
+    return trace
+
+
+def synthetic_catalog(videos: int, grades=(5, 6, 7, 8), subjects=("Math", "Science", "English"),
+                      seed=0) -> List[Dict]:
+    """Catalog records in the JSON catalog format, deterministic per seed"""
+    rng = random.Random(seed)
+    catalog = []
+    for i in range(videos):
+        subject = rng.choice(subjects)
+        catalog.append({
+            'title': f"{subject} lesson {i}",
+            'youtube_id': f"vid{i:08d}",
+            'subject': subject,
+            'grade': rng.choice(grades),
+            'description': " ".join(rng.choice(WORDS) for _ in range(8))
+        })
+    return catalog
+
+
+@functools.lru_cache(maxsize=8)
+def synthetic_video(youtube_id: str, size: int) -> bytes:
+    """Deterministic stand-in bytes for a video file"""
+    return random.Random(youtube_id).randbytes(size)
@@ -0,0 +1,179 @@
+import json
+import os
+import sqlite3
+import sys
+from dataclasses import asdict, dataclass
+from typing import Dict, Iterator, List, Optional
+
+CATALOG_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "catalogs")
+SQLITE_SUFFIXES = (".db", ".sqlite", ".sqlite3")
+
+
+@dataclass(slots=True)
+class Video:
+    title: str
+    youtube_id: str
+    subject: str
+    grade: int
+    description: str
+
+
+class JSONCatalog:
+    """
+    Catalog kept in a JSON list of video records. Nothing is read until the
+    first query; then one pass builds a youtube_id map and a
+    (grade, subject) listing index, both holding the same Video objects.
+    """
+    def __init__(self, path: str):
+        self.path = path
+        self._videos: Optional[List[Video]] = None
+        self._by_id: Dict[str, Video] = {}
+        self._by_grade: Dict[int, Dict[str, List[Video]]] = {}
+
+    def _load(self) -> List[Video]:
+        if self._videos is None:
+            with open(self.path, "r", encoding="utf-8") as f:
+                records = json.load(f)
+            videos = []
+            for record in records:
+                video = Video(
+                    record["title"],
+                    record["youtube_id"],
+                    sys.intern(record["subject"]),
+                    int(record["grade"]),
+                    record["description"]
+                )
+                videos.append(video)
+                # Several catalog entries may share one video; the first one wins
+                self._by_id.setdefault(video.youtube_id, video)
+                self._by_grade.setdefault(video.grade, {}).setdefault(video.subject, []).append(video)
+            self._videos = videos
+        return self._videos
+
+    def get(self, youtube_id: str) -> Optional[Video]:
+        self._load()
+        return self._by_id.get(youtube_id)
+
+    def grades(self) -> List[int]:
+        self._load()
+        return sorted(self._by_grade)
+
+    def subjects(self, grade: int) -> List[str]:
+        self._load()
+        return list(self._by_grade.get(grade, {}))
+
+    def videos(self, grade: int, subject: str) -> List[Video]:
+        self._load()
+        return list(self._by_grade.get(grade, {}).get(subject, []))
+
+    def __len__(self) -> int:
+        return len(self._load())
+
+    def __iter__(self) -> Iterator[Video]:
+        """Every video, grade by grade in subject listing order"""
+        self._load()
+        for grade in sorted(self._by_grade):
+            for videos in self._by_grade[grade].values():
+                yield from videos
+
+
+SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS videos (
+    id INTEGER PRIMARY KEY,
+    title TEXT NOT NULL,
+    youtube_id TEXT NOT NULL,
+    subject TEXT NOT NULL,
+    grade INTEGER NOT NULL,
+    description TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS videos_by_id ON videos (youtube_id);
+CREATE INDEX IF NOT EXISTS videos_by_grade ON videos (grade, subject, id);
+"""
+
+VIDEO_COLUMNS = "title, youtube_id, subject, grade, description"
+
+
+class SQLiteCatalog:
+    """
+    Catalog in a SQLite file. Every query is answered from an index, so
+    opening a catalog of 100k+ videos costs the same as opening a tiny one
+    and only the rows actually listed are ever turned into Video objects.
+    """
+    def __init__(self, path: str):
+        self.path = path
+        self._db: Optional[sqlite3.Connection] = None
+
+    @property
+    def db(self) -> sqlite3.Connection:
+        if self._db is None:
+            self._db = sqlite3.connect(self.path)
+            self._db.executescript(SQLITE_SCHEMA)
+        return self._db
+
+    def get(self, youtube_id: str) -> Optional[Video]:
+        row = self.db.execute(
+            f"SELECT {VIDEO_COLUMNS} FROM videos WHERE youtube_id = ? ORDER BY id LIMIT 1",
+            (youtube_id,)
+        ).fetchone()
+        return Video(*row) if row else None
+
+    def grades(self) -> List[int]:
+        return [row[0] for row in self.db.execute("SELECT DISTINCT grade FROM videos ORDER BY grade")]
+
+    def subjects(self, grade: int) -> List[str]:
+        return [row[0] for row in self.db.execute(
+            "SELECT subject FROM videos WHERE grade = ? GROUP BY subject ORDER BY MIN(id)", (grade,)
+        )]
+
+    def videos(self, grade: int, subject: str) -> List[Video]:
+        return [Video(*row) for row in self.db.execute(
+            f"SELECT {VIDEO_COLUMNS} FROM videos WHERE grade = ? AND subject = ? ORDER BY id",
+            (grade, subject)
+        )]
+
+    def __len__(self) -> int:
+        return self.db.execute("SELECT COUNT(*) FROM videos").fetchone()[0]
+
+    def __iter__(self) -> Iterator[Video]:
+        for grade in self.grades():
+            for subject in self.subjects(grade):
+                yield from self.videos(grade, subject)
+
+    def replace_all(self, videos: List[Video]):
+        with self.db:
+            self.db.execute("DELETE FROM videos")
+            self.db.executemany(
+                f"INSERT INTO videos ({VIDEO_COLUMNS}) VALUES (?, ?, ?, ?, ?)",
+                [(v.title, v.youtube_id, v.subject, v.grade, v.description) for v in videos]
+            )
+
+
+def load_catalog(path: str):
+    """Open a catalog file; the backend is picked by its extension"""
+    if path.lower().endswith(SQLITE_SUFFIXES):
+        return SQLiteCatalog(path)
+    return JSONCatalog(path)
+
+
+def default_catalog_path(name: str) -> str:
+    return os.path.join(CATALOG_DIR, f"{name}.json")
+
+
+def main():
+    if len(sys.argv) != 3:
+        print("Usage: python catalog.py <source.json|.db> <destination.json|.db>")
+        print("Converts a catalog between the JSON and SQLite formats")
+        return
+    source, destination = sys.argv[1], sys.argv[2]
+    videos = list(load_catalog(source))
+    target = load_catalog(destination)
+    if isinstance(target, SQLiteCatalog):
+        target.replace_all(videos)
+    else:
+        with open(destination, "w", encoding="utf-8") as f:
+            json.dump([asdict(video) for video in videos], f, indent=2)
+    print(f"Wrote {len(videos)} videos to {destination}")
+
+
+if __name__ == "__main__":
+    main()
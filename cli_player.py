@@ -0,0 +1,96 @@
+import threading
+
+import vlc
+
+from interaction_logger import InteractionLogger
+from progressive import BufferGuard
+
+
+class CLIVideoPlayer:
+    """Command-line version of the video player"""
+    def __init__(self, video_path, video_title, download=None, sink=None):
+        self.instance = vlc.Instance()
+        self.player = self.instance.media_player_new()
+        self.media = self.instance.media_new(video_path)
+        self.player.set_media(self.media)
+        self.title = video_title
+        self.logger = InteractionLogger(sink=sink)  # Reuse your existing InteractionLogger
+        
+        # Progressive playback: the file is still downloading
+        self.guard = BufferGuard(self.player, download) if download is not None else None
+        self.stopped = threading.Event()
+
+    def buffer_status(self):
+        return self.guard.check() if self.guard is not None else "Fully downloaded"
+
+    def watch_buffer(self):
+        """Background loop: pause/resume around the download edge and announce changes"""
+        last_state = None
+        while not self.stopped.wait(0.5):
+            status = self.guard.check()
+            state = (self.guard.holding, self.guard.download.finished.is_set())
+            if state != last_state:
+                print(f"\n[{status}]")
+                last_state = state
+            if self.guard.download.finished.is_set():
+                return
+
+    def play(self):
+        print(f"\nPlaying: {self.title}")
+        print("\nControls:")
+        print("  p - Play/Pause")
+        print("  f - Forward 10 seconds")
+        print("  b - Backward 10 seconds")
+        if self.guard is not None:
+            print("  s - Download status")
+        print("  q - Quit")
+
+        self.player.play()
+        if self.guard is not None:
+            threading.Thread(target=self.watch_buffer, daemon=True).start()
+
+        while True:
+            command = input(f"\nEnter command ({'p/f/b/s/q' if self.guard else 'p/f/b/q'}): ").lower()
+
+            if command == 'p':
+                # While buffering, the guard holds the player paused and keeps the user's choice
+                if self.player.is_playing() or (self.guard is not None and self.guard.wants_play):
+                    if self.guard is not None:
+                        self.guard.pause()
+                    else:
+                        self.player.pause()
+                    self.logger.log_interaction('pause', self.player.get_time())
+                    print("Paused")
+                else:
+                    started = True
+                    if self.guard is not None:
+                        started = self.guard.play()
+                    else:
+                        self.player.play()
+                    self.logger.log_interaction('play', self.player.get_time())
+                    print("Playing" if started else "Playing once buffered")
+
+            elif command == 'f':
+                target = self.player.get_time() + 10000
+                if self.guard is not None:
+                    target = self.guard.clamp_seek(target)
+                self.player.set_time(target)
+                self.logger.log_interaction('seek_forward', target)
+                print("Jumped forward 10 seconds")
+
+            elif command == 'b':
+                current_time = self.player.get_time()
+                new_time = max(0, current_time - 10000)
+                self.player.set_time(new_time)
+                self.logger.log_interaction('seek_backward', new_time)
+                print("Jumped backward 10 seconds")
+
+            elif command == 's' and self.guard is not None:
+                print(self.buffer_status())
+
+            elif command == 'q':
+                self.stopped.set()
+                self.player.stop()
+                self.logger.close()
+                print(self.logger.generate_summary())
+                break
@@ -0,0 +1,222 @@
+import hashlib
+from array import array
+from bisect import bisect_left
+from collections import OrderedDict
+from typing import Dict, List, Sequence, Tuple
+
+from columnar_transcript import ColumnarTranscript
+from search_index import tokenize
+
+COGNITIVE_ABILITIES = ("attention", "memory", "logic_and_reasoning",
+                       "auditory_processing", "visual_processing", "processing_speed")
+
+# Per-caption counts, summed over a segment with prefix sums
+COUNTS = ("words", "numerals", "questions", "attention", "memory", "logic", "auditory", "visual")
+
+CUE_WORDS = {
+    "attention": "notice careful carefully important focus watch attention key exactly",
+    "memory": "remember recall review memorize forget again earlier before last previous repeat",
+    "logic": "because therefore reason why if then so means prove must conclude explain",
+    "auditory": "listen hear sound say pronounce rhyme aloud voice spoken",
+    "visual": "look see diagram picture graph chart draw shown shape image map line color",
+}
+NUMBER_WORDS = set("zero one two three four five six seven eight nine ten eleven twelve twenty "
+                   "thirty forty fifty hundred thousand million half quarter".split())
+
+# Typical values in classroom speech, so features can be compared on one scale
+TYPICAL_SPEECH_RATE = 2.5  # words per second of caption time
+TYPICAL_PER_100_WORDS = {"numerals": 2.0, "questions": 1.0, "attention": 0.5, "memory": 0.5,
+                         "logic": 1.5, "auditory": 0.3, "visual": 0.5}
+
+# How much each feature (1.0 = typical) counts toward each ability
+ABILITY_WEIGHTS: Dict[str, Dict[str, float]] = {
+    "attention": {"attention": 1.0, "questions": 0.5},
+    "memory": {"memory": 1.0, "questions": 0.25},
+    "logic_and_reasoning": {"logic": 1.0, "numerals": 0.5, "questions": 0.25},
+    "auditory_processing": {"auditory": 1.0, "speech_rate": 0.5},
+    "visual_processing": {"visual": 1.0, "numerals": 0.25},
+    "processing_speed": {"speech_rate": 1.0, "numerals": 0.5},
+}
+
+SCORE_CACHE_SIZE = 100_000  # segments whose ranking is remembered
+
+
+def _build_cue_index() -> Dict[str, int]:
+    index = {}
+    for feature, words in CUE_WORDS.items():
+        for word in words.split():
+            index[word] = COUNTS.index(feature)
+    return index
+
+
+_CUE_INDEX = _build_cue_index()
+_WORDS, _NUMERALS, _QUESTIONS = COUNTS.index("words"), COUNTS.index("numerals"), COUNTS.index("questions")
+
+
+def relative_features(counts: Dict[str, int], spoken: float) -> Dict[str, float]:
+    """Segment features from its summed counts and caption seconds, 1.0 = typical"""
+    words = counts["words"]
+    features = {"speech_rate": 0.0}
+    if spoken > 0 and words:
+        # Only speech faster than usual counts as demanding
+        features["speech_rate"] = max(0.0, words / spoken / TYPICAL_SPEECH_RATE - 1.0)
+    for name, typical in TYPICAL_PER_100_WORDS.items():
+        features[name] = counts[name] * 100 / words / typical if words else 0.0
+    return features
+
+
+class TranscriptFeatures:
+    """
+    Prefix sums of per-caption feature counts and caption durations, built
+    in one pass over the transcript, so the features of any run of
+    captions are a subtraction and any time window is two bisects.
+    """
+    def __init__(self, transcript: ColumnarTranscript):
+        self.starts = transcript.starts
+        self.in_order = all(self.starts[i] <= self.starts[i + 1] for i in range(len(self.starts) - 1))
+        self.totals = [array('q', [0]) for _ in COUNTS]
+        self.spoken = array('d', [0.0])
+
+        running = [0] * len(COUNTS)
+        spoken = 0.0
+        cue_index = _CUE_INDEX
+        for i in range(len(transcript)):
+            text = transcript.text(i)
+            tokens = tokenize(text)
+            running[_WORDS] += len(tokens)
+            running[_QUESTIONS] += text.count("?")
+            for token in tokens:
+                if token[0].isdigit() or token in NUMBER_WORDS:
+                    running[_NUMERALS] += 1
+                else:
+                    feature = cue_index.get(token)
+                    if feature is not None:
+                        running[feature] += 1
+            for total, value in zip(self.totals, running):
+                total.append(value)
+            spoken += transcript.durations[i]
+            self.spoken.append(spoken)
+
+    def caption_range(self, start: float, end: float) -> Tuple[int, int]:
+        """Captions starting in [start, end), the ones a time-based window takes"""
+        lo = bisect_left(self.starts, start)
+        return lo, bisect_left(self.starts, end, lo)
+
+    def features(self, first: int, stop: int) -> Dict[str, float]:
+        """Features of captions first..stop-1, each relative to its typical value"""
+        counts = {name: total[stop] - total[first] for name, total in zip(COUNTS, self.totals)}
+        return relative_features(counts, self.spoken[stop] - self.spoken[first])
+
+
+def rank_abilities(features: Dict[str, float]) -> List[str]:
+    """Abilities from most to least demanded; ties keep COGNITIVE_ABILITIES order"""
+    scores = {ability: sum(weight * features[name] for name, weight in weights.items())
+              for ability, weights in ABILITY_WEIGHTS.items()}
+    return sorted(COGNITIVE_ABILITIES, key=lambda ability: -scores[ability])
+
+
+class CognitiveScorer:
+    """
+    Picks each segment's cognitive abilities from measured features:
+    speech rate over caption time, numeral and question density, and
+    attention, memory, reasoning, listening and visual cue words.
+    Features come from one pass per transcript; rankings are memoized
+    by transcript fingerprint and segment bounds.
+    """
+    def __init__(self, cache_size: int = SCORE_CACHE_SIZE):
+        self.cache_size = cache_size
+        self._rankings: "OrderedDict[tuple, List[str]]" = OrderedDict()
+        self._features: "OrderedDict[bytes, TranscriptFeatures]" = OrderedDict()
+        self._last: Tuple[object, bytes] = (None, b"")
+        self.hits = 0
+        self.misses = 0
+
+    def fingerprint(self, transcript: ColumnarTranscript) -> bytes:
+        if self._last[0] is transcript:
+            return self._last[1]
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(transcript.buffer.encode("utf-8"))
+        digest.update(transcript.starts.tobytes())
+        digest.update(transcript.durations.tobytes())
+        key = digest.digest()
+        self._last = (transcript, key)
+        return key
+
+    def transcript_features(self, transcript: ColumnarTranscript) -> TranscriptFeatures:
+        key = self.fingerprint(transcript)
+        features = self._features.get(key)
+        if features is None:
+            features = self._features[key] = TranscriptFeatures(transcript)
+            # A handful of videos is plenty; batches move on to the next one
+            while len(self._features) > 8:
+                self._features.popitem(last=False)
+        return features
+
+    def rank_windows(self, transcript: ColumnarTranscript,
+                     windows: Sequence[Sequence]) -> List[List[str]]:
+        """
+        Ranked abilities for each window of one transcript. Windows cut by
+        caption index are (start, end, text, first, stop) and cover
+        captions first..stop-1 exactly; (start, end, ...) windows cover the
+        captions starting in [start, end).
+        """
+        key = self.fingerprint(transcript)
+        rankings = []
+        features = None
+        for window in windows:
+            start, end = window[0], window[1]
+            captions = (window[3], window[4]) if len(window) >= 5 else None
+            # An index range and a time range never share a cache entry
+            cache_key = (key, start, end) if captions is None else (key, start, end) + captions
+            ranking = self._rankings.get(cache_key)
+            if ranking is not None:
+                self._rankings.move_to_end(cache_key)
+                self.hits += 1
+            else:
+                self.misses += 1
+                if features is None:
+                    features = self.transcript_features(transcript)
+                if captions is not None:
+                    ranking = rank_abilities(features.features(*captions))
+                elif features.in_order:
+                    first, stop = features.caption_range(start, end)
+                    ranking = rank_abilities(features.features(first, stop))
+                else:
+                    ranking = self._rank_unordered(features, transcript, start, end)
+                self._rankings[cache_key] = ranking
+            rankings.append(ranking)
+        while len(self._rankings) > self.cache_size:
+            self._rankings.popitem(last=False)
+        return rankings
+
+    @staticmethod
+    def _rank_unordered(features: TranscriptFeatures, transcript: ColumnarTranscript,
+                        start: float, end: float) -> List[str]:
+        """Out-of-order captions: sum the matching captions one by one"""
+        counts = dict.fromkeys(COUNTS, 0)
+        spoken = 0.0
+        for i in range(len(transcript)):
+            if start <= transcript.starts[i] < end:
+                for name, total in zip(COUNTS, features.totals):
+                    counts[name] += total[i + 1] - total[i]
+                spoken += transcript.durations[i]
+        return rank_abilities(relative_features(counts, spoken))
+
+    def stats(self) -> Dict:
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_ratio': self.hits / lookups if lookups else 0.0,
+            'cached': len(self._rankings)
+        }
+
+
+_default_scorer = None
+
+
+def get_cognitive_scorer() -> CognitiveScorer:
+    global _default_scorer
+    if _default_scorer is None:
+        _default_scorer = CognitiveScorer()
+    return _default_scorer
@@ -0,0 +1,66 @@
+from array import array
+from typing import Dict, Iterator, List, Union
+
+
+class ColumnarTranscript:
+    """
+    Compact transcript container.
+    Caption start times and durations live in typed double arrays, and all
+    caption text lives in one shared string (captions joined by single
+    spaces) with an offsets array marking where each caption begins. The
+    text of any run of consecutive captions is therefore one slice of the
+    buffer instead of a join over per-caption dicts.
+    """
+    __slots__ = ('starts', 'durations', 'offsets', 'buffer')
+
+    def __init__(self, starts: array, durations: array, offsets: array, buffer: str):
+        self.starts = starts
+        self.durations = durations
+        # offsets[i] is where caption i begins; offsets[-1] is len(buffer) + 1
+        self.offsets = offsets
+        self.buffer = buffer
+
+    @classmethod
+    def from_entries(cls, entries: List[Dict]) -> 'ColumnarTranscript':
+        """Build from the list of {'text', 'start', 'duration'} dicts the API returns"""
+        starts = array('d', [entry['start'] for entry in entries])
+        durations = array('d', [entry['duration'] for entry in entries])
+        texts = [entry['text'] for entry in entries]
+
+        offsets = array('q', [0]) * (len(texts) + 1)
+        position = 0
+        for i, text in enumerate(texts):
+            offsets[i] = position
+            position += len(text) + 1
+        offsets[len(texts)] = position
+        return cls(starts, durations, offsets, ' '.join(texts))
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    @property
+    def end_time(self) -> float:
+        """End of the last caption, as analyze_video has always measured it"""
+        return self.starts[-1] + self.durations[-1]
+
+    def text(self, i: int) -> str:
+        """Text of caption i"""
+        return self.buffer[self.offsets[i]:self.offsets[i + 1] - 1]
+
+    def text_range(self, i: int, j: int) -> str:
+        """' '.join of the texts of captions i..j-1, as a single buffer slice"""
+        if i >= j:
+            return ''
+        return self.buffer[self.offsets[i]:self.offsets[j] - 1]
+
+    def entries(self) -> Iterator[Dict]:
+        """Yield captions back as the original dict shape"""
+        for i in range(len(self)):
+            yield {'text': self.text(i), 'start': self.starts[i], 'duration': self.durations[i]}
+
+
+def as_columnar(transcript: Union[List[Dict], ColumnarTranscript]) -> ColumnarTranscript:
+    """Accept either transcript shape and return the columnar one"""
+    if isinstance(transcript, ColumnarTranscript):
+        return transcript
+    return ColumnarTranscript.from_entries(transcript)
@@ -0,0 +1,64 @@
+from typing import Optional, Tuple
+
+from pytube import YouTube
+
+from profiling import timed
+from progressive import ProgressiveDownload
+from range_download import download_file
+from video_cache import VideoCache, get_default_video_cache
+
+
+def print_progress(done: int, total: int):
+    print(f"\r  {done * 100 // total}% of {total / 1024 / 1024:.1f} MB", end="", flush=True)
+
+
+def video_cache_for(output_path: str) -> VideoCache:
+    cache = get_default_video_cache()
+    if output_path != cache.cache_dir:
+        cache = VideoCache(output_path, cache.max_bytes, cache.policy)
+    return cache
+
+
+def resolve_stream(youtube_id: str) -> Tuple[str, Optional[int]]:
+    """Direct URL and size of the highest resolution progressive stream"""
+    # Initialize YouTube object
+    yt = YouTube(f'https://www.youtube.com/watch?v={youtube_id}')
+    
+    # Get the highest resolution stream
+    video = yt.streams.get_highest_resolution()
+    return video.url, video.filesize
+
+
+@timed("download")
+def download_youtube_video(youtube_id: str, output_path: str = "videos") -> str:
+    """
+    Download YouTube video and return the local file path.
+    Goes through the shared video cache: a video another process is
+    already downloading is waited for rather than fetched twice, and the
+    download itself fetches byte ranges in parallel and can resume.
+    """
+    try:
+        cache = video_cache_for(output_path)
+
+        def fetch(staging_path: str):
+            url, size = resolve_stream(youtube_id)
+            print("\nDownloading video...")
+            download_file(url, staging_path, size=size, progress=print_progress)
+            print("\nDownload completed!")
+
+        misses = cache.misses
+        output_file = cache.get(youtube_id, fetch)
+        if cache.misses == misses:
+            print("\nVideo already downloaded, using cached version.")
+            
+        return output_file
+        
+    except Exception as e:
+        print(f"Error downloading video: {e}")
+        return None
+
+
+def start_progressive_download(youtube_id: str, output_path: str = "videos") -> ProgressiveDownload:
+    """Start downloading in the background; the player can open it once enough is buffered"""
+    return ProgressiveDownload(video_cache_for(output_path), youtube_id,
+                               lambda: resolve_stream(youtube_id)).start()
@@ -0,0 +1,127 @@
+import json
+import os
+import socket
+import time
+import uuid
+from typing import Optional
+
+LOCK_POLL = 0.2  # seconds between attempts to take a held lock
+DEFAULT_STALE_AFTER = 6 * 60 * 60  # a lock older than this is abandoned
+
+
+class LockTimeout(Exception):
+    """Another process held a lock for longer than we were willing to wait"""
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class FileLock:
+    """
+    Cross-process lock: whoever creates the lock file (O_CREAT | O_EXCL,
+    atomic on every platform) holds it. The file records pid, host and
+    time so a lock left by a crashed process can be broken: immediately if
+    that pid is gone on this host, otherwise once it is older than
+    stale_after. Stale locks are broken by rename, so two waiters
+    breaking the same one cannot delete each other's new lock.
+    """
+    def __init__(self, path: str, timeout: Optional[float] = None, stale_after: float = DEFAULT_STALE_AFTER):
+        self.path = path
+        self.timeout = timeout
+        self.stale_after = stale_after
+        self.waited = False
+
+    @staticmethod
+    def _record(path: str) -> Optional[bytes]:
+        """Raw contents of the lock file at path, or None if there is none"""
+        try:
+            with open(path, "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+        except OSError:
+            return b""
+
+    def _is_stale(self, record: Optional[bytes], path: str) -> bool:
+        if record is None:
+            return False
+        try:
+            owner = json.loads(record)
+            if owner.get("host") == socket.gethostname() and not _pid_alive(owner["pid"]):
+                return True
+            return time.time() - owner["time"] > self.stale_after
+        except (ValueError, KeyError, TypeError, AttributeError):
+            # Unreadable: may be mid-write, so only age can prove it abandoned
+            try:
+                return time.time() - os.path.getmtime(path) > self.stale_after
+            except OSError:
+                return False
+
+    def _break_stale(self):
+        """
+        Remove a stale lock without racing other waiters. Deleting by path
+        could delete a live lock another waiter created after breaking the
+        same stale one, so the lock is first renamed to a name only we use
+        and then checked: if what we moved is not the record we judged
+        stale, it is someone's live lock and goes back.
+        """
+        record = self._record(self.path)
+        if not self._is_stale(record, self.path):
+            return
+        aside = f"{self.path}.{socket.gethostname()}.{os.getpid()}.{uuid.uuid4().hex}.stale"
+        try:
+            os.rename(self.path, aside)
+        except OSError:
+            return  # already broken by someone else
+        if self._record(aside) != record:
+            try:
+                os.link(aside, self.path)
+            except OSError:
+                pass
+        try:
+            os.remove(aside)
+        except OSError:
+            pass
+
+    def try_acquire(self) -> bool:
+        try:
+            fd = os.open(self.path, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o644)
+        except FileExistsError:
+            self._break_stale()
+            return False
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump({"pid": os.getpid(), "host": socket.gethostname(), "time": time.time()}, f)
+        return True
+
+    def acquire(self):
+        deadline = None if self.timeout is None else time.monotonic() + self.timeout
+        while not self.try_acquire():
+            self.waited = True
+            if deadline is not None and time.monotonic() >= deadline:
+                raise LockTimeout(f"timed out waiting for {self.path}")
+            time.sleep(LOCK_POLL)
+
+    def release(self):
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+    def held_by_someone(self) -> bool:
+        record = self._record(self.path)
+        return record is not None and not self._is_stale(record, self.path)
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+        return False
@@ -0,0 +1,214 @@
+from tkinter import ttk
+
+import customtkinter as ctk
+import vlc
+
+from interaction_logger import InteractionLogger
+from player_state import PlayerState, SeekCoalescer
+from progressive import BufferGuard
+
+REFRESH_MS = 1000  # how often the slider moves while the video plays
+BUFFER_CHECK_MS = 1000
+
+
+class VideoPlayer:
+    """
+    Custom video player with interaction tracking capabilities.
+    Provides a user-friendly interface for video playback and monitors all interactions.
+    """
+    def __init__(self, video_path, video_title, download=None, sink=None):
+        self.window = ctk.CTk()
+        self.window.title(f"CLIP Learning System - {video_title}")
+        self.window.geometry("800x600")
+        
+        # Initialize VLC player
+        self.instance = vlc.Instance()
+        self.player = self.instance.media_player_new()
+        self.media = self.instance.media_new(video_path)
+        self.player.set_media(self.media)
+        
+        # Initialize interaction logger
+        self.logger = InteractionLogger(sink=sink)
+        
+        # Player state comes from VLC events; slider drags become one seek
+        self.state = PlayerState(self.player)
+        self.seeks = SeekCoalescer(self.seek_to, self.window.after, self.window.after_cancel)
+        self._refresh_job = None
+        self._wants_play = False
+        self._setting_slider = False
+        
+        # Progressive playback: the file is still downloading
+        self.guard = BufferGuard(self.player, download) if download is not None else None
+        
+        self.setup_ui()
+        
+    def setup_ui(self):
+        """Create and arrange UI elements"""
+        # Video frame
+        self.video_frame = ctk.CTkFrame(self.window)
+        self.video_frame.pack(expand=True, fill='both', padx=10, pady=5)
+        
+        # Control frame
+        self.control_frame = ctk.CTkFrame(self.window)
+        self.control_frame.pack(fill='x', padx=10, pady=5)
+        
+        # Progress bar
+        self.progress = ttk.Scale(
+            self.control_frame,
+            from_=0,
+            to=100,
+            orient='horizontal',
+            command=self.on_progress_change
+        )
+        self.progress.pack(fill='x', padx=10, pady=5)
+        # Releasing the slider seeks at once instead of waiting out the debounce
+        self.progress.bind('<ButtonRelease-1>', lambda event: self.seeks.flush())
+        
+        # Control buttons
+        self.setup_control_buttons()
+        
+        # Download / buffering status
+        self.status_label = ctk.CTkLabel(self.control_frame, text="")
+        self.status_label.pack(pady=(0, 5))
+        
+        # Bind video frame to player
+        self.player.set_hwnd(self.video_frame.winfo_id())
+        
+    def setup_control_buttons(self):
+        """Create playback control buttons"""
+        button_frame = ctk.CTkFrame(self.control_frame)
+        button_frame.pack(pady=5)
+        
+        # Play/Pause button
+        self.play_button = ctk.CTkButton(
+            button_frame,
+            text="Play",
+            command=self.toggle_play
+        )
+        self.play_button.pack(side='left', padx=5)
+        
+        # Backward button (10 seconds)
+        self.back_button = ctk.CTkButton(
+            button_frame,
+            text="◄◄ 10s",
+            command=lambda: self.seek_relative(-10000)
+        )
+        self.back_button.pack(side='left', padx=5)
+        
+        # Forward button (10 seconds)
+        self.forward_button = ctk.CTkButton(
+            button_frame,
+            text="10s ►►",
+            command=lambda: self.seek_relative(10000)
+        )
+        self.forward_button.pack(side='left', padx=5)
+        
+    def toggle_play(self):
+        """Handle play/pause functionality"""
+        # While buffering, the guard holds the player paused and keeps the user's choice
+        if self.is_playing():
+            if self.guard is not None:
+                self.guard.pause()
+            else:
+                self.player.pause()
+            self.play_button.configure(text="Play")
+            self.logger.log_interaction('pause', self.state.time)
+            self._wants_play = False
+        else:
+            if self.guard is not None:
+                self.guard.play()
+            else:
+                self.player.play()
+            self.play_button.configure(text="Pause")
+            self.logger.log_interaction('play', self.state.time)
+            self._wants_play = True
+        self.schedule_refresh()
+
+    def is_playing(self):
+        """Playing, or held for buffering with the user wanting it to play"""
+        return self.state.playing or (self.guard is not None and self.guard.wants_play)
+            
+    def seek_relative(self, offset):
+        """Handle seeking forward or backward"""
+        self.seeks.discard()
+        new_time = max(0, self.state.time + offset)
+        if self.guard is not None:
+            new_time = self.guard.clamp_seek(int(new_time))
+        self.player.set_time(int(new_time))
+        self.state.seeked(int(new_time))
+        self.logger.log_interaction(
+            f"seek {'forward' if offset > 0 else 'backward'}",
+            new_time
+        )
+        self.schedule_refresh()
+        
+    def on_progress_change(self, value):
+        """Handle manual seeking through progress bar"""
+        if self._setting_slider or self.state.length <= 0:
+            # Our own progress.set() calls land here too; they are not seeks
+            return
+        self.seeks.request(int((float(value) / 100) * self.state.length))
+        
+    def seek_to(self, target_time):
+        """One seek for a whole slider drag, called by the coalescer"""
+        if self.guard is not None:
+            target_time = self.guard.clamp_seek(target_time)
+        self.player.set_time(target_time)
+        self.state.seeked(target_time)
+        self.logger.log_interaction('seek', target_time)
+        self.schedule_refresh()
+        
+    def schedule_refresh(self, delay_ms=0):
+        """Redraw after delay_ms; an immediate request replaces a pending timed one. UI thread only."""
+        if self._refresh_job is not None:
+            if delay_ms:
+                return
+            self.window.after_cancel(self._refresh_job)
+        self._refresh_job = self.window.after(delay_ms, self.refresh)
+        
+    def refresh(self):
+        """Redraw slider and play button, only when the player state changed"""
+        self._refresh_job = None
+        if self.state.changed.is_set() and not self.seeks.pending:
+            # Cleared before reading, so a change during the redraw is drawn next time
+            self.state.changed.clear()
+            self._setting_slider = True
+            try:
+                self.progress.set(self.state.fraction() * 100)
+            finally:
+                self._setting_slider = False
+            self.play_button.configure(text="Pause" if self.is_playing() else "Play")
+        if self.state.ended:
+            self._wants_play = False
+        # VLC events only set a flag, so look again - but only while playback
+        # can change on its own; a paused player costs nothing until the user acts
+        if self.state.playing or self._wants_play:
+            self.schedule_refresh(REFRESH_MS)
+        
+    def watch_buffer(self):
+        """Pause/resume around the download edge until the download is done"""
+        self.status_label.configure(text=self.guard.check())
+        if not self.guard.download.finished.is_set():
+            self.window.after(BUFFER_CHECK_MS, self.watch_buffer)
+        
+    def start(self):
+        """Start the video player"""
+        self._wants_play = True
+        self.player.play()
+        self.refresh()
+        if self.guard is not None:
+            self.watch_buffer()
+        self.window.protocol("WM_DELETE_WINDOW", self.on_closing)
+        self.window.mainloop()
+        
+    def on_closing(self):
+        """Handle window closing and generate interaction summary"""
+        self.seeks.discard()
+        if self._refresh_job is not None:
+            self.window.after_cancel(self._refresh_job)
+            self._refresh_job = None
+        self.state.detach()
+        self.player.stop()
+        self.logger.close()
+        print(self.logger.generate_summary())
+        self.window.destroy()
@@ -0,0 +1,300 @@
+import argparse
+import math
+from array import array
+from itertools import accumulate
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from interaction_logger import ACTIONS, PAUSE, PLAY, SEEK, SEEK_BACKWARD, SEEK_CODES
+from interaction_sink import DEFAULT_LOG_DIR, SessionLog, iter_sessions
+from search_index import format_seconds
+
+HEATMAP_KINDS = ("pauses", "rewinds", "skips")
+FOLD_EVENTS = 1_000_000  # events buffered before they are folded into the histograms
+MAX_SPAN_SECONDS = 300  # cap on one seek's rewatched/skipped span, bounding estimate errors
+FIXED_SEGMENT_SECONDS = 60  # bucket size for --segmentation fixed
+# fixed: one-minute buckets; topic: cut where the transcript's vocabulary changes
+HEATMAP_SEGMENTATIONS = ("fixed", "topic")
+TOPIC_MIN_SECONDS = 30
+TOPIC_MAX_SECONDS = 120
+
+
+def _try_numpy():
+    """numpy makes folding a few bincounts; without it the same histograms are built in a loop"""
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+class Heatmap:
+    """
+    Per-second histograms of one video over many sessions: pauses counts
+    pauses at each second; rewinds and skips count how many times each
+    second was jumped back over (rewatched) or forward over (skipped).
+    """
+    def __init__(self, youtube_id: Optional[str], sessions: int, events: int,
+                 pauses: array, rewinds: array, skips: array):
+        self.youtube_id = youtube_id
+        self.sessions = sessions
+        self.events = events
+        self.pauses = pauses
+        self.rewinds = rewinds
+        self.skips = skips
+
+    @property
+    def seconds(self) -> int:
+        return len(self.pauses)
+
+    def segment_totals(self, segments: Iterable[Tuple[float, float]]) -> List[Dict]:
+        """
+        Totals per (start, end) segment from prefix sums, plus per-viewer
+        rates: pause_rate is pauses per viewer-minute, rewatch_rate and
+        skip_rate are seconds rewatched or skipped per viewer-minute.
+        confusion averages pause_rate and rewatch_rate, each first scaled
+        by its maximum over these segments so neither unit outweighs the
+        other: 0 is no trouble, 1 the segment with the most of both.
+        """
+        prefix = {kind: [0, *accumulate(getattr(self, kind))] for kind in HEATMAP_KINDS}
+        last = self.seconds
+        viewers = max(self.sessions, 1)
+        totals = []
+        for start_time, end_time in segments:
+            first = min(last, max(0, math.floor(start_time)))
+            stop = min(last, max(first, math.ceil(end_time)))
+            viewer_minutes = viewers * max(end_time - start_time, 1e-9) / 60
+            sums = {kind: prefix[kind][stop] - prefix[kind][first] for kind in HEATMAP_KINDS}
+            totals.append({
+                'start_time': start_time,
+                'end_time': end_time,
+                **sums,
+                'pause_rate': sums['pauses'] / viewer_minutes,
+                'rewatch_rate': sums['rewinds'] / viewer_minutes,
+                'skip_rate': sums['skips'] / viewer_minutes
+            })
+        peak_pause = max((t['pause_rate'] for t in totals), default=0.0)
+        peak_rewatch = max((t['rewatch_rate'] for t in totals), default=0.0)
+        for t in totals:
+            t['confusion'] = ((t['pause_rate'] / peak_pause if peak_pause else 0.0) +
+                              (t['rewatch_rate'] / peak_rewatch if peak_rewatch else 0.0)) / 2
+        return totals
+
+
+class HeatmapBuilder:
+    """
+    Collects sessions' event columns and folds them into histograms in
+    large vectorized batches. A plain 'seek' (slider jump) counts as a
+    rewind or skip by comparing its target with the estimated position
+    just before it: the previous event's position, plus the time since
+    then unless that event was a pause.
+    """
+    def __init__(self, youtube_id: Optional[str] = None):
+        self.youtube_id = youtube_id
+        self.sessions = 0
+        self.events = 0
+        self._np = _try_numpy()
+        self._histograms: Dict[str, List[int]] = {kind: [] for kind in HEATMAP_KINDS}
+        self._reset_buffer()
+
+    def _reset_buffer(self):
+        self.offsets = array('d')
+        self.positions = array('q')
+        self.codes = array('H')
+        self.first = array('b')
+
+    def add(self, log: SessionLog):
+        """Add one replayed session"""
+        if not len(log):
+            self.sessions += 1
+            return
+        codes = log.codes
+        if log.actions[:len(ACTIONS)] != list(ACTIONS):
+            # Written with another action table: translate by name, drop unknowns
+            canonical = {name: code for code, name in enumerate(ACTIONS)}
+            codes = array('H', (canonical.get(log.action_name(code), len(ACTIONS)) for code in codes))
+        self.offsets.extend(log.offsets)
+        self.positions.extend(log.positions)
+        self.codes.extend(codes)
+        flags = array('b', bytes(len(codes)))
+        flags[0] = 1
+        self.first.extend(flags)
+        self.sessions += 1
+        self.events += len(codes)
+        if len(self.codes) >= FOLD_EVENTS:
+            self._fold()
+
+    def add_all(self, logs: Iterable[SessionLog]) -> "HeatmapBuilder":
+        for log in logs:
+            self.add(log)
+        return self
+
+    def _accumulate(self, kind: str, counts: Sequence[int]):
+        histogram = self._histograms[kind]
+        if len(counts) > len(histogram):
+            histogram.extend([0] * (len(counts) - len(histogram)))
+        for second, count in enumerate(counts):
+            if count:
+                histogram[second] += count
+
+    def _fold(self):
+        if self.codes:
+            if self._np is not None:
+                self._fold_numpy(self._np)
+            else:
+                self._fold_python()
+        self._reset_buffer()
+
+    def _fold_numpy(self, np):
+        offsets = np.frombuffer(self.offsets, dtype=np.float64)
+        positions = np.frombuffer(self.positions, dtype=np.int64) / 1000.0
+        codes = np.frombuffer(self.codes, dtype=np.uint16)
+        first = np.frombuffer(self.first, dtype=np.int8).astype(bool)
+
+        # Previous event of the same session; a session starts playing from 0
+        previous_offset = np.concatenate(([0.0], offsets[:-1]))
+        previous_position = np.concatenate(([0.0], positions[:-1]))
+        previous_code = np.concatenate(([PLAY], codes[:-1]))
+        previous_offset[first] = 0.0
+        previous_position[first] = 0.0
+        previous_code[first] = PLAY
+        estimate = previous_position + np.where(previous_code == PAUSE, 0.0, offsets - previous_offset)
+
+        seeks = np.isin(codes, SEEK_CODES)
+        backward = (codes == SEEK_BACKWARD) | ((codes == SEEK) & (positions < estimate))
+        forward = seeks & ~backward
+
+        pauses = np.floor(positions[codes == PAUSE]).astype(np.int64)
+        self._accumulate('pauses', np.bincount(np.maximum(pauses, 0)).tolist())
+
+        def spans(starts, ends):
+            # Seconds covered by [start, end) for every span, via a difference array
+            starts = np.maximum(np.floor(starts).astype(np.int64), 0)
+            ends = np.maximum(np.ceil(ends).astype(np.int64), starts + 1)
+            if not len(starts):
+                return []
+            size = int(ends.max()) + 1
+            diff = np.bincount(starts, minlength=size) - np.bincount(ends, minlength=size)
+            return np.cumsum(diff)[:-1].tolist()
+
+        target = positions[backward]
+        self._accumulate('rewinds', spans(target, np.minimum(estimate[backward], target + MAX_SPAN_SECONDS)))
+        target = positions[forward]
+        self._accumulate('skips', spans(np.maximum(estimate[forward], target - MAX_SPAN_SECONDS), target))
+
+    def _fold_python(self):
+        pauses: List[int] = []
+        rewinds: List[int] = []
+        skips: List[int] = []
+
+        def bump(histogram, first, stop):
+            first = max(int(math.floor(first)), 0)
+            stop = max(int(math.ceil(stop)), first + 1)
+            if stop > len(histogram):
+                histogram.extend([0] * (stop - len(histogram)))
+            for second in range(first, stop):
+                histogram[second] += 1
+
+        previous_offset = previous_position = 0.0
+        previous_code = PLAY
+        for offset, position, code, first in zip(self.offsets, self.positions, self.codes, self.first):
+            position /= 1000.0
+            if first:
+                previous_offset, previous_position, previous_code = 0.0, 0.0, PLAY
+            estimate = previous_position + (0.0 if previous_code == PAUSE else offset - previous_offset)
+            if code == PAUSE:
+                bump(pauses, position, position)
+            elif code in SEEK_CODES:
+                if code == SEEK_BACKWARD or (code == SEEK and position < estimate):
+                    bump(rewinds, position, min(estimate, position + MAX_SPAN_SECONDS))
+                else:
+                    bump(skips, max(estimate, position - MAX_SPAN_SECONDS), position)
+            previous_offset, previous_position, previous_code = offset, position, code
+
+        for kind, counts in (('pauses', pauses), ('rewinds', rewinds), ('skips', skips)):
+            self._accumulate(kind, counts)
+
+    def build(self, seconds: Optional[int] = None) -> Heatmap:
+        """The histograms so far, padded to seconds (or to the longest one)"""
+        self._fold()
+        length = max([seconds or 0] + [len(h) for h in self._histograms.values()])
+        histograms = [array('q', h + [0] * (length - len(h))) for h in
+                      (self._histograms[kind] for kind in HEATMAP_KINDS)]
+        return Heatmap(self.youtube_id, self.sessions, self.events, *histograms)
+
+
+def aggregate_sessions(youtube_id: str, log_dir: str = DEFAULT_LOG_DIR) -> Heatmap:
+    """Heatmap of every logged session of one video"""
+    return HeatmapBuilder(youtube_id).add_all(iter_sessions(log_dir, youtube_id)).build()
+
+
+def fixed_segments(seconds: int, size: int = FIXED_SEGMENT_SECONDS) -> List[Tuple[float, float]]:
+    return [(start, min(start + size, seconds)) for start in range(0, seconds, size)]
+
+
+def topic_segments(youtube_id: str, min_duration: float = TOPIC_MIN_SECONDS,
+                   max_duration: float = TOPIC_MAX_SECONDS) -> List[Tuple[float, float]]:
+    """Topic-shift segments of the video's transcript, tiling it from 0 like analysis.py's"""
+    # Only --segmentation topic needs the transcript
+    from columnar_transcript import as_columnar
+    from transcript_cache import get_transcript
+    from windowing import topic_shift_boundaries
+
+    transcript = as_columnar(get_transcript(youtube_id))
+    starts = transcript.starts
+    return [(starts[first] if first else 0, starts[stop] if stop < len(transcript) else transcript.end_time)
+            for first, stop in topic_shift_boundaries(transcript, min_duration, max_duration)]
+
+
+def segment_heatmap(youtube_id: str, log_dir: str = DEFAULT_LOG_DIR,
+                    segments: Optional[Sequence[Tuple[float, float]]] = None,
+                    segmentation: str = "fixed") -> Tuple[Heatmap, List[Dict]]:
+    """
+    Aggregate a video's sessions and join them to segments: the given
+    ones, else fixed one-minute buckets or topic segments of the
+    transcript. Both are the same on every run, so totals can be compared.
+    """
+    heatmap = aggregate_sessions(youtube_id, log_dir)
+    if segments is None:
+        if segmentation == "topic":
+            segments = topic_segments(youtube_id)
+        elif segmentation == "fixed":
+            segments = fixed_segments(heatmap.seconds)
+        else:
+            raise ValueError(f"unknown segmentation: {segmentation}")
+    return heatmap, heatmap.segment_totals(segments)
+
+
+def format_segment_heatmap(heatmap: Heatmap, totals: List[Dict], top: int = 5) -> str:
+    """Segment table with the most confusing segments marked"""
+    worst = {id(t) for t in sorted(totals, key=lambda t: t['confusion'], reverse=True)[:top]
+             if t['confusion'] > 0}
+    lines = [f"{heatmap.youtube_id}: {heatmap.sessions} sessions, {heatmap.events} events",
+             "Rates are per viewer-minute; rewatch and skip in seconds",
+             f"{'Segment':<21} {'Pauses':>7} {'Pause/min':>10} {'Rewatch s/min':>14} {'Skip s/min':>11}"]
+    for t in totals:
+        marker = "  <- confusing" if id(t) in worst else ""
+        lines.append(f"{format_seconds(t['start_time'])} - {format_seconds(t['end_time'])}"
+                     f" {t['pauses']:>7} {t['pause_rate']:>10.2f} {t['rewatch_rate']:>14.2f} {t['skip_rate']:>11.2f}{marker}")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Where viewers pause, rewatch and skip, per segment")
+    parser.add_argument('youtube_id')
+    parser.add_argument('--log-dir', default=DEFAULT_LOG_DIR,
+                        help='interaction logs to aggregate (default: %(default)s)')
+    parser.add_argument('--top', type=int, default=5, help='how many segments to mark as confusing')
+    parser.add_argument('--segmentation', choices=HEATMAP_SEGMENTATIONS, default='fixed',
+                        help='one-minute buckets, or segments cut where the transcript changes topic '
+                             '(fetches the transcript)')
+    args = parser.parse_args()
+
+    heatmap, totals = segment_heatmap(args.youtube_id, args.log_dir, segmentation=args.segmentation)
+    if not heatmap.sessions:
+        print(f"No sessions logged for {args.youtube_id}")
+        return
+    print(format_segment_heatmap(heatmap, totals, args.top))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+import time
+from array import array
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, List, Tuple
+
+# Canonical actions; their index in this tuple is the code stored per event
+ACTIONS = ("play", "pause", "seek", "seek_forward", "seek_backward")
+PLAY, PAUSE, SEEK, SEEK_FORWARD, SEEK_BACKWARD = range(len(ACTIONS))
+SEEK_CODES = (SEEK, SEEK_FORWARD, SEEK_BACKWARD)
+
+# Every spelling the players have used, after lowercasing and turning
+# '_' / '-' into spaces
+ACTION_ALIASES = {
+    "play": PLAY,
+    "resume": PLAY,
+    "pause": PAUSE,
+    "seek": SEEK,
+    "jump": SEEK,
+    "seek forward": SEEK_FORWARD,
+    "forward": SEEK_FORWARD,
+    "skip": SEEK_FORWARD,
+    "seek backward": SEEK_BACKWARD,
+    "seek back": SEEK_BACKWARD,
+    "backward": SEEK_BACKWARD,
+    "rewind": SEEK_BACKWARD,
+}
+
+DEFAULT_LOG_LIMIT = 50  # most recent events listed in a summary
+
+
+def normalize_action(action: str) -> str:
+    """Canonical spelling of an action, e.g. 'seek forward' -> 'seek_forward'"""
+    key = " ".join(action.lower().replace("_", " ").replace("-", " ").split())
+    code = ACTION_ALIASES.get(key)
+    return ACTIONS[code] if code is not None else key.replace(" ", "_")
+
+
+class InteractionLogger:
+    """
+    Handles logging of all user interactions with the video player.
+    Events are kept column-wise (monotonic offset, video position in ms,
+    action code) with a running count per action, so logging is O(1) and
+    the summary statistics never rescan the session. With a sink (see
+    interaction_sink.InteractionSink) every event is also queued for the
+    on-disk session log.
+    """
+    def __init__(self, sink=None):
+        self.sink = sink
+        self.start_time = datetime.now()
+        self.start_monotonic = time.monotonic()
+        self.offsets = array('d')  # seconds since start_monotonic
+        self.positions = array('q')  # video time in ms
+        self.codes = array('H')
+        self.action_names: List[str] = list(ACTIONS)
+        self._codes_by_name: Dict[str, int] = {name: code for code, name in enumerate(ACTIONS)}
+        self.counts: List[int] = [0] * len(ACTIONS)
+
+    def action_code(self, action: str) -> int:
+        code = self._codes_by_name.get(action)
+        if code is None:
+            name = normalize_action(action)
+            code = self._codes_by_name.get(name)
+            if code is None:
+                # Unknown actions still get counted, under their own code
+                code = len(self.action_names)
+                self.action_names.append(name)
+                self.counts.append(0)
+                self._codes_by_name[name] = code
+                if self.sink is not None:
+                    self.sink.record_action(code, name)
+            self._codes_by_name[action] = code
+        return code
+
+    def log_interaction(self, action, video_time):
+        """Log a single interaction with timestamp"""
+        code = self.action_code(action)
+        offset = time.monotonic() - self.start_monotonic
+        self.offsets.append(offset)
+        self.positions.append(int(video_time))
+        self.codes.append(code)
+        self.counts[code] += 1
+        if self.sink is not None:
+            self.sink.record(offset, int(video_time), code)
+
+    def close(self):
+        """Flush the session log, if any, with this session's stats"""
+        if self.sink is not None:
+            self.sink.close(summary=self.stats())
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def count(self, action: str) -> int:
+        return self.counts[self.action_code(action)]
+
+    def total_seeks(self) -> int:
+        return sum(self.counts[code] for code in SEEK_CODES)
+
+    def stats(self) -> Dict:
+        """Per-action counts and session length, in constant time"""
+        return {
+            'events': len(self.codes),
+            'session_seconds': time.monotonic() - self.start_monotonic,
+            'pauses': self.counts[PAUSE],
+            'seeks': self.total_seeks(),
+            'counts': {name: self.counts[code] for code, name in enumerate(self.action_names)}
+        }
+
+    def events(self, start: int = 0) -> Iterator[Tuple[float, str, int]]:
+        """(seconds since start, action, video time in ms) from event index start on"""
+        names = self.action_names
+        for i in range(start, len(self.codes)):
+            yield self.offsets[i], names[self.codes[i]], self.positions[i]
+
+    @property
+    def interactions(self) -> List[Dict]:
+        """The events in the old list-of-dicts form"""
+        return [self._format_event(*event) for event in self.events()]
+
+    def _format_event(self, offset: float, action: str, position: int) -> Dict:
+        return {
+            'timestamp': (self.start_time + timedelta(seconds=offset)).strftime('%H:%M:%S'),
+            'video_time': str(timedelta(milliseconds=position)),
+            'action': action
+        }
+
+    def generate_summary(self, log_limit: int = DEFAULT_LOG_LIMIT):
+        """Create a summary of the session plus its most recent interactions"""
+        stats = self.stats()
+        summary = "\nVIDEO INTERACTION SUMMARY\n"
+        summary += "=" * 50 + "\n"
+
+        summary += f"\nTotal Viewing Session: {timedelta(seconds=stats['session_seconds'])}\n"
+        summary += f"Total Pauses: {stats['pauses']}\n"
+        summary += (f"Total Seeks: {stats['seeks']} (forward {self.counts[SEEK_FORWARD]}, "
+                    f"backward {self.counts[SEEK_BACKWARD]}, jump {self.counts[SEEK]})\n\n")
+
+        # Chronological log, capped so the summary stays cheap for long sessions
+        summary += "Chronological Interaction Log:\n"
+        summary += "-" * 50 + "\n"
+        first = max(0, len(self.codes) - log_limit)
+        if first:
+            summary += f"... {first} earlier interactions not shown\n"
+        for event in self.events(first):
+            interaction = self._format_event(*event)
+            summary += f"[{interaction['timestamp']}] "
+            summary += f"At video time {interaction['video_time']}: "
+            summary += f"{interaction['action']}\n"
+
+        return summary
@@ -0,0 +1,280 @@
+import atexit
+import json
+import os
+import queue
+import struct
+import sys
+import threading
+import time
+import uuid
+import zlib
+from array import array
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+DEFAULT_LOG_DIR = "interaction_logs"
+DEFAULT_QUEUE_SIZE = 10_000
+DEFAULT_BATCH_SIZE = 512
+DEFAULT_FLUSH_INTERVAL = 1.0  # seconds
+CLOSE_TIMEOUT = 5.0  # seconds close() waits for the writer thread
+UNKNOWN_VIDEO = "unknown"  # directory for sessions logged without a youtube_id
+
+# Every record is framed as magic, type, payload length, crc32 of payload.
+# A crash can only leave a torn frame at the end of a file, which replay
+# detects (short read or bad crc) and stops at.
+FRAME_HEADER = struct.Struct("<2sBII")
+MAGIC = b"IL"
+SESSION, EVENTS, ACTION, END = range(4)
+
+_STOP = object()
+
+
+def _frame(record_type: int, payload: bytes) -> bytes:
+    return FRAME_HEADER.pack(MAGIC, record_type, len(payload), zlib.crc32(payload)) + payload
+
+
+def _json_frame(record_type: int, value) -> bytes:
+    return _frame(record_type, json.dumps(value).encode("utf-8"))
+
+
+def _events_frame(offsets: array, positions: array, codes: array) -> bytes:
+    """One batch, stored column-wise so replay is three frombytes calls"""
+    payload = struct.pack("<I", len(codes)) + offsets.tobytes() + positions.tobytes() + codes.tobytes()
+    return _frame(EVENTS, payload)
+
+
+def session_path(log_dir: str, youtube_id: Optional[str], session_id: str) -> str:
+    """log_dir/<youtube_id>/<time>-<session_id>.log"""
+    name = f"{datetime.now().strftime('%Y%m%d-%H%M%S')}-{session_id}.log"
+    return os.path.join(log_dir, youtube_id or UNKNOWN_VIDEO, name)
+
+
+def write_session(path: str, metadata: Dict, actions: Sequence[str],
+                  offsets: array, positions: array, codes: array, end: Optional[Dict] = None):
+    """Write a whole session file in one go, e.g. when importing or generating logs"""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(_json_frame(SESSION, {**metadata, "actions": list(actions)}))
+        if codes:
+            f.write(_events_frame(offsets, positions, codes))
+        f.write(_json_frame(END, end if end is not None else {"events": len(codes), "dropped": 0}))
+
+
+class InteractionSink:
+    """
+    Append-only log file for one viewing session. record() only puts the
+    event on a bounded queue - if the queue is full the event is dropped
+    and counted, never waited for - and a background thread writes queued
+    events in batches, flushing and fsyncing each batch. close() (also run
+    at interpreter exit) drains the queue and marks the session complete.
+    """
+    def __init__(self,
+                 path: str,
+                 metadata: Optional[Dict] = None,
+                 actions: Sequence[str] = (),
+                 queue_size: int = DEFAULT_QUEUE_SIZE,
+                 batch_size: int = DEFAULT_BATCH_SIZE,
+                 flush_interval: float = DEFAULT_FLUSH_INTERVAL):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.dropped = 0
+        self.written = 0
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._new_actions: List[Tuple[int, str]] = []
+        self._closed = False
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = open(path, "ab")
+        header = dict(metadata or {})
+        header.setdefault("started_at", datetime.now().isoformat(timespec="seconds"))
+        header["actions"] = list(actions)
+        self._write(_json_frame(SESSION, header))
+
+        self._thread = threading.Thread(target=self._run, name="interaction-sink", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    @classmethod
+    def for_session(cls, log_dir: str = DEFAULT_LOG_DIR, actions: Sequence[str] = (),
+                    **metadata) -> "InteractionSink":
+        """New log file for one playback, filed under its video so a video's sessions read together"""
+        session_id = uuid.uuid4().hex[:12]
+        return cls(session_path(log_dir, metadata.get("youtube_id"), session_id),
+                   {"session_id": session_id, **metadata}, actions=actions)
+
+    def record(self, offset: float, position: int, code: int):
+        """Queue one event; never blocks the caller"""
+        try:
+            self._queue.put_nowait((offset, position, code))
+        except queue.Full:
+            self.dropped += 1
+
+    def record_action(self, code: int, name: str):
+        """Register an action code that is not in the session header"""
+        # Kept off the queue so a full queue can never lose a code's name
+        self._new_actions.append((code, name))
+
+    def _write(self, data: bytes):
+        self._file.write(data)
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def _run(self):
+        offsets, positions, codes = array("d"), array("q"), array("H")
+        deadline = time.monotonic() + self.flush_interval
+        stopping = False
+        while not stopping:
+            try:
+                item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                if item is _STOP:
+                    stopping = True
+                else:
+                    offsets.append(item[0])
+                    positions.append(item[1])
+                    codes.append(item[2])
+            except queue.Empty:
+                pass
+            if stopping or len(codes) >= self.batch_size or time.monotonic() >= deadline:
+                # Action names go ahead of the events that use them
+                actions = len(self._new_actions)
+                if actions or codes:
+                    batch = b"".join(_json_frame(ACTION, {"code": code, "name": name})
+                                     for code, name in self._new_actions[:actions])
+                    if codes:
+                        batch += _events_frame(offsets, positions, codes)
+                    self._write(batch)
+                    del self._new_actions[:actions]
+                    self.written += len(codes)
+                    offsets, positions, codes = array("d"), array("q"), array("H")
+                deadline = time.monotonic() + self.flush_interval
+
+    def close(self, summary: Optional[Dict] = None):
+        """Write everything still queued, mark the session complete and close the file"""
+        if self._closed:
+            return
+        self._closed = True
+        atexit.unregister(self.close)
+        # Bounded waits: a writer thread that died or hung would never drain the queue
+        if self._thread.is_alive():
+            try:
+                self._queue.put(_STOP, timeout=CLOSE_TIMEOUT)
+            except queue.Full:
+                pass
+            self._thread.join(CLOSE_TIMEOUT)
+        if self._thread.is_alive():
+            # Still writing; an END frame now could interleave with its batch,
+            # so the session is left unterminated and replays as incomplete
+            return
+        # Whatever the writer never got to is lost
+        self.dropped += self._queue.qsize()
+        end = {"ended_at": datetime.now().isoformat(timespec="seconds"),
+               "events": self.written, "dropped": self.dropped}
+        if summary:
+            end["summary"] = summary
+        self._write(_json_frame(END, end))
+        self._file.close()
+
+
+class SessionLog:
+    """A replayed session: metadata plus the event columns"""
+    __slots__ = ("path", "metadata", "actions", "offsets", "positions", "codes", "end")
+
+    def __init__(self, path: str):
+        self.path = path
+        self.metadata: Dict = {}
+        self.actions: List[str] = []
+        self.offsets = array("d")
+        self.positions = array("q")
+        self.codes = array("H")
+        self.end: Optional[Dict] = None
+
+    @property
+    def complete(self) -> bool:
+        """False when the session crashed before close() (its tail may be torn)"""
+        return self.end is not None
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def action_name(self, code: int) -> str:
+        return self.actions[code] if code < len(self.actions) else f"action_{code}"
+
+
+def read_session(path: str) -> SessionLog:
+    """Replay a session file, stopping cleanly at a torn or corrupt final frame"""
+    log = SessionLog(path)
+    with open(path, "rb") as f:
+        data = f.read()
+    view = memoryview(data)
+    position = 0
+    while position + FRAME_HEADER.size <= len(data):
+        magic, record_type, length, crc = FRAME_HEADER.unpack_from(data, position)
+        start = position + FRAME_HEADER.size
+        payload = view[start:start + length]
+        if magic != MAGIC or len(payload) < length or zlib.crc32(payload) != crc:
+            break
+        position = start + length
+
+        if record_type == EVENTS:
+            count = struct.unpack_from("<I", payload)[0]
+            cursor = 4
+            for column, width in ((log.offsets, 8), (log.positions, 8), (log.codes, 2)):
+                column.frombytes(payload[cursor:cursor + count * width])
+                cursor += count * width
+        elif record_type == SESSION:
+            log.metadata = json.loads(bytes(payload))
+            log.actions = list(log.metadata.pop("actions", []))
+        elif record_type == ACTION:
+            action = json.loads(bytes(payload))
+            while len(log.actions) <= action["code"]:
+                log.actions.append(f"action_{len(log.actions)}")
+            log.actions[action["code"]] = action["name"]
+        elif record_type == END:
+            log.end = json.loads(bytes(payload))
+    return log
+
+
+def session_files(log_dir: str = DEFAULT_LOG_DIR, youtube_id: Optional[str] = None) -> List[str]:
+    """Session log paths, oldest first, for one video or for all of them"""
+    if youtube_id is not None:
+        directories = [os.path.join(log_dir, youtube_id)]
+    else:
+        try:
+            directories = [os.path.join(log_dir, name) for name in sorted(os.listdir(log_dir))]
+        except FileNotFoundError:
+            return []
+    paths = []
+    for directory in directories:
+        try:
+            names = sorted(name for name in os.listdir(directory) if name.endswith(".log"))
+        except (FileNotFoundError, NotADirectoryError):
+            continue
+        paths.extend(os.path.join(directory, name) for name in names)
+    return paths
+
+
+def iter_sessions(log_dir: str = DEFAULT_LOG_DIR, youtube_id: Optional[str] = None) -> Iterator[SessionLog]:
+    """Replay every session of one video (or of all videos), oldest first"""
+    for path in session_files(log_dir, youtube_id):
+        yield read_session(path)
+
+
+def main():
+    log_dir = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_LOG_DIR
+    for log in iter_sessions(log_dir):
+        counts: Dict[str, int] = {}
+        for code in log.codes:
+            name = log.action_name(code)
+            counts[name] = counts.get(name, 0) + 1
+        status = "complete" if log.complete else "incomplete"
+        print(f"{os.path.basename(log.path)}  {log.metadata.get('youtube_id', '?')}  "
+              f"{len(log)} events ({status})  {counts}")
+
+
+if __name__ == "__main__":
+    main()
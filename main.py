@@ -1,247 +1,22 @@
-from dataclasses import dataclass
-from typing import List, Dict
-from youtube_transcript_api import YouTubeTranscriptApi
-import random
+from typing import List, Dict, Iterable, Iterator
+from transcript_cache import get_transcript
+from columnar_transcript import as_columnar
+from windowing import (SEGMENTATION_MODES, fixed_duration_boundaries, iter_fixed_duration_boundaries,
+                       iter_topic_shift_boundaries)
+from catalog import default_catalog_path, load_catalog
+from batch import add_batch_arguments, run_batch
+from profiling import add_profiling_arguments, session, stage, timed, timed_iter
+from stage_cache import capture_output, run_staged_analysis
+from topic_classifier import get_topic_classifier
+from cognitive_scorer import get_cognitive_scorer
+from pipeline import AnalysisStages
+import argparse
+from functools import partial
 import time
 from datetime import timedelta
 
-@dataclass
-class Video:
-    title: str
-    youtube_id: str
-    subject: str
-    grade: int
-    description: str
-
-# Comprehensive video database with real YouTube educational videos
-VIDEOS_DB = {
-    5: {  # Class 5
-        "Math": [
-            Video(
-                "Understanding Addition", 
-                "AF31lWJJSgg",  # Your provided video
-                "Math", 
-                5,
-                "Master the basics of addition with detailed explanations"
-            ),
-            Video(
-                "Subtraction Basics", 
-                "AF31lWJJSgg",  # Using same video for demonstration
-                "Math", 
-                5,
-                "Learn fundamental concepts of subtraction"
-            ),
-            Video(
-                "Multiplication Made Easy", 
-                "AF31lWJJSgg",
-                "Math", 
-                5,
-                "Understanding multiplication step by step"
-            ),
-            Video(
-                "Division Concepts", 
-                "AF31lWJJSgg",
-                "Math", 
-                5,
-                "Comprehensive guide to division"
-            ),
-            Video(
-                "Basic Number Operations", 
-                "AF31lWJJSgg",
-                "Math", 
-                5,
-                "Complete overview of number operations"
-            )
-        ],
-        "Science": [
-            Video(
-                "Introduction to Matter", 
-                "AF31lWJJSgg",
-                "Science", 
-                5,
-                "Understanding basic properties of matter"
-            ),
-            Video(
-                "Forces Around Us", 
-                "AF31lWJJSgg",
-                "Science", 
-                5,
-                "Explore different types of forces"
-            ),
-            Video(
-                "Living Things", 
-                "AF31lWJJSgg",
-                "Science", 
-                5,
-                "Learn about characteristics of living things"
-            ),
-            Video(
-                "Our Environment", 
-                "AF31lWJJSgg",
-                "Science", 
-                5,
-                "Discover our environment and ecosystems"
-            ),
-            Video(
-                "Basic Energy", 
-                "AF31lWJJSgg",
-                "Science", 
-                5,
-                "Understanding different forms of energy"
-            )
-        ],
-        "English": [
-            Video(
-                "Nouns and Pronouns", 
-                "AF31lWJJSgg",
-                "English", 
-                5,
-                "Learn about different types of nouns and pronouns"
-            ),
-            Video(
-                "Verbs in Action", 
-                "AF31lWJJSgg",
-                "English", 
-                5,
-                "Master the use of action words"
-            ),
-            Video(
-                "Basic Sentences", 
-                "AF31lWJJSgg",
-                "English", 
-                5,
-                "Understanding sentence structure"
-            ),
-            Video(
-                "Reading Skills", 
-                "AF31lWJJSgg",
-                "English", 
-                5,
-                "Improve your reading comprehension"
-            ),
-            Video(
-                "Writing Basics", 
-                "AF31lWJJSgg",
-                "English", 
-                5,
-                "Learn fundamental writing skills"
-            )
-        ]
-    },
-    6: {  # Class 6
-        "Math": [
-            Video(
-                "Advanced Addition", 
-                "AF31lWJJSgg",
-                "Math", 
-                6,
-                "Complex addition problems and techniques"
-            ),
-            Video(
-                "Complex Subtraction", 
-                "AF31lWJJSgg",
-                "Math", 
-                6,
-                "Advanced subtraction concepts"
-            ),
-            Video(
-                "Multiplication Strategies", 
-                "AF31lWJJSgg",
-                "Math", 
-                6,
-                "Advanced multiplication techniques"
-            ),
-            Video(
-                "Division Mastery", 
-                "AF31lWJJSgg",
-                "Math", 
-                6,
-                "Complex division problems"
-            ),
-            Video(
-                "Number Theory", 
-                "AF31lWJJSgg",
-                "Math", 
-                6,
-                "Understanding advanced number concepts"
-            )
-        ],
-        "Science": [
-            Video(
-                "Advanced Matter", 
-                "AF31lWJJSgg",
-                "Science", 
-                6,
-                "Deep dive into properties of matter"
-            ),
-            Video(
-                "Complex Forces", 
-                "AF31lWJJSgg",
-                "Science", 
-                6,
-                "Understanding advanced force concepts"
-            ),
-            Video(
-                "Life Processes", 
-                "AF31lWJJSgg",
-                "Science", 
-                6,
-                "Learn about complex life processes"
-            ),
-            Video(
-                "Environmental Science", 
-                "AF31lWJJSgg",
-                "Science", 
-                6,
-                "Advanced environmental concepts"
-            ),
-            Video(
-                "Energy Transformations", 
-                "AF31lWJJSgg",
-                "Science", 
-                6,
-                "Understanding energy changes"
-            )
-        ],
-        "English": [
-            Video(
-                "Advanced Grammar", 
-                "AF31lWJJSgg",
-                "English", 
-                6,
-                "Complex grammar concepts"
-            ),
-            Video(
-                "Complex Sentences", 
-                "AF31lWJJSgg",
-                "English", 
-                6,
-                "Learn advanced sentence structures"
-            ),
-            Video(
-                "Reading Mastery", 
-                "AF31lWJJSgg",
-                "English", 
-                6,
-                "Advanced reading comprehension"
-            ),
-            Video(
-                "Writing Skills", 
-                "AF31lWJJSgg",
-                "English", 
-                6,
-                "Develop advanced writing techniques"
-            ),
-            Video(
-                "Communication", 
-                "AF31lWJJSgg",
-                "English", 
-                6,
-                "Master effective communication"
-            )
-        ]
-    }
-}
+# Videos offered in the menus; pass --catalog to use another JSON or SQLite catalog
+DEFAULT_CATALOG = default_catalog_path("segments")
 
 # Cognitive abilities with their descriptions
 COGNITIVE_TYPES = {
@@ -278,79 +53,203 @@ TOPIC_MAPPING = {
     ]
 }
 
+# Create 3-minute segments
+SEGMENT_DURATION = 180  # 3 minutes
+# --segmentation topic cuts where the vocabulary changes, within these bounds
+MIN_SEGMENT_DURATION = 90
+MAX_SEGMENT_DURATION = 300
+SEGMENTATION_CHOICES = SEGMENTATION_MODES + ("topic",)
+
 def format_time(seconds: float) -> str:
     """Convert seconds to readable time format"""
     return str(timedelta(seconds=int(seconds)))
 
-def get_video_segments(youtube_id: str, subject: str) -> List[Dict]:
+def get_video_segments(youtube_id: str, subject: str,
+                       segment_duration: float = SEGMENT_DURATION,
+                       segmentation: str = "loop",
+                       min_duration: float = MIN_SEGMENT_DURATION,
+                       max_duration: float = MAX_SEGMENT_DURATION) -> List[Dict]:
     """Process video into segments with cognitive mappings"""
     try:
         print("\nFetching video transcript...")
-        transcript = YouTubeTranscriptApi.get_transcript(youtube_id)
-        
-        # Create 3-minute segments
-        segment_duration = 180  # 3 minutes
-        segments = []
-        current_segment = []
-        current_duration = 0
+        transcript = get_transcript(youtube_id)
         
         print("Processing video segments...")
-        for entry in transcript:
-            current_segment.append(entry)
-            current_duration += entry['duration']
-            
-            if current_duration >= segment_duration:
-                # Process segment
-                segment_text = ' '.join(item['text'] for item in current_segment)
-                start_time = current_segment[0]['start']
-                end_time = current_segment[-1]['start'] + current_segment[-1]['duration']
-                
-                # Assign random but relevant attributes
-                segment_data = {
-                    'timestamp': f"{format_time(start_time)} - {format_time(end_time)}",
-                    'transcript': segment_text,
-                    'topic': random.choice(TOPIC_MAPPING[subject]),
-                    'cognitive_types': random.sample(list(COGNITIVE_TYPES.keys()), 2),
-                    'start_time': start_time,
-                    'end_time': end_time
-                }
-                segments.append(segment_data)
-                
-                # Reset for next segment
-                current_segment = []
-                current_duration = 0
-        
-        return segments
+        return segment_transcript(transcript, subject, segment_duration, segmentation,
+                                  min_duration, max_duration)
     
     except Exception as e:
         print(f"\nError processing video: {e}")
         return []
 
-def display_segments(segments: List[Dict]):
-    """Display processed segments in a readable format"""
+def iter_windows(transcript, segment_duration: float = SEGMENT_DURATION,
+                 segmentation: str = "loop",
+                 min_duration: float = MIN_SEGMENT_DURATION,
+                 max_duration: float = MAX_SEGMENT_DURATION) -> Iterator[tuple]:
+    """
+    Yield (start_time, end_time, text, first, stop) for each segment as
+    soon as it closes; it holds captions first..stop-1.
+    segmentation="loop" sums durations caption by caption; "vectorized"
+    finds the same boundaries all at once with numpy, which only pays off
+    for long segments. segmentation="topic" ignores segment_duration and
+    cuts where the vocabulary changes, keeping each segment between
+    min_duration and max_duration seconds.
+    """
+    transcript = as_columnar(transcript)
+    starts, durations = transcript.starts, transcript.durations
+    
+    if segmentation == "topic":
+        boundaries = iter_topic_shift_boundaries(transcript, min_duration, max_duration)
+    elif segmentation == "loop":
+        boundaries = iter_fixed_duration_boundaries(durations, segment_duration)
+    else:
+        boundaries = fixed_duration_boundaries(durations, segment_duration, segmentation)
+    for first, stop in boundaries:
+        # The end overlaps the next caption's start, so the range says which captions are ours
+        yield (starts[first], starts[stop - 1] + durations[stop - 1], transcript.text_range(first, stop),
+               first, stop)
+
+@timed("tag")
+def tag_segments(windows: List[tuple], subject: str, transcript) -> List[Dict]:
+    """Classify the topic and cognitive types of a batch of (start, end, text) windows"""
+    topics = get_topic_classifier(TOPIC_MAPPING).classify_batch([window[2] for window in windows], subject)
+    abilities = get_cognitive_scorer().rank_windows(as_columnar(transcript), windows)
+    return [
+        {'topic': topic, 'cognitive_types': ranked[:2]}
+        for topic, ranked in zip(topics, abilities)
+    ]
+
+def tag_segment(window: tuple, subject: str, transcript) -> Dict:
+    """Classify the topic and cognitive types of one window"""
+    return tag_segments([window], subject, transcript)[0]
+
+def make_segment(start_time: float, end_time: float, text: str, tags: Dict) -> Dict:
+    """Combine a window and its tags into the segment dict we display"""
+    return {
+        'timestamp': f"{format_time(start_time)} - {format_time(end_time)}",
+        'transcript': text,
+        'topic': tags['topic'],
+        'cognitive_types': tags['cognitive_types'],
+        'start_time': start_time,
+        'end_time': end_time
+    }
+
+def iter_segments(transcript, subject: str, segment_duration: float = SEGMENT_DURATION,
+                  segmentation: str = "loop",
+                  min_duration: float = MIN_SEGMENT_DURATION,
+                  max_duration: float = MAX_SEGMENT_DURATION) -> Iterator[Dict]:
+    """Yield 3-minute segments one at a time, as soon as each one closes"""
+    transcript = as_columnar(transcript)
+    windows = timed_iter(iter_windows(transcript, segment_duration, segmentation,
+                                      min_duration, max_duration), "window")
+    for window in windows:
+        yield make_segment(*window[:3], tag_segment(window, subject, transcript))
+
+def list_windows(transcript, segment_duration: float = SEGMENT_DURATION,
+                 segmentation: str = "loop",
+                 min_duration: float = MIN_SEGMENT_DURATION,
+                 max_duration: float = MAX_SEGMENT_DURATION) -> List[tuple]:
+    """Every window of a transcript, timed as the window stage"""
+    return list(timed_iter(iter_windows(transcript, segment_duration, segmentation,
+                                        min_duration, max_duration), "window"))
+
+def render_segments(windows: List[tuple], tags: List[Dict]) -> List[Dict]:
+    return [make_segment(*window[:3], tag) for window, tag in zip(windows, tags)]
+
+def analysis_stages(segment_duration: float = SEGMENT_DURATION,
+                    segmentation: str = "loop",
+                    min_duration: float = MIN_SEGMENT_DURATION,
+                    max_duration: float = MAX_SEGMENT_DURATION) -> AnalysisStages:
+    """segment_transcript as window, tag and render stages for the pipeline"""
+    # Every window is tagged in one batch rather than one at a time
+    return AnalysisStages(
+        window=partial(list_windows, segment_duration=segment_duration, segmentation=segmentation,
+                       min_duration=min_duration, max_duration=max_duration),
+        tag=tag_segments,
+        render=render_segments
+    )
+
+def segment_transcript(transcript, subject: str,
+                       segment_duration: float = SEGMENT_DURATION,
+                       segmentation: str = "loop",
+                       min_duration: float = MIN_SEGMENT_DURATION,
+                       max_duration: float = MAX_SEGMENT_DURATION) -> List[Dict]:
+    """Group an already fetched transcript into 3-minute segments"""
+    return analysis_stages(segment_duration, segmentation, min_duration, max_duration).analyze(transcript, subject)
+
+def stream_video_segments(youtube_id: str, subject: str,
+                          segment_duration: float = SEGMENT_DURATION,
+                          segmentation: str = "loop",
+                          min_duration: float = MIN_SEGMENT_DURATION,
+                          max_duration: float = MAX_SEGMENT_DURATION) -> Iterator[Dict]:
+    """get_video_segments as a generator, for incremental display"""
+    try:
+        print("\nFetching video transcript...")
+        transcript = get_transcript(youtube_id)
+        
+        print("Processing video segments...")
+        yield from iter_segments(transcript, subject, segment_duration, segmentation,
+                                 min_duration, max_duration)
+    
+    except Exception as e:
+        print(f"\nError processing video: {e}")
+
+def display_segments(segments: Iterable[Dict]):
+    """Display processed segments in a readable format (accepts a generator)"""
     print("\nVideo Segments Analysis:")
     print("=" * 50)
     
+    # Timed per segment: pulling a streamed segment runs fetch, window and tag,
+    # which are timed as their own stages
     for i, segment in enumerate(segments, 1):
-        print(f"\nSegment {i}:")
-        print(f"Timestamp: {segment['timestamp']}")
-        print(f"Topic: {segment['topic']}")
-        print("Cognitive Types:")
-        for cog_type in segment['cognitive_types']:
-            print(f"  - {cog_type}: {COGNITIVE_TYPES[cog_type]}")
-        print(f"Transcript Preview: {segment['transcript'][:150]}...")
-        print("-" * 50)
+        with stage("render"):
+            print(f"\nSegment {i}:")
+            print(f"Timestamp: {segment['timestamp']}")
+            print(f"Topic: {segment['topic']}")
+            print("Cognitive Types:")
+            for cog_type in segment['cognitive_types']:
+                print(f"  - {cog_type}: {COGNITIVE_TYPES[cog_type]}")
+            print(f"Transcript Preview: {segment['transcript'][:150]}...")
+            print("-" * 50)
 
-def main():
+def staged_video_segments(youtube_id: str, subject: str,
+                          segment_duration: float = SEGMENT_DURATION,
+                          segmentation: str = "loop",
+                          min_duration: float = MIN_SEGMENT_DURATION,
+                          max_duration: float = MAX_SEGMENT_DURATION) -> str:
+    """Analysis through the stage cache; returns the rendered output"""
+    # loop and vectorized cut identically; topic windows depend only on the bounds
+    window_config = {'segment_duration': segment_duration}
+    if segmentation == "topic":
+        window_config = {'min_duration': min_duration, 'max_duration': max_duration}
+    return run_staged_analysis(
+        youtube_id, subject, "main",
+        window_fn=lambda transcript, **config: list(
+            iter_windows(transcript, segmentation=segmentation, **config)
+        ),
+        window_config=window_config,
+        tag_fn=lambda windows, subject: tag_segments(windows, subject, get_transcript(youtube_id)),
+        render_fn=lambda windows, tags: capture_output(
+            display_segments, [make_segment(*window[:3], tag) for window, tag in zip(windows, tags)]
+        )
+    )
+
+def main(stream: bool = False, staged: bool = False, segment_duration: float = SEGMENT_DURATION,
+         segmentation: str = "loop", catalog=None,
+         min_duration: float = MIN_SEGMENT_DURATION, max_duration: float = MAX_SEGMENT_DURATION):
+    if catalog is None:
+        catalog = load_catalog(DEFAULT_CATALOG)
     print("\n=== Welcome to CLIP Learning System ===")
     print("An intelligent video learning platform")
     
     # Get user's class
+    grades = catalog.grades()
+    grade_choices = " or ".join(str(g) for g in grades)
     while True:
         try:
-            grade = int(input("\nEnter your class (5 or 6): "))
-            if grade not in [5, 6]:
-                print("Please enter either 5 or 6")
+            grade = int(input(f"\nEnter your class ({grade_choices}): "))
+            if grade not in grades:
+                print(f"Please enter either {grade_choices}")
                 continue
             break
         except ValueError:
@@ -358,7 +257,7 @@ def main():
     
     # Display subjects
     print("\nAvailable subjects:")
-    subjects = list(VIDEOS_DB[grade].keys())
+    subjects = catalog.subjects(grade)
     for i, subject in enumerate(subjects, 1):
         print(f"{i}. {subject}")
     
@@ -377,7 +276,7 @@ def main():
     
     # Display available videos
     print(f"\nAvailable {selected_subject} videos:")
-    videos = VIDEOS_DB[grade][selected_subject]
+    videos = catalog.videos(grade, selected_subject)
     for i, video in enumerate(videos, 1):
         print(f"\n{i}. {video.title}")
         print(f"   Description: {video.description}")
@@ -399,11 +298,55 @@ def main():
     print("This may take a moment...")
     
     # Process and display video segments
-    segments = get_video_segments(selected_video.youtube_id, selected_video.subject)
-    if segments:
-        display_segments(segments)
+    if staged:
+        try:
+            print(staged_video_segments(selected_video.youtube_id, selected_video.subject,
+                                        segment_duration, segmentation, min_duration, max_duration), end='')
+        except Exception as e:
+            print(f"\nError processing video: {e}")
+    elif stream:
+        display_segments(stream_video_segments(selected_video.youtube_id, selected_video.subject,
+                                               segment_duration, segmentation, min_duration, max_duration))
+    else:
+        segments = get_video_segments(selected_video.youtube_id, selected_video.subject,
+                                      segment_duration, segmentation, min_duration, max_duration)
+        if segments:
+            display_segments(segments)
     
     print("\nThank you for using CLIP Learning System!")
 
+def parse_args():
+    parser = argparse.ArgumentParser(description="CLIP Learning System")
+    add_batch_arguments(parser)
+    add_profiling_arguments(parser)
+    parser.add_argument('--catalog', default=DEFAULT_CATALOG,
+                        help='video catalog to offer, a JSON file or SQLite .db (default: bundled catalog)')
+    parser.add_argument('--stream', action='store_true',
+                        help='print each segment as soon as it is processed')
+    parser.add_argument('--staged', action='store_true',
+                        help='reuse stored window/tag/render results when their inputs are unchanged')
+    parser.add_argument('--segment-duration', type=float, default=SEGMENT_DURATION,
+                        help=f'seconds of captions per segment (default: {SEGMENT_DURATION})')
+    parser.add_argument('--segmentation', choices=SEGMENTATION_CHOICES, default='loop',
+                        help='loop/vectorized cut every --segment-duration seconds; vectorized needs numpy '
+                             'and is only faster for segments of several minutes; '
+                             'topic cuts where the vocabulary changes')
+    parser.add_argument('--min-segment', type=float, default=MIN_SEGMENT_DURATION,
+                        help=f'shortest topic segment in seconds (default: {MIN_SEGMENT_DURATION})')
+    parser.add_argument('--max-segment', type=float, default=MAX_SEGMENT_DURATION,
+                        help=f'longest topic segment in seconds (default: {MAX_SEGMENT_DURATION})')
+    return parser.parse_args()
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    args = parse_args()
+    catalog = load_catalog(args.catalog)
+    with session(args.profile, args.profile_output, args.timings):
+        if args.batch:
+            analysis = analysis_stages(args.segment_duration, args.segmentation,
+                                       args.min_segment, args.max_segment)
+            run_batch(catalog, analysis, args.output, args.workers, args.fetcher,
+                      queue_size=args.queue_size, processes=args.processes)
+        else:
+            main(stream=args.stream, staged=args.staged, segment_duration=args.segment_duration,
+                 segmentation=args.segmentation, catalog=catalog,
+                 min_duration=args.min_segment, max_duration=args.max_segment)
\ No newline at end of file
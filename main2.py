@@ -1,255 +1,31 @@
-from dataclasses import dataclass
-from typing import List, Dict
-from youtube_transcript_api import YouTubeTranscriptApi
-import random
-from datetime import timedelta
+from catalog import default_catalog_path, load_catalog
+from batch import add_batch_arguments, run_batch
+from profiling import add_profiling_arguments, session
+from analysis import (MIN_SEGMENT_DURATION, MAX_SEGMENT_DURATION, SEGMENTATION_MODES,
+                      analysis_stages, analyze_video, display_analysis, display_analysis_stream,
+                      index_analysis, staged_analysis, stream_analysis)
+import argparse
 
-# Define our basic Video class to store video information
-@dataclass
-class Video:
-    title: str
-    youtube_id: str
-    subject: str
-    grade: int
-    description: str
+# Videos offered in the menus; pass --catalog to use another JSON or SQLite catalog
+DEFAULT_CATALOG = default_catalog_path("analysis")
 
-# Our video database with two classes, two subjects, three videos each
-VIDEOS_DB = {
-    5: {  # Class 5
-        "Math": [
-            Video(
-                "Basic Mathematics", 
-                "AF31lWJJSgg",  # First provided video
-                "Math", 
-                5,
-                "Learn fundamental mathematics concepts with detailed explanations"
-            ),
-            Video(
-                "Number Operations", 
-                "EXUr_VfIiSI",  # Second provided video
-                "Math", 
-                5,
-                "Master basic number operations and calculations"
-            ),
-            Video(
-                "Math Practice Problems", 
-                "AF31lWJJSgg",  # Using first video again for demonstration
-                "Math", 
-                5,
-                "Practice solving mathematical problems step by step"
-            )
-        ],
-        "Science": [
-            Video(
-                "Introduction to Science", 
-                "EXUr_VfIiSI",
-                "Science", 
-                5,
-                "Basic introduction to scientific concepts"
-            ),
-            Video(
-                "Natural Phenomena", 
-                "AF31lWJJSgg",
-                "Science", 
-                5,
-                "Understanding the world around us"
-            ),
-            Video(
-                "Scientific Method", 
-                "EXUr_VfIiSI",
-                "Science", 
-                5,
-                "Learn how scientists solve problems"
-            )
-        ]
-    },
-    6: {  # Class 6
-        "Math": [
-            Video(
-                "Advanced Mathematics", 
-                "AF31lWJJSgg",
-                "Math", 
-                6,
-                "More complex mathematical concepts and applications"
-            ),
-            Video(
-                "Problem Solving", 
-                "EXUr_VfIiSI",
-                "Math", 
-                6,
-                "Advanced problem-solving techniques"
-            ),
-            Video(
-                "Mathematical Reasoning", 
-                "AF31lWJJSgg",
-                "Math", 
-                6,
-                "Develop logical thinking through mathematics"
-            )
-        ],
-        "Science": [
-            Video(
-                "Scientific Principles", 
-                "EXUr_VfIiSI",
-                "Science", 
-                6,
-                "Advanced scientific concepts and theories"
-            ),
-            Video(
-                "Experimental Science", 
-                "AF31lWJJSgg",
-                "Science", 
-                6,
-                "Learn about scientific experiments"
-            ),
-            Video(
-                "Applied Science", 
-                "EXUr_VfIiSI",
-                "Science", 
-                6,
-                "Real-world applications of science"
-            )
-        ]
-    }
-}
-
-def format_timestamp(seconds: float) -> str:
-    """Convert seconds to HH:MM:SS format"""
-    return str(timedelta(seconds=int(seconds))).zfill(8)
-
-def get_random_segment_duration() -> int:
-    """Generate random segment duration between 30 and 120 seconds"""
-    return random.randint(30, 120)
-
-def get_topic_by_subject(subject: str) -> str:
-    """Get a random topic based on subject"""
-    topics = {
-        "Math": [
-            "Number Operations",
-            "Problem Solving",
-            "Logical Reasoning",
-            "Pattern Recognition",
-            "Mathematical Concepts",
-            "Practical Applications"
-        ],
-        "Science": [
-            "Scientific Principles",
-            "Natural Phenomena",
-            "Experimental Methods",
-            "Scientific Reasoning",
-            "Real-world Applications",
-            "Data Analysis"
-        ]
-    }
-    return random.choice(topics.get(subject, topics["Math"]))
-
-def get_random_cognitive_types(count: int = 2) -> List[tuple]:
-    """Get random cognitive abilities with descriptions"""
-    cognitive_types = {
-        "attention": "Ability to focus on specific details and maintain concentration",
-        "memory": "Ability to retain and recall information effectively",
-        "logic_and_reasoning": "Ability to analyze problems and think critically",
-        "auditory_processing": "Ability to understand and process spoken information",
-        "visual_processing": "Ability to interpret and understand visual information",
-        "processing_speed": "Speed at which information is processed and understood"
-    }
-    return random.sample(list(cognitive_types.items()), count)
-
-def analyze_video(youtube_id: str, subject: str):
-    """
-    Analyze video and generate three different analyses:
-    1. Transcript with timestamps
-    2. Topics with timestamps
-    3. Cognitive abilities with timestamps
-    """
-    try:
-        # Get the transcript
-        print("\nFetching video transcript...")
-        transcript = YouTubeTranscriptApi.get_transcript(youtube_id)
-        total_duration = transcript[-1]['start'] + transcript[-1]['duration']
-        
-        # Initialize our analysis segments
-        current_time = 0
-        transcript_segments = []
-        topic_segments = []
-        cognitive_segments = []
-        
-        print("Processing video segments...")
-        while current_time < total_duration:
-            # Get random duration for this segment
-            segment_duration = get_random_segment_duration()
-            end_time = min(current_time + segment_duration, total_duration)
-            
-            # Collect transcript text for this segment
-            segment_text = ""
-            for entry in transcript:
-                if current_time <= entry['start'] < end_time:
-                    segment_text += f"{entry['text']} "
-            
-            # Create timestamp string
-            timestamp = f"{format_timestamp(current_time)} - {format_timestamp(end_time)}"
-            
-            # Add to our three analyses
-            transcript_segments.append({
-                'timestamp': timestamp,
-                'text': segment_text.strip()
-            })
-            
-            topic_segments.append({
-                'timestamp': timestamp,
-                'topic': get_topic_by_subject(subject)
-            })
-            
-            cognitive_segments.append({
-                'timestamp': timestamp,
-                'cognitive_types': get_random_cognitive_types()
-            })
-            
-            current_time = end_time
-        
-        return transcript_segments, topic_segments, cognitive_segments
-        
-    except Exception as e:
-        print(f"Error processing video: {e}")
-        return [], [], []
-
-def display_analysis(transcript_segments, topic_segments, cognitive_segments):
-    """Display all three analyses in a clear, formatted way"""
-    
-    print("\n1. TRANSCRIPT ANALYSIS")
-    print("=" * 80)
-    for segment in transcript_segments:
-        print(f"\nTimestamp: {segment['timestamp']}")
-        print(f"Transcript: {segment['text']}")
-        print("-" * 80)
-    
-    print("\n2. TOPIC ANALYSIS")
-    print("=" * 80)
-    for segment in topic_segments:
-        print(f"\nTimestamp: {segment['timestamp']}")
-        print(f"Topic: {segment['topic']}")
-        print("-" * 80)
-    
-    print("\n3. COGNITIVE ABILITY ANALYSIS")
-    print("=" * 80)
-    for segment in cognitive_segments:
-        print(f"\nTimestamp: {segment['timestamp']}")
-        print("Cognitive Types:")
-        for cog_type, description in segment['cognitive_types']:
-            print(f"  - {cog_type.replace('_', ' ').title()}: {description}")
-        print("-" * 80)
-
-def main():
+def main(stream: bool = False, staged: bool = False,
+         min_duration: int = MIN_SEGMENT_DURATION, max_duration: int = MAX_SEGMENT_DURATION,
+         segmentation: str = "random", catalog=None, index: bool = False):
     """Main function to run the CLIP Learning System"""
+    if catalog is None:
+        catalog = load_catalog(DEFAULT_CATALOG)
     print("\n=== Welcome to CLIP Learning System ===")
     print("An intelligent video learning platform")
     
     # Get user's class
+    grades = catalog.grades()
+    grade_choices = " or ".join(str(g) for g in grades)
     while True:
         try:
-            grade = int(input("\nEnter your class (5 or 6): "))
-            if grade not in [5, 6]:
-                print("Please enter either 5 or 6")
+            grade = int(input(f"\nEnter your class ({grade_choices}): "))
+            if grade not in grades:
+                print(f"Please enter either {grade_choices}")
                 continue
             break
         except ValueError:
@@ -257,7 +33,7 @@ def main():
     
     # Display subjects
     print("\nAvailable subjects:")
-    subjects = list(VIDEOS_DB[grade].keys())
+    subjects = catalog.subjects(grade)
     for i, subject in enumerate(subjects, 1):
         print(f"{i}. {subject}")
     
@@ -276,7 +52,7 @@ def main():
     
     # Display available videos
     print(f"\nAvailable {selected_subject} videos:")
-    videos = VIDEOS_DB[grade][selected_subject]
+    videos = catalog.videos(grade, selected_subject)
     for i, video in enumerate(videos, 1):
         print(f"\n{i}. {video.title}")
         print(f"   Description: {video.description}")
@@ -297,17 +73,65 @@ def main():
     print(f"\nProcessing video: {selected_video.title}")
     
     # Process and display video segments
-    transcript_segments, topic_segments, cognitive_segments = analyze_video(
-        selected_video.youtube_id, 
-        selected_video.subject
-    )
-    
-    if transcript_segments and topic_segments and cognitive_segments:
-        display_analysis(transcript_segments, topic_segments, cognitive_segments)
+    if staged:
+        try:
+            print(staged_analysis(selected_video.youtube_id, selected_video.subject,
+                                  min_duration, max_duration, segmentation), end='')
+        except Exception as e:
+            print(f"Error processing video: {e}")
+    elif stream:
+        shown = display_analysis_stream(stream_analysis(selected_video.youtube_id, selected_video.subject,
+                                                        min_duration, max_duration, segmentation))
+        if not shown:
+            print("Error: Could not process video segments")
     else:
-        print("Error: Could not process video segments")
+        transcript_segments, topic_segments, cognitive_segments = analyze_video(
+            selected_video.youtube_id, 
+            selected_video.subject,
+            min_duration,
+            max_duration,
+            segmentation
+        )
+        
+        if transcript_segments and topic_segments and cognitive_segments:
+            if index:
+                index_analysis(selected_video.youtube_id, {'transcript': transcript_segments})
+            display_analysis(transcript_segments, topic_segments, cognitive_segments)
+        else:
+            print("Error: Could not process video segments")
     
     print("\nThank you for using CLIP Learning System!")
 
+def parse_args():
+    parser = argparse.ArgumentParser(description="CLIP Learning System")
+    add_batch_arguments(parser)
+    add_profiling_arguments(parser)
+    parser.add_argument('--catalog', default=DEFAULT_CATALOG,
+                        help='video catalog to offer, a JSON file or SQLite .db (default: bundled catalog)')
+    parser.add_argument('--stream', action='store_true',
+                        help='print each segment as soon as it is processed')
+    parser.add_argument('--staged', action='store_true',
+                        help='reuse stored window/tag/render results when their inputs are unchanged')
+    parser.add_argument('--min-segment', type=int, default=MIN_SEGMENT_DURATION,
+                        help=f'shortest segment in seconds (default: {MIN_SEGMENT_DURATION})')
+    parser.add_argument('--max-segment', type=int, default=MAX_SEGMENT_DURATION,
+                        help=f'longest segment in seconds (default: {MAX_SEGMENT_DURATION})')
+    parser.add_argument('--segmentation', choices=SEGMENTATION_MODES, default='random',
+                        help='random segment lengths, or cut where the vocabulary changes (topic)')
+    parser.add_argument('--index', action='store_true',
+                        help='add the analyzed video to the search index (--batch always does)')
+    return parser.parse_args()
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    args = parse_args()
+    catalog = load_catalog(args.catalog)
+    with session(args.profile, args.profile_output, args.timings):
+        if args.batch:
+            analysis = analysis_stages(args.min_segment, args.max_segment, args.segmentation)
+            run_batch(catalog, analysis, args.output, args.workers, args.fetcher,
+                      on_result=index_analysis, queue_size=args.queue_size,
+                      processes=args.processes)
+        else:
+            main(stream=args.stream, staged=args.staged, min_duration=args.min_segment,
+                 max_duration=args.max_segment, segmentation=args.segmentation, catalog=catalog,
+                 index=args.index)
\ No newline at end of file
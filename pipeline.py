@@ -0,0 +1,221 @@
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence
+
+from columnar_transcript import as_columnar
+from transcript_cache import get_transcript
+
+DEFAULT_QUEUE_SIZE = 4  # items a stage may run ahead of the next one
+DEFAULT_FETCH_WORKERS = 8
+
+_DONE = object()
+_POLL_SECONDS = 0.1
+
+
+@dataclass
+class Stage:
+    """
+    One step of a pipeline: fn(value) -> value. A stage with one worker
+    calls fn from a single thread, so fn may use unlocked caches.
+    """
+    name: str
+    fn: Callable[[Any], Any]
+    workers: int = 1
+
+
+@dataclass
+class PipelineItem:
+    """An input on its way through the stages; error stops it at the failing stage"""
+    index: int
+    value: Any
+    error: Optional[str] = None
+    failed_stage: Optional[str] = None
+    seconds: Dict[str, float] = field(default_factory=dict)
+
+
+class Pipeline:
+    """
+    Runs inputs through a chain of stages, each on its own thread(s),
+    connected by bounded queues: while one item is being tagged the next
+    is already being fetched, and no stage gets more than queue_size
+    items ahead of the stage after it. Items come out in completion order.
+    """
+    def __init__(self, stages: Sequence[Stage], queue_size: int = DEFAULT_QUEUE_SIZE):
+        if not stages:
+            raise ValueError("a pipeline needs at least one stage")
+        self.stages = list(stages)
+        self.queue_size = queue_size
+
+    def run(self, inputs: Iterable) -> Iterator[PipelineItem]:
+        queues = [queue.Queue(maxsize=self.queue_size) for _ in range(len(self.stages) + 1)]
+        stopped = threading.Event()
+        lock = threading.Lock()
+        feed_errors: List[BaseException] = []
+
+        # Both poll, so nothing stays blocked once the consumer stops early
+        def put(q, item):
+            while not stopped.is_set():
+                try:
+                    q.put(item, timeout=_POLL_SECONDS)
+                    return
+                except queue.Full:
+                    pass
+
+        def get(q):
+            while not stopped.is_set():
+                try:
+                    return q.get(timeout=_POLL_SECONDS)
+                except queue.Empty:
+                    pass
+            return _DONE
+
+        def feed():
+            try:
+                for index, value in enumerate(inputs):
+                    if stopped.is_set():
+                        return
+                    put(queues[0], PipelineItem(index, value))
+            except BaseException as e:
+                feed_errors.append(e)
+            finally:
+                for _ in range(self.stages[0].workers):
+                    put(queues[0], _DONE)
+
+        def work(position, running):
+            stage = self.stages[position]
+            inbox, outbox = queues[position], queues[position + 1]
+            while True:
+                item = get(inbox)
+                if item is _DONE:
+                    with lock:
+                        running[0] -= 1
+                        last = running[0] == 0
+                    if last:
+                        # The last worker out tells every worker downstream
+                        following = position + 1
+                        for _ in range(self.stages[following].workers if following < len(self.stages) else 1):
+                            put(outbox, _DONE)
+                    return
+                if item.error is None:
+                    started = time.perf_counter()
+                    try:
+                        item.value = stage.fn(item.value)
+                    except Exception as e:
+                        item.error, item.failed_stage = str(e), stage.name
+                    item.seconds[stage.name] = time.perf_counter() - started
+                put(outbox, item)
+
+        threads = [threading.Thread(target=feed, name="pipeline-feed", daemon=True)]
+        for position, stage in enumerate(self.stages):
+            running = [stage.workers]
+            threads.extend(threading.Thread(target=work, args=(position, running),
+                                            name=f"pipeline-{stage.name}-{n}", daemon=True)
+                           for n in range(stage.workers))
+        for thread in threads:
+            thread.start()
+
+        try:
+            while True:
+                item = get(queues[-1])
+                if item is _DONE:
+                    break
+                yield item
+        finally:
+            stopped.set()
+            for thread in threads:
+                thread.join()
+        if feed_errors:
+            raise feed_errors[0]
+
+
+@dataclass
+class AnalysisStages:
+    """
+    A script's analysis split into the stages the engine overlaps:
+      window(transcript) -> [(start, end, text), ...]
+      tag(windows, subject, transcript) -> one tag dict per window
+      render(windows, tags) -> the result for one video
+    """
+    window: Callable
+    tag: Callable
+    render: Callable
+
+    def analyze(self, transcript, subject: str):
+        """All three stages on one transcript, in the calling thread"""
+        transcript = as_columnar(transcript)
+        windows = self.window(transcript)
+        return self.render(windows, self.tag(windows, subject, transcript))
+
+
+def run_analysis(analysis, transcript, subject: str):
+    """One video through AnalysisStages, or through a plain analyze(transcript, subject)"""
+    if isinstance(analysis, AnalysisStages):
+        return analysis.analyze(transcript, subject)
+    return analysis(transcript, subject)
+
+
+@dataclass
+class AnalysisJob:
+    """One video as it moves through the analysis pipeline"""
+    video: Any
+    transcript: Any = None
+    windows: Optional[List] = None
+    tags: Optional[List] = None
+    result: Any = None
+
+
+def analysis_pipeline(analysis,
+                      fetch: Callable[[str], Any] = get_transcript,
+                      fetch_workers: int = DEFAULT_FETCH_WORKERS,
+                      queue_size: int = DEFAULT_QUEUE_SIZE) -> Pipeline:
+    """
+    fetch -> window -> tag -> render for AnalysisJob values. Fetching is
+    I/O bound and gets fetch_workers threads; the other stages get one
+    each, which is also what keeps the shared tagging caches single-threaded.
+    analysis may also be a plain analyze(transcript, subject), run as a
+    single stage after fetch.
+    """
+    def fetch_stage(job):
+        job.transcript = as_columnar(fetch(job.video.youtube_id))
+        return job
+
+    if not isinstance(analysis, AnalysisStages):
+        def analyze_stage(job):
+            job.result = run_analysis(analysis, job.transcript, job.video.subject)
+            job.transcript = None
+            return job
+
+        return Pipeline([Stage("fetch", fetch_stage, fetch_workers),
+                         Stage("analyze", analyze_stage)], queue_size)
+
+    def window_stage(job):
+        job.windows = analysis.window(job.transcript)
+        return job
+
+    def tag_stage(job):
+        job.tags = analysis.tag(job.windows, job.video.subject, job.transcript)
+        return job
+
+    def render_stage(job):
+        job.result = analysis.render(job.windows, job.tags)
+        # Nothing downstream needs these, and the queues should stay small
+        job.transcript = job.windows = job.tags = None
+        return job
+
+    return Pipeline([
+        Stage("fetch", fetch_stage, fetch_workers),
+        Stage("window", window_stage),
+        Stage("tag", tag_stage),
+        Stage("render", render_stage),
+    ], queue_size)
+
+
+def analyze_videos(videos: Iterable, analysis,
+                   fetch: Callable[[str], Any] = get_transcript,
+                   fetch_workers: int = DEFAULT_FETCH_WORKERS,
+                   queue_size: int = DEFAULT_QUEUE_SIZE) -> Iterator[PipelineItem]:
+    """Run videos through analysis_pipeline; each item's value is its AnalysisJob"""
+    pipeline = analysis_pipeline(analysis, fetch, fetch_workers, queue_size)
+    return pipeline.run(AnalysisJob(video) for video in videos)
@@ -0,0 +1,97 @@
+import threading
+from typing import Callable, Optional
+
+import vlc
+
+SEEK_DEBOUNCE_MS = 200  # a slider drag is one seek once it pauses this long
+
+
+class PlayerState:
+    """
+    Length, position and playing flag of a VLC player, kept current by
+    the player's event manager instead of being polled. Handlers run on
+    VLC's event thread and only store values; every change sets changed,
+    which the UI thread checks and clears, so it redraws only when
+    something actually happened and never touches the toolkit from VLC's
+    thread.
+    """
+    def __init__(self, player):
+        self.player = player
+        self.length = max(player.get_length(), 0)  # ms, 0 until the media is parsed
+        self.time = max(player.get_time(), 0)  # ms
+        self.playing = False
+        self.ended = False
+        self.changed = threading.Event()
+
+        # VLC keeps only weak references to callbacks; hold them here
+        self._handlers = {
+            vlc.EventType.MediaPlayerLengthChanged: lambda event: self._update(length=event.u.new_length),
+            vlc.EventType.MediaPlayerTimeChanged: lambda event: self._update(time=event.u.new_time),
+            vlc.EventType.MediaPlayerPlaying: lambda event: self._update(playing=True, ended=False),
+            vlc.EventType.MediaPlayerPaused: lambda event: self._update(playing=False),
+            vlc.EventType.MediaPlayerStopped: lambda event: self._update(playing=False),
+            vlc.EventType.MediaPlayerEndReached: lambda event: self._update(playing=False, ended=True),
+        }
+        self._events = player.event_manager()
+        for event_type, handler in self._handlers.items():
+            self._events.event_attach(event_type, handler)
+
+    def _update(self, **changes):
+        for name, value in changes.items():
+            setattr(self, name, value)
+        self.changed.set()
+
+    def seeked(self, target_ms: int):
+        """Record a seek we issued, without waiting for VLC to report it"""
+        self._update(time=target_ms, ended=False)
+
+    def fraction(self) -> float:
+        return min(1.0, self.time / self.length) if self.length > 0 else 0.0
+
+    def detach(self):
+        for event_type in self._handlers:
+            self._events.event_detach(event_type)
+
+
+class SeekCoalescer:
+    """
+    Collapses a burst of seek requests, like the callbacks of one slider
+    drag, into a single seek to the last target. schedule(delay_ms, fn)
+    and cancel(handle) come from the UI toolkit, e.g. Tk's after and
+    after_cancel, so the seek runs on the UI thread.
+    """
+    def __init__(self, seek: Callable[[int], None],
+                 schedule: Callable[[int, Callable[[], None]], object],
+                 cancel: Callable[[object], None],
+                 delay_ms: int = SEEK_DEBOUNCE_MS):
+        self.seek = seek
+        self.schedule = schedule
+        self.cancel = cancel
+        self.delay_ms = delay_ms
+        self.target: Optional[int] = None
+        self._handle = None
+
+    @property
+    def pending(self) -> bool:
+        return self.target is not None
+
+    def request(self, target_ms: int):
+        self.target = target_ms
+        if self._handle is not None:
+            self.cancel(self._handle)
+        self._handle = self.schedule(self.delay_ms, self.flush)
+
+    def flush(self):
+        """Seek now to the latest requested target, if any"""
+        if self._handle is not None:
+            self.cancel(self._handle)
+            self._handle = None
+        if self.target is not None:
+            target, self.target = self.target, None
+            self.seek(target)
+
+    def discard(self):
+        if self._handle is not None:
+            self.cancel(self._handle)
+            self._handle = None
+        self.target = None
@@ -0,0 +1,51 @@
+import importlib
+from typing import Callable, Dict, Tuple
+
+from profiling import stage
+
+# Backend name -> (module, class, method that starts playback). The modules
+# import VLC, Tk and pytube themselves, so nothing heavy is loaded until a
+# backend is actually chosen.
+PLAYER_BACKENDS: Dict[str, Tuple[str, str, str]] = {
+    "gui": ("gui_player", "VideoPlayer", "start"),
+    "cli": ("cli_player", "CLIVideoPlayer", "play"),
+}
+
+_loaded: Dict[str, object] = {}
+
+
+def _import(module_name: str):
+    """Import a backend module once, timing it as a "load:<module>" stage"""
+    module = _loaded.get(module_name)
+    if module is None:
+        with stage(f"load:{module_name}"):
+            module = importlib.import_module(module_name)
+        _loaded[module_name] = module
+    return module
+
+
+def get_player_class(name: str):
+    if name not in PLAYER_BACKENDS:
+        raise ValueError(f"unknown player backend {name!r}, expected one of {tuple(PLAYER_BACKENDS)}")
+    module_name, class_name, _ = PLAYER_BACKENDS[name]
+    return getattr(_import(module_name), class_name)
+
+
+def launch_player(name: str, video_path: str, video_title: str, **options):
+    """
+    Open video_path in the named backend and block until playback ends.
+    options go to the player, e.g. download= for progressive playback
+    and sink= for the on-disk interaction log.
+    """
+    player = get_player_class(name)(video_path, video_title, **options)
+    getattr(player, PLAYER_BACKENDS[name][2])()
+
+
+def get_downloader() -> Callable[[str], str]:
+    """download_youtube_video, importing pytube on first use"""
+    return _import("downloader").download_youtube_video
+
+
+def get_progressive_downloader() -> Callable:
+    """start_progressive_download, importing pytube on first use"""
+    return _import("downloader").start_progressive_download
@@ -0,0 +1,71 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import profiling
+from pipeline import run_analysis
+from shared_transcripts import SharedTranscripts
+
+DEFAULT_CHUNK_SIZE = 16  # videos per task, so results cross the process boundary in batches
+
+# Set in each worker by _init_worker
+_shared: Optional[SharedTranscripts] = None
+_analysis = None
+
+
+def default_processes() -> int:
+    return os.cpu_count() or 1
+
+
+def _init_worker(name: str, analysis, timings: bool):
+    global _shared, _analysis
+    _shared = SharedTranscripts.attach(name)
+    _analysis = analysis
+    # A forked worker starts with a copy of the parent's timings; it reports only its own
+    profiling.reset()
+    if timings:
+        profiling.enable()
+    else:
+        profiling.disable()
+
+
+def _analyze_chunk(chunk: Sequence[Tuple[int, str, str]]) -> Tuple[List[Tuple], Dict]:
+    """Outcomes of a chunk plus the stage timings recorded while analyzing it"""
+    outcomes = []
+    for index, youtube_id, subject in chunk:
+        started = time.perf_counter()
+        try:
+            result, error = run_analysis(_analysis, _shared.get(youtube_id), subject), None
+        except Exception as e:
+            result, error = None, str(e)
+        outcomes.append((index, result, error, time.perf_counter() - started))
+    stages = profiling.stage_stats() if profiling.is_enabled() else {}
+    profiling.reset()
+    return outcomes, stages
+
+
+def analyze_in_processes(jobs: Sequence[Tuple[str, str]],
+                         analysis,
+                         shared: SharedTranscripts,
+                         processes: Optional[int] = None,
+                         chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[Tuple]:
+    """
+    Analyze (youtube_id, subject) jobs on a process pool, so CPU-bound
+    windowing and tagging use every core instead of one. Workers attach
+    to the shared transcripts once and read them in place; only jobs and
+    results are pickled. analysis must be picklable (AnalysisStages of
+    module-level functions and partials, or a plain function). Stage
+    timings recorded in the workers are merged into this process's.
+    Yields (job index, result, error, seconds) in completion order.
+    """
+    chunks = [[(index, youtube_id, subject)
+               for index, (youtube_id, subject) in enumerate(jobs[start:start + chunk_size], start)]
+              for start in range(0, len(jobs), chunk_size)]
+    with ProcessPoolExecutor(max_workers=processes or default_processes(), initializer=_init_worker,
+                             initargs=(shared.name, analysis, profiling.is_enabled())) as pool:
+        futures = [pool.submit(_analyze_chunk, chunk) for chunk in chunks]
+        for future in as_completed(futures):
+            outcomes, stages = future.result()
+            profiling.merge_stats(stages)
+            yield from outcomes
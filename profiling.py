@@ -0,0 +1,208 @@
+import contextlib
+import functools
+import io
+import threading
+import time
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, Iterator
+
+if TYPE_CHECKING:
+    import cProfile
+    import tracemalloc
+
+DEFAULT_REPORT = "profile_report.txt"
+
+# Stage timing is off unless a script is run with --timings or --profile;
+# every helper below checks this first so the disabled cost is one lookup
+_enabled = False
+_stages: Dict[str, Dict[str, float]] = {}
+# Fetch threads and pipeline stages record concurrently
+_lock = threading.Lock()
+
+
+def enable():
+    global _enabled
+    _enabled = True
+
+
+def disable():
+    global _enabled
+    _enabled = False
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def reset():
+    with _lock:
+        _stages.clear()
+
+
+def record(name: str, seconds: float, count: int = 1):
+    """Add one measurement to a stage"""
+    with _lock:
+        stats = _stages.get(name)
+        if stats is None:
+            stats = _stages[name] = {"count": 0, "total": 0.0, "max": 0.0}
+        stats["count"] += count
+        stats["total"] += seconds
+        if seconds > stats["max"]:
+            stats["max"] = seconds
+
+
+def merge_stats(stages: Dict[str, Dict[str, float]]):
+    """Add stage_stats() from another process, e.g. a pool worker"""
+    with _lock:
+        for name, other in stages.items():
+            stats = _stages.get(name)
+            if stats is None:
+                stats = _stages[name] = {"count": 0, "total": 0.0, "max": 0.0}
+            stats["count"] += other["count"]
+            stats["total"] += other["total"]
+            stats["max"] = max(stats["max"], other["max"])
+
+
+class _StageTimer:
+    __slots__ = ("name", "started")
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        record(self.name, time.perf_counter() - self.started)
+        return False
+
+
+_NOOP = contextlib.nullcontext()
+
+
+def stage(name: str):
+    """Context manager timing a block as one call of the named stage"""
+    return _StageTimer(name) if _enabled else _NOOP
+
+
+def timed(name: str) -> Callable:
+    """Decorator timing every call of a function as the named stage"""
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return fn(*args, **kwargs)
+            started = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                record(name, time.perf_counter() - started)
+        return wrapper
+    return decorator
+
+
+def timed_iter(iterable: Iterable, name: str) -> Iterator:
+    """
+    Time how long each item of a (lazy) iterable takes to produce, e.g. the
+    windows coming out of a segmentation generator
+    """
+    if not _enabled:
+        return iter(iterable)
+    return _timed_iter(iter(iterable), name)
+
+
+def _timed_iter(iterator: Iterator, name: str) -> Iterator:
+    while True:
+        started = time.perf_counter()
+        try:
+            item = next(iterator)
+        except StopIteration:
+            record(name, time.perf_counter() - started, count=0)
+            return
+        record(name, time.perf_counter() - started)
+        yield item
+
+
+def stage_stats() -> Dict[str, Dict[str, float]]:
+    with _lock:
+        return {name: dict(stats) for name, stats in _stages.items()}
+
+
+def format_stage_report() -> str:
+    """Table of per-stage call counts and durations"""
+    lines = ["\nSTAGE TIMINGS", "=" * 60,
+             f"{'stage':<16}{'count':>8}{'total s':>12}{'mean ms':>12}{'max ms':>12}"]
+    stages = stage_stats()
+    for name, stats in sorted(stages.items(), key=lambda item: -item[1]["total"]):
+        mean = stats["total"] / stats["count"] if stats["count"] else 0.0
+        lines.append(f"{name:<16}{stats['count']:>8}{stats['total']:>12.4f}"
+                     f"{mean * 1000:>12.3f}{stats['max'] * 1000:>12.3f}")
+    if not stages:
+        lines.append("(no stages recorded)")
+    return "\n".join(lines) + "\n"
+
+
+@contextlib.contextmanager
+def session(profile: bool = False, report_path: str = DEFAULT_REPORT, timings: bool = False):
+    """
+    Wrap a whole run. timings=True records stage durations and prints them
+    at the end; profile=True also captures a cProfile and tracemalloc
+    snapshot and writes everything to report_path.
+    """
+    if not (profile or timings):
+        yield
+        return
+
+    enable()
+    reset()
+    profiler = None
+    if profile:
+        # Imported here: pstats alone costs more startup than the rest of this module
+        import cProfile
+        import tracemalloc
+        tracemalloc.start()
+        profiler = cProfile.Profile()
+        profiler.enable()
+    try:
+        yield
+    finally:
+        if profiler is not None:
+            profiler.disable()
+            snapshot = tracemalloc.take_snapshot()
+            current, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+        disable()
+
+        report = format_stage_report()
+        print(report)
+        if profiler is not None:
+            write_profile_report(report_path, report, profiler, snapshot, peak)
+            print(f"Profile report written to {report_path}")
+
+
+def write_profile_report(path: str, stage_report: str, profiler: "cProfile.Profile",
+                         snapshot: "tracemalloc.Snapshot", peak_bytes: int, top: int = 30):
+    """Stage table, hottest functions and biggest allocation sites in one file"""
+    import pstats
+
+    stats_text = io.StringIO()
+    pstats.Stats(profiler, stream=stats_text).sort_stats("cumulative").print_stats(top)
+
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(stage_report)
+        f.write("\nCPU PROFILE (top functions by cumulative time)\n" + "=" * 60 + "\n")
+        f.write(stats_text.getvalue())
+        f.write("\nMEMORY (tracemalloc)\n" + "=" * 60 + "\n")
+        f.write(f"Peak traced memory: {peak_bytes / 1024 / 1024:.2f} MB\n\n")
+        for stat in snapshot.statistics("lineno")[:top]:
+            f.write(f"{stat}\n")
+
+
+def add_profiling_arguments(parser):
+    """Register --timings / --profile on a script's argument parser"""
+    parser.add_argument('--timings', action='store_true',
+                        help='print per-stage durations and counts at the end of the run')
+    parser.add_argument('--profile', action='store_true',
+                        help='also capture cProfile and tracemalloc data and write a report')
+    parser.add_argument('--profile-output', default=DEFAULT_REPORT,
+                        help=f'where --profile writes its report (default: {DEFAULT_REPORT})')
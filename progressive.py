@@ -0,0 +1,203 @@
+import os
+import threading
+from typing import TYPE_CHECKING, Callable, Optional, Tuple
+
+from video_cache import VideoCache
+
+if TYPE_CHECKING:
+    from range_download import RangeDownloader
+
+PROGRESSIVE_CHUNK_SIZE = 1024 * 1024  # small ranges so the playable prefix grows steadily
+PROGRESSIVE_WORKERS = 4
+START_BUFFER_BYTES = 4 * 1024 * 1024  # start playback once this much is on disk
+BUFFER_AHEAD_MS = 10_000  # pause when playback gets this close to the downloaded edge
+STATUS_POLL = 0.25  # seconds
+
+
+class ProgressiveDownload:
+    """
+    Runs a cached video download on a background thread and reports how
+    much of the file, counted from its start, is already on disk, so a
+    player can open the file before the download has finished.
+    resolve() returns the (url, size) of the stream to fetch. The partial
+    file the player opened is never renamed; the cache gets a link or copy
+    of it, and release() removes it once the player has closed it.
+    """
+    def __init__(self,
+                 cache: VideoCache,
+                 youtube_id: str,
+                 resolve: Callable[[], Tuple[str, Optional[int]]],
+                 chunk_size: int = PROGRESSIVE_CHUNK_SIZE,
+                 max_workers: int = PROGRESSIVE_WORKERS):
+        self.cache = cache
+        self.youtube_id = youtube_id
+        self.resolve = resolve
+        self.chunk_size = chunk_size
+        self.max_workers = max_workers
+        self.downloader: Optional["RangeDownloader"] = None
+        self.path: Optional[str] = None
+        self.error: Optional[Exception] = None
+        self.finished = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._lock = threading.Lock()
+        self._released = False
+
+    def start(self) -> "ProgressiveDownload":
+        self._thread.start()
+        return self
+
+    def _run(self):
+        try:
+            path = self.cache.get(self.youtube_id, self._fetch)
+            with self._lock:
+                self.path = path
+                self._remove_partial()
+        except Exception as e:
+            self.error = e
+        finally:
+            self.finished.set()
+
+    def _fetch(self, staging_path: str):
+        # urllib.request and http.client load only once a download actually starts
+        from range_download import RangeDownloader
+        url, size = self.resolve()
+        self.downloader = RangeDownloader(url, staging_path, size=size, chunk_size=self.chunk_size,
+                                          max_workers=self.max_workers, keep_part=True)
+        self.downloader.download()
+
+    def _remove_partial(self):
+        """Delete the partial file once it is published and the player let go of it (under _lock)"""
+        if self._released and self.path is not None and self.downloader is not None:
+            try:
+                os.remove(self.downloader.part_path)
+            except OSError:
+                pass
+
+    def release(self):
+        """The player closed playback_path; clean up now, or when the download is published"""
+        with self._lock:
+            self._released = True
+            self._remove_partial()
+
+    def is_complete(self) -> bool:
+        return self.finished.is_set() and self.error is None
+
+    @property
+    def playback_path(self) -> Optional[str]:
+        """The finished file, or the partial file still being written"""
+        if self.path is not None:
+            return self.path
+        return self.downloader.part_path if self.downloader is not None else None
+
+    def buffered_bytes(self) -> int:
+        if self.downloader is None:
+            return 0
+        return self.downloader.contiguous
+
+    def buffered_fraction(self) -> float:
+        if self.is_complete():
+            return 1.0
+        if self.downloader is None or not self.downloader.size:
+            return 0.0
+        return self.downloader.contiguous / self.downloader.size
+
+    def wait_until_playable(self, min_bytes: int = START_BUFFER_BYTES,
+                            report: Optional[Callable[["ProgressiveDownload"], None]] = None):
+        """Block until min_bytes (or the whole file) can be read; raises if the download failed"""
+        while not self.finished.wait(STATUS_POLL):
+            downloader = self.downloader
+            if downloader is not None and downloader.size and \
+                    downloader.contiguous >= min(min_bytes, downloader.size):
+                return
+            if report is not None:
+                report(self)
+        if self.error is not None:
+            raise self.error
+
+
+class BufferGuard:
+    """
+    Keeps a VLC player from running past the downloaded part of its file:
+    pauses it when playback gets within ahead_ms of the downloaded edge and
+    resumes once twice that much is buffered. Assumes bytes are spread
+    evenly over the video's duration, which holds well enough for the
+    constant-bitrate progressive streams we download. While it holds,
+    play() and pause() only record what the user wants once it releases.
+    """
+    def __init__(self, player, download: ProgressiveDownload, ahead_ms: int = BUFFER_AHEAD_MS):
+        self.player = player
+        self.download = download
+        self.ahead_ms = ahead_ms
+        self.holding = False
+        self.resume_on_release = False
+        # check() may run on a watcher thread while the user presses play/pause
+        self._lock = threading.Lock()
+
+    @property
+    def wants_play(self) -> bool:
+        """Paused by the guard, but playing as far as the user is concerned"""
+        return self.holding and self.resume_on_release
+
+    def play(self) -> bool:
+        """User pressed play; returns False if playback waits for the buffer instead"""
+        with self._lock:
+            if self.holding:
+                self.resume_on_release = True
+                return False
+            self.player.play()
+            return True
+
+    def pause(self):
+        """User pressed pause; a hold in progress then ends paused"""
+        with self._lock:
+            if self.holding:
+                self.resume_on_release = False
+            else:
+                self.player.set_pause(1)
+
+    def clamp_seek(self, target_ms: int) -> int:
+        """
+        A seek target no further than the downloaded edge allows: the .part
+        file already has its full size, so past the edge VLC would play zeros
+        """
+        with self._lock:
+            length = self.player.get_length()
+            if self.download.is_complete() or length <= 0:
+                return target_ms
+            edge = int(self.download.buffered_fraction() * length) - self.ahead_ms
+            # Never turn a forward seek into a backward one
+            return max(0, min(target_ms, max(edge, self.player.get_time())))
+
+    def _release(self):
+        if self.holding:
+            if self.resume_on_release:
+                self.player.set_pause(0)
+            self.holding = False
+
+    def check(self) -> str:
+        """Pause or resume as needed and return a short status for display"""
+        with self._lock:
+            if self.download.is_complete():
+                self._release()
+                return "Fully downloaded"
+            if self.download.error is not None:
+                self._release()
+                return f"Download failed: {self.download.error}"
+
+            buffered = self.download.buffered_fraction()
+            length = self.player.get_length()
+            if length > 0:
+                position = max(self.player.get_time(), 0)
+                if not self.holding and self.player.is_playing() and \
+                        buffered < (position + self.ahead_ms) / length:
+                    self.player.set_pause(1)
+                    self.holding = self.resume_on_release = True
+                elif self.holding and buffered >= min(1.0, (position + 2 * self.ahead_ms) / length):
+                    self._release()
+            return f"{'Buffering' if self.holding else 'Downloaded'} {buffered:.0%}"
+
+
+def print_buffering(download: ProgressiveDownload):
+    total = download.downloader.size if download.downloader is not None else None
+    if total:
+        print(f"\r  Buffering... {download.buffered_bytes() * 100 // total}%", end="", flush=True)
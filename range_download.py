@@ -0,0 +1,257 @@
+import hashlib
+import json
+import os
+import random
+import shutil
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Optional, Tuple
+from urllib.error import HTTPError, URLError
+from urllib.request import Request, urlopen
+
+from transcript_cache import atomic_write
+
+DEFAULT_CHUNK_SIZE = 4 * 1024 * 1024  # 4 MB per range request
+DEFAULT_WORKERS = 4
+DEFAULT_RETRIES = 3
+DEFAULT_TIMEOUT = 30.0  # seconds per request
+DEFAULT_BACKOFF_BASE = 0.5
+DEFAULT_BACKOFF_MAX = 10.0
+READ_BLOCK = 256 * 1024
+
+PART_SUFFIX = ".part"
+JOURNAL_SUFFIX = ".part.json"
+
+
+class DownloadError(Exception):
+    """The file could not be downloaded or did not verify"""
+
+
+def probe(url: str, timeout: float = DEFAULT_TIMEOUT) -> Tuple[Optional[int], bool]:
+    """(size in bytes or None, whether the server honours Range requests)"""
+    request = Request(url, headers={"Range": "bytes=0-0"})
+    with urlopen(request, timeout=timeout) as response:
+        if response.status == 206:
+            content_range = response.headers.get("Content-Range", "")
+            total = content_range.rpartition("/")[2]
+            return (int(total) if total.isdigit() else None), True
+        length = response.headers.get("Content-Length")
+        return (int(length) if length and length.isdigit() else None), False
+
+
+def publish_copy(source: str, path: str):
+    """
+    Make path hold source's bytes while source stays where it is, e.g.
+    because a player has it open: a hard link where the OS allows renaming
+    it later, otherwise a copy. On Windows renaming any link to a file that
+    is open elsewhere fails, so there it is always a copy.
+    """
+    if os.path.exists(path):
+        os.remove(path)
+    if os.name != "nt":
+        try:
+            os.link(source, path)
+            return
+        except OSError:
+            pass
+    tmp_path = path + ".copy"
+    shutil.copyfile(source, tmp_path)
+    os.replace(tmp_path, path)
+
+
+def file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class RangeDownloader:
+    """
+    Downloads url to path in fixed-size byte ranges fetched in parallel.
+    Ranges are written into path + ".part"; a journal next to it records
+    which ranges are on disk, so an interrupted download resumes with the
+    missing ranges only. The file appears at path only after its size
+    (and sha256, when known) has been verified. With keep_part the .part
+    file is left in place and path gets a link or copy of it, so a player
+    reading the partial file is never renamed out from under.
+    """
+    def __init__(self,
+                 url: str,
+                 path: str,
+                 size: Optional[int] = None,
+                 sha256: Optional[str] = None,
+                 chunk_size: int = DEFAULT_CHUNK_SIZE,
+                 max_workers: int = DEFAULT_WORKERS,
+                 retries: int = DEFAULT_RETRIES,
+                 timeout: float = DEFAULT_TIMEOUT,
+                 backoff_base: float = DEFAULT_BACKOFF_BASE,
+                 backoff_max: float = DEFAULT_BACKOFF_MAX,
+                 progress: Optional[Callable[[int, int], None]] = None,
+                 keep_part: bool = False):
+        self.url = url
+        self.path = path
+        self.size = size
+        self.sha256 = sha256
+        self.chunk_size = chunk_size
+        self.max_workers = max_workers
+        self.retries = retries
+        self.timeout = timeout
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.progress = progress
+        self.keep_part = keep_part
+        self.part_path = path + PART_SUFFIX
+        self.journal_path = path + JOURNAL_SUFFIX
+        self.bytes_fetched = 0
+        self.resumed_bytes = 0
+        # Bytes on disk with no gap from the start of the file; ranges are
+        # handed out in order, so this is what a progressive player can read
+        self.contiguous = 0
+        self._done: set = set()
+        self._lock = threading.Lock()
+
+    def backoff_delay(self, attempt: int) -> float:
+        """Full-jitter exponential backoff, as in the transcript fetcher"""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    def chunks(self) -> List[Tuple[int, int]]:
+        """Inclusive (first, last) byte offsets of every range"""
+        return [(start, min(start + self.chunk_size, self.size) - 1)
+                for start in range(0, self.size, self.chunk_size)]
+
+    def _load_journal(self) -> set:
+        """Chunk indices already on disk from an earlier attempt at this same file"""
+        try:
+            with open(self.journal_path, "r", encoding="utf-8") as f:
+                journal = json.load(f)
+        except (OSError, ValueError):
+            return set()
+        same_file = (journal.get("size") == self.size and
+                     journal.get("chunk_size") == self.chunk_size and
+                     journal.get("sha256") == self.sha256 and
+                     os.path.exists(self.part_path) and
+                     os.path.getsize(self.part_path) == self.size)
+        return set(journal.get("done", [])) if same_file else set()
+
+    def _save_journal(self):
+        journal = {
+            "size": self.size,
+            "chunk_size": self.chunk_size,
+            "sha256": self.sha256,
+            "done": sorted(self._done)
+        }
+        atomic_write(self.journal_path, json.dumps(journal).encode("utf-8"))
+
+    def _fetch_chunk(self, index: int, first: int, last: int):
+        for attempt in range(self.retries + 1):
+            try:
+                request = Request(self.url, headers={"Range": f"bytes={first}-{last}"})
+                with urlopen(request, timeout=self.timeout) as response:
+                    expected = f"bytes {first}-{last}/"
+                    if response.status != 206 or not response.headers.get("Content-Range", "").startswith(expected):
+                        raise DownloadError(f"server ignored range {first}-{last}")
+                    with open(self.part_path, "r+b") as f:
+                        f.seek(first)
+                        received = 0
+                        while True:
+                            block = response.read(READ_BLOCK)
+                            if not block:
+                                break
+                            f.write(block)
+                            received += len(block)
+                        if received != last - first + 1:
+                            raise DownloadError(f"range {first}-{last} ended after {received} bytes")
+                        f.flush()
+                        # The journal must never claim bytes that could still be lost
+                        os.fsync(f.fileno())
+                with self._lock:
+                    self.bytes_fetched += received
+                    self._done.add(index)
+                    self._save_journal()
+                    self._advance_contiguous()
+                    if self.progress is not None:
+                        self.progress(min(len(self._done) * self.chunk_size, self.size), self.size)
+                return
+            except (HTTPError, URLError, OSError, DownloadError) as e:
+                if isinstance(e, HTTPError) and 400 <= e.code < 500 and e.code != 429:
+                    raise DownloadError(f"range {first}-{last}: HTTP {e.code}") from e
+                if attempt == self.retries:
+                    raise DownloadError(f"range {first}-{last} failed: {e}") from e
+                time.sleep(self.backoff_delay(attempt))
+
+    def _advance_contiguous(self):
+        index = self.contiguous // self.chunk_size
+        while index in self._done:
+            index += 1
+        self.contiguous = min(index * self.chunk_size, self.size)
+
+    def _download_whole(self):
+        """Single sequential request, for servers without Range support"""
+        with urlopen(self.url, timeout=self.timeout) as response, open(self.part_path, "wb") as f:
+            for block in iter(lambda: response.read(READ_BLOCK), b""):
+                f.write(block)
+                self.bytes_fetched += len(block)
+                self.contiguous = self.bytes_fetched
+            f.flush()
+            os.fsync(f.fileno())
+
+    def verify(self):
+        actual = os.path.getsize(self.part_path)
+        if self.size is not None and actual != self.size:
+            raise DownloadError(f"expected {self.size} bytes, got {actual}")
+        if self.sha256 is not None and file_sha256(self.part_path) != self.sha256:
+            raise DownloadError("sha256 mismatch")
+
+    def download(self) -> str:
+        """Fetch whatever is missing, verify, publish and return path"""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        size, ranged = probe(self.url, self.timeout)
+        if self.size is None:
+            self.size = size
+        elif size is not None and size != self.size:
+            raise DownloadError(f"server reports {size} bytes, expected {self.size}")
+
+        if not ranged or not self.size:
+            self._download_whole()
+        else:
+            self._done = self._load_journal()
+            if not self._done:
+                # Fresh start: size the part file up front so ranges can land anywhere
+                with open(self.part_path, "wb") as f:
+                    f.truncate(self.size)
+                self._save_journal()
+            chunks = self.chunks()
+            self.resumed_bytes = sum(last - first + 1 for i, (first, last) in enumerate(chunks)
+                                     if i in self._done)
+            self._advance_contiguous()
+            missing = [(i, first, last) for i, (first, last) in enumerate(chunks) if i not in self._done]
+            with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+                # list() re-raises the first failure; finished ranges stay journaled
+                list(pool.map(lambda chunk: self._fetch_chunk(*chunk), missing))
+
+        try:
+            self.verify()
+        except DownloadError:
+            # A bad file should not be resumed into; start over next time
+            for leftover in (self.part_path, self.journal_path):
+                if os.path.exists(leftover):
+                    os.remove(leftover)
+            raise
+        if self.keep_part:
+            publish_copy(self.part_path, self.path)
+        else:
+            os.replace(self.part_path, self.path)
+        if os.path.exists(self.journal_path):
+            os.remove(self.journal_path)
+        return self.path
+
+
+def download_file(url: str, path: str, **options) -> str:
+    """Resumable parallel download of url to path; see RangeDownloader"""
+    return RangeDownloader(url, path, **options).download()
+
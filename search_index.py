@@ -0,0 +1,247 @@
+import heapq
+import math
+import re
+import sqlite3
+import sys
+from typing import Dict, Iterable, List, Optional, Tuple
+
+DEFAULT_INDEX_PATH = "search_index.db"
+
+# BM25 tuning constants (the usual defaults)
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+TOKEN_RE = re.compile(r"[a-z0-9]+(?:'[a-z]+)?")
+PHRASE_RE = re.compile(r'"([^"]+)"')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS segments (
+    id INTEGER PRIMARY KEY,
+    youtube_id TEXT NOT NULL,
+    start_time REAL NOT NULL,
+    end_time REAL NOT NULL,
+    length INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS segments_by_video ON segments (youtube_id);
+CREATE TABLE IF NOT EXISTS postings (
+    term TEXT NOT NULL,
+    segment_id INTEGER NOT NULL,
+    length INTEGER NOT NULL,
+    positions TEXT NOT NULL,
+    PRIMARY KEY (term, segment_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS postings_by_segment ON postings (segment_id);
+CREATE TABLE IF NOT EXISTS stats (
+    key TEXT PRIMARY KEY,
+    value REAL NOT NULL
+);
+"""
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens; positions in this list are what phrases match on"""
+    return TOKEN_RE.findall(text.lower())
+
+
+def parse_query(query: str) -> Tuple[List[str], List[List[str]]]:
+    """Split a query into loose terms and "quoted phrases" (as token lists)"""
+    phrases = [tokenize(p) for p in PHRASE_RE.findall(query)]
+    phrases = [p for p in phrases if p]
+    loose = tokenize(PHRASE_RE.sub(" ", query))
+    return loose, phrases
+
+
+class SegmentIndex:
+    """
+    Persistent inverted index from terms to transcript segments.
+    Stored in SQLite: one posting row per (term, segment) holding the term's
+    positions and the segment length, so a query touches only the rows of
+    its own terms. Re-indexing a video replaces just that video's rows.
+    """
+    def __init__(self, path: str = DEFAULT_INDEX_PATH):
+        self.path = path
+        self.db = sqlite3.connect(path)
+        self.db.executescript(SCHEMA)
+
+    def close(self):
+        self.db.close()
+
+    def _stat(self, key: str) -> float:
+        row = self.db.execute("SELECT value FROM stats WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else 0.0
+
+    def _add_stat(self, key: str, delta: float):
+        self.db.execute(
+            "INSERT INTO stats (key, value) VALUES (?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET value = value + excluded.value",
+            (key, delta)
+        )
+
+    def _remove_video(self, youtube_id: str):
+        rows = self.db.execute(
+            "SELECT id, length FROM segments WHERE youtube_id = ?", (youtube_id,)
+        ).fetchall()
+        if not rows:
+            return
+        self.db.executemany("DELETE FROM postings WHERE segment_id = ?", [(row[0],) for row in rows])
+        self.db.execute("DELETE FROM segments WHERE youtube_id = ?", (youtube_id,))
+        self._add_stat("segments", -len(rows))
+        self._add_stat("tokens", -sum(row[1] for row in rows))
+
+    def remove_video(self, youtube_id: str):
+        with self.db:
+            self._remove_video(youtube_id)
+
+    def index_video(self, youtube_id: str, segments: Iterable[Tuple[float, float, str]]):
+        """Replace everything indexed for youtube_id with these (start, end, text) segments"""
+        with self.db:
+            self._remove_video(youtube_id)
+            count = 0
+            tokens_total = 0
+            for start_time, end_time, text in segments:
+                tokens = tokenize(text)
+                cursor = self.db.execute(
+                    "INSERT INTO segments (youtube_id, start_time, end_time, length) VALUES (?, ?, ?, ?)",
+                    (youtube_id, start_time, end_time, len(tokens))
+                )
+                segment_id = cursor.lastrowid
+                positions: Dict[str, List[int]] = {}
+                for position, token in enumerate(tokens):
+                    positions.setdefault(token, []).append(position)
+                self.db.executemany(
+                    "INSERT INTO postings (term, segment_id, length, positions) VALUES (?, ?, ?, ?)",
+                    [(term, segment_id, len(tokens), ",".join(map(str, where)))
+                     for term, where in positions.items()]
+                )
+                count += 1
+                tokens_total += len(tokens)
+            self._add_stat("segments", count)
+            self._add_stat("tokens", tokens_total)
+
+    def segments(self, youtube_id: str) -> List[Tuple[float, float]]:
+        """(start_time, end_time) of every indexed segment of a video, in order"""
+        return self.db.execute(
+            "SELECT start_time, end_time FROM segments WHERE youtube_id = ? ORDER BY start_time",
+            (youtube_id,)
+        ).fetchall()
+
+    def _postings(self, term: str) -> Dict[int, Tuple[int, str]]:
+        """segment_id -> (segment length, positions) for one term"""
+        return {
+            segment_id: (length, positions)
+            for segment_id, length, positions in self.db.execute(
+                "SELECT segment_id, length, positions FROM postings WHERE term = ?", (term,)
+            )
+        }
+
+    @staticmethod
+    def _has_phrase(position_lists: List[str]) -> bool:
+        first, *rest = [set(map(int, positions.split(","))) for positions in position_lists]
+        return any(all(start + offset + 1 in later for offset, later in enumerate(rest)) for start in first)
+
+    def search(self, query: str, limit: int = 10) -> List[Dict]:
+        """
+        Ranked segment search. Loose terms are scored with BM25 (a segment
+        needs at least one); every "quoted phrase" must appear verbatim.
+        """
+        loose, phrases = parse_query(query)
+        terms = list(dict.fromkeys(loose + [t for phrase in phrases for t in phrase]))
+        if not terms:
+            return []
+
+        postings = {term: self._postings(term) for term in terms}
+        if phrases:
+            candidates = None
+            for phrase in phrases:
+                matching = set.intersection(*(set(postings[t]) for t in phrase))
+                matching = {
+                    segment_id for segment_id in matching
+                    if self._has_phrase([postings[t][segment_id][1] for t in phrase])
+                }
+                candidates = matching if candidates is None else candidates & matching
+        else:
+            candidates = set().union(*(set(p) for p in postings.values()))
+        if not candidates:
+            return []
+
+        total_segments = self._stat("segments") or 1
+        average_length = (self._stat("tokens") / total_segments) or 1
+        scores: Dict[int, float] = dict.fromkeys(candidates, 0.0)
+        for term, term_postings in postings.items():
+            df = len(term_postings)
+            idf = math.log(1 + (total_segments - df + 0.5) / (df + 0.5))
+            for segment_id in candidates.intersection(term_postings):
+                length, positions = term_postings[segment_id]
+                tf = positions.count(",") + 1
+                norm = BM25_K1 * (1 - BM25_B + BM25_B * length / average_length)
+                scores[segment_id] += idf * tf * (BM25_K1 + 1) / (tf + norm)
+
+        best = heapq.nlargest(limit, scores.items(), key=lambda item: item[1])
+        results = []
+        for segment_id, score in best:
+            youtube_id, start_time, end_time = self.db.execute(
+                "SELECT youtube_id, start_time, end_time FROM segments WHERE id = ?", (segment_id,)
+            ).fetchone()
+            results.append({
+                'youtube_id': youtube_id,
+                'start_time': start_time,
+                'end_time': end_time,
+                'score': score
+            })
+        return results
+
+    def stats(self) -> Dict:
+        return {
+            'segments': int(self._stat("segments")),
+            'tokens': int(self._stat("tokens")),
+            'videos': self.db.execute("SELECT COUNT(DISTINCT youtube_id) FROM segments").fetchone()[0]
+        }
+
+
+_default_index: Optional[SegmentIndex] = None
+
+
+def get_default_index() -> SegmentIndex:
+    global _default_index
+    if _default_index is None:
+        _default_index = SegmentIndex()
+    return _default_index
+
+
+def set_default_index(index: SegmentIndex):
+    """Swap the shared index, e.g. for an in-memory one in benchmarks"""
+    global _default_index
+    _default_index = index
+
+
+def index_segments(youtube_id: str, segments: Iterable[Tuple[float, float, str]]):
+    """Refresh a video in the shared index; never lets indexing break an analysis"""
+    try:
+        get_default_index().index_video(youtube_id, segments)
+    except Exception as e:
+        print(f"Warning: could not update search index: {e}")
+
+
+def format_seconds(seconds: float) -> str:
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours:02d}:{minutes:02d}:{seconds:02d}"
+
+
+def main():
+    if len(sys.argv) < 2:
+        print('Usage: python search_index.py <query> [limit]   e.g. "adding fractions" denominator')
+        return
+    query = sys.argv[1]
+    limit = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    results = get_default_index().search(query, limit)
+    if not results:
+        print("No matching segments")
+    for rank, hit in enumerate(results, 1):
+        print(f"{rank:>3}. {hit['youtube_id']}  "
+              f"{format_seconds(hit['start_time'])} - {format_seconds(hit['end_time'])}  "
+              f"(score {hit['score']:.2f})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+import struct
+from multiprocessing import shared_memory
+from typing import Dict, List, Mapping
+
+from columnar_transcript import ColumnarTranscript, as_columnar
+
+# Block layout; columns are in native byte order since the block never
+# leaves this machine, and every section starts 8-byte aligned:
+#   header   magic, version, transcript count, size of the id list
+#   ids      youtube ids, UTF-8, newline separated
+#   index    per transcript: region offset, caption count, text bytes
+#   regions  per transcript: starts (n doubles), durations (n doubles),
+#            caption offsets (n + 1 int64), caption text (UTF-8)
+MAGIC = b"CTSM"
+VERSION = 1
+_HEADER = struct.Struct("=4sIqq")
+_ENTRY = struct.Struct("=qqq")
+
+
+def _aligned(size: int) -> int:
+    return (size + 7) & ~7
+
+
+class SharedTranscripts:
+    """
+    Transcripts packed once into one shared memory block in their columnar
+    layout, so worker processes attach by name and read them in place
+    instead of each task carrying a pickled copy. get() returns a
+    ColumnarTranscript whose numeric columns are views into the block;
+    only the caption text is decoded, once per call.
+
+    The process that created the block unlinks it on close(). Transcripts
+    from get() must be dropped before close().
+    """
+    def __init__(self, shm: shared_memory.SharedMemory, owner: bool = False):
+        self.shm = shm
+        self.owner = owner
+        magic, version, count, ids_size = _HEADER.unpack_from(shm.buf, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{shm.name} does not hold shared transcripts (version {VERSION})")
+        ids = str(shm.buf[_HEADER.size:_HEADER.size + ids_size], "utf-8").split("\n") if count else []
+        self._positions: Dict[str, int] = {youtube_id: i for i, youtube_id in enumerate(ids)}
+        self._index_at = _aligned(_HEADER.size + ids_size)
+
+    @classmethod
+    def create(cls, transcripts: Mapping[str, object]) -> 'SharedTranscripts':
+        """Pack {youtube_id: transcript} (either shape) into a new block"""
+        columnar = {youtube_id: as_columnar(transcript) for youtube_id, transcript in transcripts.items()}
+        if any("\n" in youtube_id for youtube_id in columnar):
+            raise ValueError("youtube ids cannot contain newlines")
+        ids = "\n".join(columnar).encode("utf-8")
+        texts = [transcript.buffer.encode("utf-8") for transcript in columnar.values()]
+
+        index_at = _aligned(_HEADER.size + len(ids))
+        regions: List[int] = []
+        size = index_at + _ENTRY.size * len(columnar)
+        for transcript, text in zip(columnar.values(), texts):
+            size = _aligned(size)
+            regions.append(size)
+            size += 8 * (3 * len(transcript) + 1) + len(text)
+
+        shm = shared_memory.SharedMemory(create=True, size=max(size, 1))
+        try:
+            buf = shm.buf
+            _HEADER.pack_into(buf, 0, MAGIC, VERSION, len(columnar), len(ids))
+            buf[_HEADER.size:_HEADER.size + len(ids)] = ids
+            for i, (transcript, text, region) in enumerate(zip(columnar.values(), texts, regions)):
+                n = len(transcript)
+                _ENTRY.pack_into(buf, index_at + i * _ENTRY.size, region, n, len(text))
+                position = region
+                for column in (transcript.starts, transcript.durations, transcript.offsets):
+                    data = column.tobytes()
+                    buf[position:position + len(data)] = data
+                    position += len(data)
+                buf[position:position + len(text)] = text
+            return cls(shm, owner=True)
+        except BaseException:
+            shm.close()
+            shm.unlink()
+            raise
+
+    @classmethod
+    def attach(cls, name: str) -> 'SharedTranscripts':
+        return cls(shared_memory.SharedMemory(name=name))
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    @property
+    def size(self) -> int:
+        return self.shm.size
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    def __contains__(self, youtube_id: str) -> bool:
+        return youtube_id in self._positions
+
+    def get(self, youtube_id: str) -> ColumnarTranscript:
+        region, n, text_size = _ENTRY.unpack_from(self.shm.buf,
+                                                  self._index_at + _ENTRY.size * self._positions[youtube_id])
+        buf = self.shm.buf
+        starts_at, durations_at, offsets_at = region, region + 8 * n, region + 16 * n
+        text_at = offsets_at + 8 * (n + 1)
+        return ColumnarTranscript(
+            buf[starts_at:durations_at].cast("d"),
+            buf[durations_at:offsets_at].cast("d"),
+            buf[offsets_at:text_at].cast("q"),
+            str(buf[text_at:text_at + text_size], "utf-8")
+        )
+
+    def close(self):
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
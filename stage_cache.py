@@ -0,0 +1,129 @@
+import contextlib
+import hashlib
+import io
+import json
+import os
+from typing import Callable, Dict, List, Optional, Tuple
+
+from transcript_cache import atomic_write, get_default_cache, get_transcript
+
+# Bump whenever windowing, tagging or rendering changes what they produce,
+# so results stored by an older analyzer are never reused
+ANALYZER_VERSION = 5
+DEFAULT_STAGE_DIR = ".stage_cache"
+
+STAGES = ("window", "tag", "render")
+
+
+def digest(value) -> str:
+    """Stable content hash of any JSON-serializable value"""
+    data = json.dumps(value, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+
+def capture_output(render: Callable, *args) -> str:
+    """Run a print-based display function and return what it printed"""
+    buffer = io.StringIO()
+    with contextlib.redirect_stdout(buffer):
+        render(*args)
+    return buffer.getvalue()
+
+
+class StageCache:
+    """
+    Persists the output of each analysis stage (window -> tag -> render)
+    under a key derived from that stage's inputs and ANALYZER_VERSION.
+    Because every key folds in the key of the stage before it, changing a
+    config value only invalidates the stages downstream of it.
+    """
+    def __init__(self, cache_dir: str = DEFAULT_STAGE_DIR):
+        self.cache_dir = cache_dir
+        self.hits = {stage: 0 for stage in STAGES}
+        self.misses = {stage: 0 for stage in STAGES}
+
+    def key(self, stage: str, inputs) -> str:
+        return digest([stage, ANALYZER_VERSION, inputs])
+
+    def _path(self, stage: str, key: str) -> str:
+        return os.path.join(self.cache_dir, stage, f"{key}.json")
+
+    def load(self, stage: str, key: str) -> Tuple[bool, object]:
+        try:
+            with open(self._path(stage, key), "r", encoding="utf-8") as f:
+                return True, json.load(f)
+        except (OSError, ValueError):
+            return False, None
+
+    def save(self, stage: str, key: str, value):
+        os.makedirs(os.path.join(self.cache_dir, stage), exist_ok=True)
+        atomic_write(self._path(stage, key), json.dumps(value).encode("utf-8"))
+
+    def run(self, stage: str, key: str, compute: Callable):
+        """Return a stage's stored output, computing and storing it on a miss"""
+        found, value = self.load(stage, key)
+        if found:
+            self.hits[stage] += 1
+            return value
+        self.misses[stage] += 1
+        # Round-trip through JSON so a fresh result looks exactly like a stored one
+        value = json.loads(json.dumps(compute()))
+        self.save(stage, key, value)
+        return value
+
+    def stats(self) -> Dict:
+        return {stage: {"hits": self.hits[stage], "misses": self.misses[stage]} for stage in STAGES}
+
+
+_default_stage_cache: Optional[StageCache] = None
+
+
+def get_default_stage_cache() -> StageCache:
+    global _default_stage_cache
+    if _default_stage_cache is None:
+        _default_stage_cache = StageCache()
+    return _default_stage_cache
+
+
+def run_staged_analysis(youtube_id: str,
+                        subject: str,
+                        namespace: str,
+                        window_fn: Callable[..., List],
+                        window_config: Dict,
+                        tag_fn: Callable[[List, str], List],
+                        render_fn: Callable[[List, List], str],
+                        cache: Optional[StageCache] = None) -> str:
+    """
+    Run fetch -> window -> tag -> render, reusing every stored stage whose
+    inputs are unchanged. namespace separates scripts whose stages differ.
+      window_fn(transcript, **window_config) -> [[start, end, text], ...]
+      tag_fn(windows, subject) -> one tag dict per window
+      render_fn(windows, tags) -> the text to show
+    """
+    cache = cache or get_default_stage_cache()
+
+    # Fetch: the transcript cache already persists this stage, and its
+    # content hash lets us derive every downstream key without loading it
+    transcripts = get_default_cache()
+    transcript_key = transcripts.fingerprint(youtube_id)
+    transcript = None
+    if transcript_key is None:
+        transcript = get_transcript(youtube_id)
+        transcript_key = transcripts.fingerprint(youtube_id) or digest(transcript)
+
+    window_key = cache.key("window", [namespace, transcript_key, window_config])
+    tag_key = cache.key("tag", [namespace, window_key, subject])
+    render_key = cache.key("render", [namespace, window_key, tag_key])
+
+    # Unchanged inputs all the way down: nothing to load but the output
+    found, rendered = cache.load("render", render_key)
+    if found:
+        cache.hits["render"] += 1
+        return rendered
+
+    def compute_windows():
+        return window_fn(transcript if transcript is not None else get_transcript(youtube_id),
+                         **window_config)
+
+    windows = cache.run("window", window_key, compute_windows)
+    tags = cache.run("tag", tag_key, lambda: tag_fn(windows, subject))
+    return cache.run("render", render_key, lambda: render_fn(windows, tags))
@@ -0,0 +1,27 @@
+import threading
+import time
+
+from async_fetch import fetch_all
+
+
+def test_timed_out_threads_keep_their_slots():
+    running, peak, lock = [0], [0], threading.Lock()
+
+    def source(youtube_id, languages):
+        with lock:
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+        try:
+            time.sleep(0.3 if youtube_id.startswith("hang") else 0.01)
+            return [{"text": youtube_id, "start": 0.0, "duration": 1.0}]
+        finally:
+            with lock:
+                running[0] -= 1
+
+    ids = [f"hang{i}" for i in range(3)] + [f"ok{i}" for i in range(3)]
+    results = fetch_all(ids, source=source, max_concurrency=2, timeout=0.05,
+                        retries=1, backoff_base=0.01)
+
+    assert peak[0] == 2
+    assert all(isinstance(results[f"hang{i}"], TimeoutError) for i in range(3))
+    assert all(isinstance(results[f"ok{i}"], list) for i in range(3))
@@ -0,0 +1,23 @@
+from columnar_transcript import as_columnar
+from cognitive_scorer import CognitiveScorer, TranscriptFeatures, rank_abilities
+from synthetic import synthetic_transcript
+
+import main
+
+
+def test_index_windows_score_their_own_captions():
+    transcript = as_columnar(synthetic_transcript(3000, seed=1))
+    features = TranscriptFeatures(transcript)
+    windows = list(main.iter_windows(transcript, segmentation="loop"))
+    # Each window ends where its last caption ends, past the next window's first start
+    assert any(features.caption_range(*window[:2])[1] > window[4] for window in windows)
+    expected = [rank_abilities(features.features(window[3], window[4])) for window in windows]
+    assert CognitiveScorer().rank_windows(transcript, windows) == expected
+
+
+def test_time_windows_take_captions_starting_inside():
+    transcript = as_columnar([{"text": "look at the diagram", "start": 0.0, "duration": 2.0},
+                              {"text": "remember this", "start": 2.0, "duration": 2.0}])
+    scorer = CognitiveScorer()
+    assert scorer.rank_windows(transcript, [(0.0, 2.0, "")])[0][0] == "visual_processing"
+    assert scorer.rank_windows(transcript, [(2.0, 4.0, "")])[0][0] == "memory"
@@ -0,0 +1,84 @@
+import os
+from array import array
+
+import pytest
+
+from interaction_logger import ACTIONS
+from interaction_sink import FRAME_HEADER, InteractionSink, read_session, write_session
+
+
+def record_session(path, events, batch_size=16):
+    sink = InteractionSink(str(path), {"youtube_id": "vid"}, actions=ACTIONS, batch_size=batch_size)
+    for offset, position, code in events:
+        sink.record(offset, position, code)
+    sink.record_action(len(ACTIONS), "replay")
+    sink.record(99.5, 123_000, len(ACTIONS))
+    sink.close({"note": "done"})
+    return sink
+
+
+def test_round_trip(tmp_path):
+    events = [(i * 0.25, i * 1000, i % len(ACTIONS)) for i in range(100)]
+    sink = record_session(tmp_path / "a.log", events)
+    log = read_session(sink.path)
+    assert log.complete
+    assert log.metadata["youtube_id"] == "vid"
+    assert list(zip(log.offsets, log.positions, log.codes)) == events + [(99.5, 123_000, len(ACTIONS))]
+    assert log.action_name(len(ACTIONS)) == "replay"
+    assert log.end["events"] == 101 and log.end["dropped"] == 0
+    assert log.end["summary"] == {"note": "done"}
+
+
+def test_torn_tail_is_dropped(tmp_path):
+    events = [(i * 0.5, i * 500, 0) for i in range(40)]
+    path = str(tmp_path / "b.log")
+    write_session(path, {"youtube_id": "vid"}, ACTIONS,
+                  array("d", (e[0] for e in events)), array("q", (e[1] for e in events)),
+                  array("H", (e[2] for e in events)))
+    complete = read_session(path)
+    with open(path, "rb") as f:
+        data = f.read()
+    # Cut inside the END frame: everything before it still replays
+    with open(path, "wb") as f:
+        f.write(data[:-3])
+    torn = read_session(path)
+    assert not torn.complete
+    assert list(torn.codes) == list(complete.codes)
+
+
+def test_corrupt_frame_stops_replay(tmp_path):
+    path = str(tmp_path / "c.log")
+    write_session(path, {"youtube_id": "vid"}, ACTIONS,
+                  array("d", [1.0, 2.0]), array("q", [1000, 2000]), array("H", [0, 1]))
+    with open(path, "rb") as f:
+        data = bytearray(f.read())
+    # Flip one byte in the events payload, which follows the session frame
+    session_length = FRAME_HEADER.unpack_from(data, 0)[2]
+    data[FRAME_HEADER.size + session_length + FRAME_HEADER.size + 5] ^= 0xFF
+    with open(path, "wb") as f:
+        f.write(data)
+    log = read_session(path)
+    assert len(log) == 0
+    assert not log.complete
+    assert log.actions == list(ACTIONS)
+
+
+@pytest.mark.filterwarnings("ignore::pytest.PytestUnhandledThreadExceptionWarning")
+def test_close_after_writer_died(tmp_path):
+    sink = InteractionSink(str(tmp_path / "d.log"), queue_size=2, flush_interval=0.01)
+
+    def fail(data):
+        raise OSError("disk gone")
+
+    write = sink._write
+    sink._write = fail
+    sink.record(0.0, 0, 0)
+    sink._thread.join(5)
+    assert not sink._thread.is_alive()
+    for _ in range(5):
+        sink.record(0.0, 0, 0)
+    sink._write = write
+    sink.close()
+    log = read_session(sink.path)
+    assert log.complete and log.end["dropped"] == 5
+    assert os.path.exists(sink.path)
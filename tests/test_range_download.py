@@ -0,0 +1,91 @@
+import hashlib
+import os
+
+import pytest
+
+from range_download import DownloadError, RangeDownloader
+from stand_in_server import TranscriptHandler, start_server
+from synthetic import synthetic_video
+
+VIDEO_SIZE = 1024 * 1024
+CHUNK_SIZE = 64 * 1024
+
+
+class FlakyHandler(TranscriptHandler):
+    """Answers 503 for every range starting at or past fail_from"""
+    fail_from = None
+
+    def send_video(self, data):
+        requested = self.headers.get('Range', '')
+        if self.fail_from is not None and requested.startswith('bytes='):
+            first = int(requested[len('bytes='):].partition('-')[0] or 0)
+            if first >= self.fail_from:
+                self.send_error(503)
+                return
+        super().send_video(data)
+
+
+@pytest.fixture
+def server():
+    server = start_server(handler=FlakyHandler, video_size=VIDEO_SIZE)
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def video_url(server, youtube_id):
+    return f"http://127.0.0.1:{server.server_address[1]}/videos/{youtube_id}"
+
+
+def downloader(server, path, **options):
+    return RangeDownloader(video_url(server, "vid"), str(path), chunk_size=CHUNK_SIZE,
+                           retries=0, backoff_base=0.0, **options)
+
+
+def test_fresh_download(server, tmp_path):
+    path = tmp_path / "vid.mp4"
+    fetched = downloader(server, path)
+    assert fetched.download() == str(path)
+    assert path.read_bytes() == synthetic_video("vid", VIDEO_SIZE)
+    assert fetched.bytes_fetched == VIDEO_SIZE and fetched.resumed_bytes == 0
+    assert not os.path.exists(fetched.part_path) and not os.path.exists(fetched.journal_path)
+
+
+def test_interrupted_download_resumes_missing_ranges(server, tmp_path):
+    path = tmp_path / "vid.mp4"
+    server.RequestHandlerClass.fail_from = VIDEO_SIZE // 2
+    first = downloader(server, path)
+    with pytest.raises(DownloadError):
+        first.download()
+    assert not path.exists()
+    assert os.path.exists(first.journal_path)
+
+    server.RequestHandlerClass.fail_from = None
+    second = downloader(server, path)
+    second.download()
+    assert path.read_bytes() == synthetic_video("vid", VIDEO_SIZE)
+    assert second.resumed_bytes == VIDEO_SIZE // 2
+    assert second.bytes_fetched == VIDEO_SIZE - second.resumed_bytes
+
+
+def test_journal_for_other_chunking_is_ignored(server, tmp_path):
+    path = tmp_path / "vid.mp4"
+    server.RequestHandlerClass.fail_from = VIDEO_SIZE // 2
+    with pytest.raises(DownloadError):
+        downloader(server, path).download()
+
+    server.RequestHandlerClass.fail_from = None
+    restarted = RangeDownloader(video_url(server, "vid"), str(path), chunk_size=CHUNK_SIZE * 2, retries=0)
+    restarted.download()
+    assert restarted.resumed_bytes == 0
+    assert path.read_bytes() == synthetic_video("vid", VIDEO_SIZE)
+
+
+def test_checksum_mismatch_discards_partial_file(server, tmp_path):
+    path = tmp_path / "vid.mp4"
+    wrong = hashlib.sha256(b"something else").hexdigest()
+    fetched = downloader(server, path, sha256=wrong)
+    with pytest.raises(DownloadError):
+        fetched.download()
+    assert not path.exists()
+    assert not os.path.exists(fetched.part_path) and not os.path.exists(fetched.journal_path)
@@ -0,0 +1,30 @@
+import pytest
+
+from columnar_transcript import as_columnar
+from synthetic import synthetic_transcript
+from windowing import topic_shift_boundaries
+
+
+@pytest.mark.parametrize("seed", range(10))
+@pytest.mark.parametrize("bounds", [(30, 90), (90, 300), (5, 5)])
+def test_topic_boundaries_tile_transcript(seed, bounds):
+    transcript = as_columnar(synthetic_transcript(400, seed=seed))
+    boundaries = topic_shift_boundaries(transcript, *bounds)
+    assert boundaries[0][0] == 0
+    assert boundaries[-1][1] == len(transcript)
+    for (_, stop), (first, _) in zip(boundaries, boundaries[1:]):
+        assert stop == first
+    assert all(first < stop for first, stop in boundaries)
+
+
+def test_topic_boundaries_respect_max_duration():
+    transcript = as_columnar(synthetic_transcript(400, seed="bounds"))
+    starts = transcript.starts
+    for first, stop in topic_shift_boundaries(transcript, 30, 90)[:-1]:
+        assert starts[stop] - starts[first] <= 90
+
+
+def test_topic_boundaries_empty_and_invalid():
+    assert topic_shift_boundaries(as_columnar([]), 30, 90) == []
+    with pytest.raises(ValueError):
+        topic_shift_boundaries(as_columnar(synthetic_transcript(10)), 90, 30)
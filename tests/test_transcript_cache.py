@@ -0,0 +1,44 @@
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from transcript_cache import TranscriptCache
+
+
+def counting_source(calls, fail=False):
+    lock = threading.Lock()
+
+    def source(youtube_id, languages):
+        with lock:
+            calls[youtube_id] += 1
+        time.sleep(0.05)
+        if fail:
+            raise RuntimeError("offline")
+        return [{"text": youtube_id, "start": 0.0, "duration": 1.0}]
+
+    return source
+
+
+def test_concurrent_gets_share_one_fetch(tmp_path):
+    calls = Counter()
+    cache = TranscriptCache(str(tmp_path), source=counting_source(calls))
+    ids = ["a", "b"] * 6
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        transcripts = list(pool.map(cache.get, ids))
+    assert calls == {"a": 1, "b": 1}
+    assert [t[0]["text"] for t in transcripts] == ids
+    assert cache.stats()["misses"] == 2 and cache.stats()["refreshes"] == 0
+
+
+def test_concurrent_gets_share_the_error(tmp_path):
+    calls = Counter()
+    cache = TranscriptCache(str(tmp_path), source=counting_source(calls, fail=True))
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        futures = [pool.submit(cache.get, "a") for _ in range(4)]
+    for future in futures:
+        with pytest.raises(RuntimeError):
+            future.result()
+    assert calls["a"] < 4
@@ -0,0 +1,37 @@
+import random
+
+import pytest
+
+from windowing import (fixed_duration_boundaries, fixed_duration_boundaries_loop,
+                       fixed_duration_boundaries_vectorized)
+
+
+def random_durations(count, seed):
+    rng = random.Random(seed)
+    # Decimal fractions, so running sums land within rounding distance of the thresholds
+    return [rng.choice((0.1, 0.2, 0.3, 0.7, 1.1, 2.5, 0.0)) + rng.random() * rng.choice((0, 1e-9, 3))
+            for _ in range(count)]
+
+
+@pytest.mark.parametrize("seed", range(20))
+@pytest.mark.parametrize("segment_duration", [0.3, 1.0, 30, 60, 240])
+def test_vectorized_boundaries_match_loop(seed, segment_duration):
+    pytest.importorskip("numpy")
+    durations = random_durations(500, seed)
+    assert (fixed_duration_boundaries_vectorized(durations, segment_duration) ==
+            fixed_duration_boundaries_loop(durations, segment_duration))
+
+
+@pytest.mark.parametrize("durations", [[], [0.0] * 10, [0.1] * 30, [5.0], [float("nan"), 1.0, 2.0]])
+def test_vectorized_boundaries_match_loop_edge_cases(durations):
+    pytest.importorskip("numpy")
+    assert fixed_duration_boundaries_vectorized(durations, 0.3) == fixed_duration_boundaries_loop(durations, 0.3)
+
+
+def test_loop_boundaries_drop_trailing_partial_segment():
+    assert fixed_duration_boundaries_loop([1, 1, 1, 1, 1], 2) == [(0, 2), (2, 4)]
+
+
+def test_unknown_segmentation_mode():
+    with pytest.raises(ValueError):
+        fixed_duration_boundaries([1.0], 1.0, "quantum")
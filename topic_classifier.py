@@ -0,0 +1,225 @@
+import hashlib
+import math
+from collections import Counter, OrderedDict
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
+
+from search_index import tokenize
+
+CLASSIFY_CACHE_SIZE = 100_000  # segment texts whose topic is remembered
+
+# Cue words for every topic name the scripts use. A topic is scored by
+# how strongly a segment uses its cue words; words shared by several of a
+# subject's topics count for less (idf across that subject's topics).
+TOPIC_KEYWORDS: Dict[str, str] = {
+    # Math
+    "Basic Concepts": "called means definition idea concept understand basic introduction "
+                      "learn simple meaning term whole part",
+    "Mathematical Concepts": "concept definition property rule theorem formula means called idea "
+                             "understand why proof fraction decimal percent ratio angle shape",
+    # main.py and analysis.py name the same topic differently; both get one cue list
+    "Number Operations": "add addition plus subtract subtraction minus multiply multiplication times "
+                         "divide division sum difference product quotient carry borrow remainder "
+                         "calculate compute",
+    "Problem Solving": "problem solve solution answer question find step check "
+                       "word unknown strategy missing",
+    "Logical Reasoning": "because therefore reason logic true false prove must "
+                         "cannot always never conclude",
+    "Pattern Recognition": "pattern sequence repeat rule series increase decrease continue "
+                           "term order skip",
+    "Visual Representations": "graph chart diagram draw picture line bar table model grid "
+                              "plot axis shape",
+    "Practical Applications": "real life money buy shop price cost pay clock measure recipe "
+                              "everyday world build travel distance",
+    # Science
+    "Scientific Concepts": "energy force matter atom cell molecule mass gravity heat light sound "
+                           "concept called means definition",
+    "Scientific Principles": "law principle theory energy force matter conservation gravity motion "
+                             "newton pressure heat cell atom",
+    "Experimental Understanding": "experiment test observe result measure sample control variable "
+                                  "lab equipment",
+    "Experimental Methods": "experiment method procedure test observe measure sample control variable "
+                            "equipment repeat record",
+    "Natural Phenomena": "weather rain cloud wind volcano earthquake plant animal sun moon star "
+                         "season ocean river rock nature",
+    "Scientific Method": "hypothesis predict prediction experiment observe conclusion question test "
+                         "variable evidence data",
+    "Scientific Reasoning": "because evidence explain cause effect reason predict hypothesis "
+                            "conclusion therefore",
+    "Real-world Applications": "real life everyday technology machine electricity engine health "
+                               "food medicine environment build world",
+    "Data Analysis": "data graph chart table result measure record average compare trend number "
+                     "analyze pattern",
+    # English
+    "Grammar Rules": "grammar noun verb adjective adverb pronoun sentence tense past present future "
+                     "plural subject rule punctuation comma",
+    "Vocabulary": "word meaning means definition synonym antonym vocabulary dictionary spell "
+                  "prefix suffix root",
+    "Reading Comprehension": "read reading story text passage character author main idea paragraph "
+                             "understand question chapter book",
+    "Writing Skills": "write writing essay paragraph draft edit sentence introduction conclusion "
+                      "story letter plan",
+    "Speaking Practice": "speak pronounce pronunciation listen repeat conversation talk voice "
+                         "sound aloud practice",
+}
+TOPIC_KEYWORDS["Numerical Operations"] = TOPIC_KEYWORDS["Number Operations"]
+
+
+def _try_numpy():
+    """Scoring is one matrix product with numpy; without it the same sums run in a loop"""
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+class _SubjectModel:
+    """Precomputed term weights of one subject: a (topics x terms) matrix"""
+    def __init__(self, topics: Sequence[str], keywords: Mapping[str, str], np):
+        self.topics = list(topics)
+        cues = [sorted(set(tokenize(keywords.get(topic, topic)))) for topic in self.topics]
+        vocabulary = sorted({word for words in cues for word in words})
+        columns = {word: i for i, word in enumerate(vocabulary)}
+        documents = {word: sum(word in words for words in cues) for word in vocabulary}
+
+        # weights[t] = {column: idf}, L2-normalized so long cue lists don't win by size
+        self.weights: List[Dict[int, float]] = []
+        for words in cues:
+            row = {columns[w]: math.log(1 + len(self.topics) / documents[w]) for w in words}
+            norm = math.sqrt(sum(v * v for v in row.values())) or 1.0
+            self.weights.append({column: value / norm for column, value in row.items()})
+
+        # Tokens map straight to columns, plurals included, so texts need no stemming
+        self.term_columns: Dict[str, int] = {}
+        for word, column in columns.items():
+            self.term_columns[word] = column
+            if not word.endswith("s"):
+                self.term_columns.setdefault(word + "s", column)
+
+        # Per-term postings for the pure Python scorer
+        self.postings: Dict[int, List[Tuple[int, float]]] = {}
+        for topic, row in enumerate(self.weights):
+            for column, value in row.items():
+                self.postings.setdefault(column, []).append((topic, value))
+
+        self.matrix = None
+        if np is not None:
+            self.matrix = np.zeros((len(self.topics), len(vocabulary)))
+            for topic, row in enumerate(self.weights):
+                for column, value in row.items():
+                    self.matrix[topic, column] = value
+
+    def term_counts(self, text: str) -> Dict[int, int]:
+        # Counter tallies in C; only distinct words are then looked up
+        counts: Dict[int, int] = {}
+        columns = self.term_columns
+        for token, count in Counter(tokenize(text)).items():
+            column = columns.get(token)
+            if column is not None:
+                counts[column] = counts.get(column, 0) + count
+        return counts
+
+
+class TopicClassifier:
+    """
+    Deterministic topic tagging: each segment gets the topic of its
+    subject whose cue words it uses most (sublinear term counts against
+    idf weights), scored for a whole batch of segments in one matrix
+    product. Segments with no cue words get the subject's first topic.
+    Results are cached by subject and a hash of the segment text.
+    """
+    def __init__(self,
+                 topics_by_subject: Mapping[str, Sequence[str]],
+                 keywords: Mapping[str, str] = TOPIC_KEYWORDS,
+                 default_subject: Optional[str] = None,
+                 cache_size: int = CLASSIFY_CACHE_SIZE):
+        self._np = _try_numpy()
+        self.models = {subject: _SubjectModel(topics, keywords, self._np)
+                       for subject, topics in topics_by_subject.items()}
+        self.default_subject = default_subject
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[Tuple[str, bytes], str]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def _model(self, subject: str) -> _SubjectModel:
+        model = self.models.get(subject)
+        if model is None:
+            if self.default_subject is None:
+                raise KeyError(f"no topics for subject {subject!r}")
+            model = self.models[self.default_subject]
+        return model
+
+    def scores(self, texts: Sequence[str], subject: str) -> List[List[float]]:
+        """(segments x topics) scores, uncached"""
+        model = self._model(subject)
+        counts = [model.term_counts(text) for text in texts]
+        if self._np is not None and texts:
+            np = self._np
+            x = np.zeros((len(texts), model.matrix.shape[1]))
+            for row, row_counts in enumerate(counts):
+                if row_counts:
+                    x[row, list(row_counts)] = list(row_counts.values())
+            return (np.log1p(x) @ model.matrix.T).tolist()
+
+        scores = []
+        for row_counts in counts:
+            row = [0.0] * len(model.topics)
+            for column, count in row_counts.items():
+                tf = math.log1p(count)
+                for topic, weight in model.postings[column]:
+                    row[topic] += tf * weight
+            scores.append(row)
+        return scores
+
+    def classify_batch(self, texts: Sequence[str], subject: str) -> List[str]:
+        """Topic of every text; only texts not seen before are scored"""
+        model = self._model(subject)
+        keys = [(subject, hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()) for text in texts]
+        topics: List[Optional[str]] = []
+        missing: Dict[Tuple[str, bytes], int] = {}
+        for i, key in enumerate(keys):
+            topic = self._cache.get(key)
+            if topic is not None:
+                self._cache.move_to_end(key)
+                self.hits += 1
+            elif key not in missing:
+                missing[key] = i
+            topics.append(topic)
+
+        if missing:
+            self.misses += len(missing)
+            rows = self.scores([texts[i] for i in missing.values()], subject)
+            # max() keeps the first of equal scores, so ties are deterministic
+            fresh = {key: model.topics[max(range(len(row)), key=row.__getitem__)]
+                     for key, row in zip(missing, rows)}
+            self._cache.update(fresh)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+            topics = [topic if topic is not None else fresh[key] for topic, key in zip(topics, keys)]
+        return topics
+
+    def classify(self, text: str, subject: str) -> str:
+        return self.classify_batch([text], subject)[0]
+
+    def stats(self) -> Dict:
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_ratio': self.hits / lookups if lookups else 0.0,
+            'cached': len(self._cache)
+        }
+
+
+_classifiers: Dict[tuple, TopicClassifier] = {}
+
+
+def get_topic_classifier(topics_by_subject: Mapping[str, Sequence[str]],
+                         default_subject: Optional[str] = None) -> TopicClassifier:
+    """Shared classifier for a topic table, built on first use so importing a script stays cheap"""
+    key = (tuple((subject, tuple(topics)) for subject, topics in topics_by_subject.items()), default_subject)
+    classifier = _classifiers.get(key)
+    if classifier is None:
+        classifier = _classifiers[key] = TopicClassifier(topics_by_subject, default_subject=default_subject)
+    return classifier
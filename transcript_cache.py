@@ -0,0 +1,343 @@
+import atexit
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from file_lock import FileLock
+from profiling import timed
+
+# Where cached transcripts live, relative to the working directory
+DEFAULT_CACHE_DIR = ".transcript_cache"
+DEFAULT_LANGUAGES = ("en",)
+DEFAULT_MAX_ENTRIES = 512
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024  # 256 MB
+DEFAULT_TTL = 7 * 24 * 60 * 60  # one week
+
+INDEX_FILE = "index.json"
+INDEX_LOCK_FILE = "index.lock"
+INDEX_LOCK_STALE = 60.0  # index updates take milliseconds
+TOUCH_BATCH = 32  # cache hits whose access times are written to the index together
+TOUCH_INTERVAL = 30.0  # ...or once the oldest unwritten one is this many seconds old
+
+
+def fetch_from_youtube(youtube_id: str, languages: Sequence[str]) -> List[Dict]:
+    """Fetch a transcript straight from YouTube (no caching)"""
+    from youtube_transcript_api import YouTubeTranscriptApi
+    return YouTubeTranscriptApi.get_transcript(youtube_id, languages=list(languages))
+
+
+def atomic_write(path: str, data: bytes):
+    """Write data to path so readers never see a half-written file"""
+    directory = os.path.dirname(path) or "."
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        # mkstemp creates the file 0600; give the result normal permissions
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+class TranscriptCache:
+    """
+    On-disk transcript cache keyed by youtube_id and language.
+    Entries are evicted least-recently-used once the entry or byte budget is
+    exceeded, and refreshed from the source once they are older than the TTL.
+    Several processes may share cache_dir: the index is only rewritten under
+    a lock file, merged with what is on disk, and access times from cache
+    hits are written in batches rather than on every hit; call flush()
+    before dropping a cache (the default cache is flushed at exit).
+    """
+    def __init__(self,
+                 cache_dir: str = DEFAULT_CACHE_DIR,
+                 max_entries: int = DEFAULT_MAX_ENTRIES,
+                 max_bytes: int = DEFAULT_MAX_BYTES,
+                 ttl: float = DEFAULT_TTL,
+                 source: Callable[[str, Sequence[str]], List[Dict]] = fetch_from_youtube):
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.source = source
+        self.hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self.stale_hits = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+        self._index = self._load_index()
+        # key -> last_access of hits not yet written to the index
+        self._touched: Dict[str, float] = {}
+        self._touched_since = 0.0
+        # key -> result of the fetch in progress, shared by concurrent callers
+        self._inflight: Dict[str, Future] = {}
+
+    @staticmethod
+    def make_key(youtube_id: str, languages: Sequence[str]) -> str:
+        return f"{youtube_id}:{','.join(languages)}"
+
+    def _entry_path(self, key: str) -> str:
+        digest = hashlib.sha1(key.encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, f"{digest}.json")
+
+    def _load_index(self) -> Dict[str, Dict]:
+        try:
+            with open(os.path.join(self.cache_dir, INDEX_FILE), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _index_lock(self) -> FileLock:
+        return FileLock(os.path.join(self.cache_dir, INDEX_LOCK_FILE), stale_after=INDEX_LOCK_STALE)
+
+    def _reload_index(self):
+        """Pick up what other processes wrote, keeping our unwritten access times"""
+        index = self._load_index()
+        for key, last_access in self._touched.items():
+            meta = index.get(key)
+            if meta is not None and last_access > meta["last_access"]:
+                meta["last_access"] = last_access
+        self._index = index
+
+    def _save_index(self):
+        """Write the index (call under the index lock, after _reload_index)"""
+        data = json.dumps(self._index).encode("utf-8")
+        atomic_write(os.path.join(self.cache_dir, INDEX_FILE), data)
+        self._touched = {}
+
+    def _fresh_meta(self, key: str) -> Optional[Dict]:
+        meta = self._index.get(key)
+        if meta is None or time.time() - meta["fetched_at"] >= self.ttl:
+            # Another process may have fetched it since we last looked
+            self._reload_index()
+            meta = self._index.get(key)
+            if meta is None or time.time() - meta["fetched_at"] >= self.ttl:
+                return None
+        return meta
+
+    def _read_entry(self, key: str) -> Optional[List[Dict]]:
+        try:
+            with open(self._entry_path(key), "r", encoding="utf-8") as f:
+                return json.load(f)["transcript"]
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def _write_entry(self, key: str, youtube_id: str, languages: Sequence[str],
+                     transcript: List[Dict]):
+        data = json.dumps({
+            "youtube_id": youtube_id,
+            "languages": list(languages),
+            "transcript": transcript
+        }).encode("utf-8")
+        atomic_write(self._entry_path(key), data)
+        now = time.time()
+        self._index[key] = {
+            "fetched_at": now,
+            "last_access": now,
+            "size": len(data),
+            "digest": hashlib.sha256(data).hexdigest()
+        }
+
+    def _evict(self):
+        """Drop least-recently-used entries until we are back within budget"""
+        total_bytes = sum(meta["size"] for meta in self._index.values())
+        by_age = sorted(self._index, key=lambda k: self._index[k]["last_access"])
+        while by_age and (len(self._index) > self.max_entries or total_bytes > self.max_bytes):
+            key = by_age.pop(0)
+            total_bytes -= self._index.pop(key)["size"]
+            try:
+                os.remove(self._entry_path(key))
+            except OSError:
+                pass
+            self.evictions += 1
+
+    def lookup(self, youtube_id: str, languages: Sequence[str] = DEFAULT_LANGUAGES) -> Optional[List[Dict]]:
+        """Return a fresh cached transcript, or None if it must be fetched"""
+        key = self.make_key(youtube_id, tuple(languages))
+        with self._lock:
+            meta = self._fresh_meta(key)
+            if meta is None:
+                return None
+            cached = self._read_entry(key)
+            if cached is None:
+                return None
+            self.hits += 1
+            meta["last_access"] = self._touched[key] = time.time()
+            if len(self._touched) == 1:
+                self._touched_since = time.monotonic()
+            if len(self._touched) >= TOUCH_BATCH or time.monotonic() - self._touched_since >= TOUCH_INTERVAL:
+                self._flush()
+            return cached
+
+    def lookup_stale(self, youtube_id: str, languages: Sequence[str] = DEFAULT_LANGUAGES) -> Optional[List[Dict]]:
+        """Return a cached transcript even if it is past its TTL"""
+        key = self.make_key(youtube_id, tuple(languages))
+        with self._lock:
+            cached = self._read_entry(key) if key in self._index else None
+            if cached is not None:
+                self.stale_hits += 1
+            return cached
+
+    def fingerprint(self, youtube_id: str, languages: Sequence[str] = DEFAULT_LANGUAGES) -> Optional[str]:
+        """Content hash of a fresh cached transcript, without reading it"""
+        key = self.make_key(youtube_id, tuple(languages))
+        with self._lock:
+            meta = self._fresh_meta(key)
+            return None if meta is None else meta.get("digest")
+
+    def store(self, youtube_id: str, languages: Sequence[str], transcript: List[Dict]):
+        """Save a freshly fetched transcript and enforce the cache budget"""
+        languages = tuple(languages)
+        key = self.make_key(youtube_id, languages)
+        with self._lock, self._index_lock():
+            self._reload_index()
+            if key in self._index:
+                self.refreshes += 1
+            else:
+                self.misses += 1
+            self._write_entry(key, youtube_id, languages, transcript)
+            self._evict()
+            self._save_index()
+
+    def _flush(self):
+        if self._touched:
+            with self._index_lock():
+                self._reload_index()
+                self._save_index()
+
+    def flush(self):
+        """Write access times of recent cache hits to the shared index"""
+        with self._lock:
+            self._flush()
+
+    def get(self, youtube_id: str, languages: Sequence[str] = DEFAULT_LANGUAGES) -> List[Dict]:
+        """
+        Return the transcript, fetching from the source only when needed.
+        Concurrent calls for the same transcript share one fetch: the first
+        caller fetches, the rest wait for its result (or its error).
+        """
+        languages = tuple(languages)
+        cached = self.lookup(youtube_id, languages)
+        if cached is not None:
+            return cached
+
+        key = self.make_key(youtube_id, languages)
+        with self._lock:
+            flight = self._inflight.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._inflight[key] = Future()
+        if not leader:
+            transcript = flight.result()
+            with self._lock:
+                self.hits += 1
+            return transcript
+
+        try:
+            # A fetch that finished just before we took the lead has stored it already
+            transcript = self.lookup(youtube_id, languages)
+            if transcript is None:
+                transcript = self._fetch(youtube_id, languages)
+        except BaseException as e:
+            flight.set_exception(e)
+            raise
+        else:
+            flight.set_result(transcript)
+            return transcript
+        finally:
+            with self._lock:
+                del self._inflight[key]
+
+    def _fetch(self, youtube_id: str, languages: Tuple[str, ...]) -> List[Dict]:
+        # Fetch outside the lock so slow network calls don't serialize callers
+        try:
+            transcript = self.source(youtube_id, languages)
+        except Exception:
+            # Serve an expired copy rather than failing while offline
+            stale = self.lookup_stale(youtube_id, languages)
+            if stale is None:
+                raise
+            return stale
+
+        self.store(youtube_id, languages, transcript)
+        return transcript
+
+    def clear(self):
+        """Remove every cached transcript"""
+        with self._lock, self._index_lock():
+            self._reload_index()
+            for key in list(self._index):
+                try:
+                    os.remove(self._entry_path(key))
+                except OSError:
+                    pass
+            self._index = {}
+            self._save_index()
+
+    def stats(self) -> Dict:
+        """Hit/miss counters for this process plus current cache size"""
+        lookups = self.hits + self.misses + self.refreshes + self.stale_hits
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "refreshes": self.refreshes,
+            "stale_hits": self.stale_hits,
+            "evictions": self.evictions,
+            "hit_ratio": (self.hits + self.stale_hits) / lookups if lookups else 0.0,
+            "entries": len(self._index),
+            "bytes": sum(meta["size"] for meta in self._index.values())
+        }
+
+
+_default_cache: Optional[TranscriptCache] = None
+_default_cache_lock = threading.Lock()
+
+
+def get_default_cache() -> TranscriptCache:
+    """Shared cache used by the CLIP scripts"""
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = TranscriptCache()
+        return _default_cache
+
+
+def set_default_cache(cache: TranscriptCache):
+    """Swap the shared cache, e.g. to point at a stub transcript source"""
+    global _default_cache
+    with _default_cache_lock:
+        previous, _default_cache = _default_cache, cache
+    if previous is not None and previous is not cache:
+        previous.flush()
+
+
+@atexit.register
+def _flush_default_cache():
+    # One hook for the shared cache, rather than one per instance keeping every cache alive
+    if _default_cache is not None:
+        _default_cache.flush()
+
+
+@timed("fetch")
+def get_transcript(youtube_id: str, languages: Sequence[str] = DEFAULT_LANGUAGES) -> List[Dict]:
+    """Cached drop-in for YouTubeTranscriptApi.get_transcript"""
+    return get_default_cache().get(youtube_id, languages)
+
+
+def format_cache_stats(stats: Dict) -> str:
+    """One-line human readable cache summary"""
+    return (f"Transcript cache: {stats['hits']} hits, {stats['misses']} misses, "
+            f"{stats['refreshes']} refreshes ({stats['hit_ratio']:.0%} hit ratio), "
+            f"{stats['entries']} cached")
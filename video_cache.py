@@ -0,0 +1,238 @@
+import json
+import os
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+from file_lock import FileLock
+from transcript_cache import atomic_write
+
+DEFAULT_VIDEO_DIR = "videos"
+DEFAULT_MAX_BYTES = 5 * 1024 * 1024 * 1024  # 5 GB
+EVICTION_POLICIES = ("lru", "least_watched")
+
+INDEX_FILE = "index.json"
+LOCK_DIR = ".locks"
+STAGING_DIR = ".incoming"
+
+INDEX_LOCK_STALE = 60.0  # index updates take milliseconds
+DOWNLOAD_LOCK_STALE = 6 * 60 * 60  # a download lock older than this is abandoned
+
+
+class VideoCache:
+    """
+    Disk-budgeted cache of downloaded videos shared by every process on
+    the machine. A youtube_id is downloaded by one process at a time
+    (others wait on its lock file and then reuse the result), downloads
+    are staged outside the cache and renamed in only when complete, and
+    once the budget is exceeded the least recently used - or least
+    watched - videos are deleted.
+    """
+    def __init__(self,
+                 cache_dir: str = DEFAULT_VIDEO_DIR,
+                 max_bytes: int = DEFAULT_MAX_BYTES,
+                 policy: str = "lru"):
+        if policy not in EVICTION_POLICIES:
+            raise ValueError(f"unknown eviction policy {policy!r}, expected one of {EVICTION_POLICIES}")
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.policy = policy
+        self.hits = 0
+        self.misses = 0
+        self.waits = 0
+        self.evictions = 0
+
+    def path_for(self, youtube_id: str) -> str:
+        return os.path.join(self.cache_dir, f"{youtube_id}.mp4")
+
+    def staging_path(self, youtube_id: str) -> str:
+        """Stable per-id download location, so partial downloads can resume"""
+        return os.path.join(self.cache_dir, STAGING_DIR, f"{youtube_id}.mp4")
+
+    def _lock(self, name: str, stale_after: float) -> FileLock:
+        os.makedirs(os.path.join(self.cache_dir, LOCK_DIR), exist_ok=True)
+        return FileLock(os.path.join(self.cache_dir, LOCK_DIR, f"{name}.lock"), stale_after=stale_after)
+
+    def _download_lock(self, youtube_id: str) -> FileLock:
+        return self._lock(f"{youtube_id}.download", DOWNLOAD_LOCK_STALE)
+
+    def _read_index(self) -> Dict[str, Dict]:
+        try:
+            with open(os.path.join(self.cache_dir, INDEX_FILE), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _adopt_existing(self) -> Dict[str, Dict]:
+        """
+        Index for a cache directory that has none yet: videos downloaded
+        before the cache existed are adopted, last used when last written,
+        so they count against the budget and can be evicted
+        """
+        index = {}
+        try:
+            names = os.listdir(self.cache_dir)
+        except OSError:
+            return index
+        for name in names:
+            youtube_id, ext = os.path.splitext(name)
+            path = os.path.join(self.cache_dir, name)
+            if ext != ".mp4" or not os.path.isfile(path):
+                continue
+            stat = os.stat(path)
+            index[youtube_id] = {
+                "size": stat.st_size,
+                "created": stat.st_mtime,
+                "last_access": stat.st_mtime,
+                "watches": 0
+            }
+        return index
+
+    def _update_index(self, change: Callable[[Dict[str, Dict]], None]) -> Dict[str, Dict]:
+        """Read-modify-write the shared index under the index lock"""
+        with self._lock("index", INDEX_LOCK_STALE):
+            if os.path.exists(os.path.join(self.cache_dir, INDEX_FILE)):
+                index = self._read_index()
+            else:
+                index = self._adopt_existing()
+            change(index)
+            atomic_write(os.path.join(self.cache_dir, INDEX_FILE), json.dumps(index).encode("utf-8"))
+            return index
+
+    def lookup(self, youtube_id: str) -> Optional[str]:
+        """Path of a published video (and mark it used), or None"""
+        path = self.path_for(youtube_id)
+        found = []
+
+        def touch(index):
+            meta = index.get(youtube_id)
+            if meta is not None and os.path.exists(path) and os.path.getsize(path) == meta["size"]:
+                meta["last_access"] = time.time()
+                found.append(path)
+
+        self._update_index(touch)
+        return found[0] if found else None
+
+    def get(self, youtube_id: str, fetch: Callable[[str], None]) -> str:
+        """
+        Return the local path of youtube_id, calling fetch(staging_path)
+        to download it if no process on this machine has it yet
+        """
+        cached = self.lookup(youtube_id)
+        if cached is not None:
+            self.hits += 1
+            return cached
+
+        with self._download_lock(youtube_id) as lock:
+            if lock.waited:
+                self.waits += 1
+            # Whoever held the lock may have published it since we looked
+            cached = self.lookup(youtube_id)
+            if cached is not None:
+                self.hits += 1
+                return cached
+
+            self.misses += 1
+            staging = self.staging_path(youtube_id)
+            os.makedirs(os.path.dirname(staging), exist_ok=True)
+            fetch(staging)
+            path = self.publish(youtube_id, staging)
+        return path
+
+    def publish(self, youtube_id: str, staged_path: str) -> str:
+        """Atomically move a complete download into the cache and enforce the budget"""
+        path = self.path_for(youtube_id)
+        os.replace(staged_path, path)
+        size = os.path.getsize(path)
+
+        def add(index):
+            now = time.time()
+            previous = index.get(youtube_id, {})
+            index[youtube_id] = {
+                "size": size,
+                "created": now,
+                "last_access": now,
+                "watches": previous.get("watches", 0)
+            }
+            self._evict(index, keep=youtube_id)
+
+        self._update_index(add)
+        return path
+
+    def record_watch(self, youtube_id: str):
+        """Count a playback; the least_watched policy evicts by this"""
+        def watched(index):
+            meta = index.get(youtube_id)
+            if meta is not None:
+                meta["watches"] = meta.get("watches", 0) + 1
+                meta["last_access"] = time.time()
+
+        self._update_index(watched)
+
+    def _eviction_order(self, index: Dict[str, Dict]):
+        if self.policy == "least_watched":
+            return sorted(index, key=lambda k: (index[k].get("watches", 0), index[k]["last_access"]))
+        return sorted(index, key=lambda k: index[k]["last_access"])
+
+    def _evict(self, index: Dict[str, Dict], keep: str):
+        """Delete videos until the cache fits max_bytes (called under the index lock)"""
+        total = sum(meta["size"] for meta in index.values())
+        for youtube_id in self._eviction_order(index):
+            if total <= self.max_bytes:
+                break
+            # Never delete what was just published or what someone is (re)downloading
+            if youtube_id == keep or self._download_lock(youtube_id).held_by_someone():
+                continue
+            total -= index.pop(youtube_id)["size"]
+            try:
+                os.remove(self.path_for(youtube_id))
+            except OSError:
+                pass
+            self.evictions += 1
+
+    def stats(self) -> Dict:
+        """Counters for this process plus the shared cache's current usage"""
+        index = self._read_index()
+        lookups = self.hits + self.misses
+        used = sum(meta["size"] for meta in index.values())
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "waits": self.waits,
+            "evictions": self.evictions,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "entries": len(index),
+            "bytes": used,
+            "max_bytes": self.max_bytes,
+            "usage": used / self.max_bytes if self.max_bytes else 0.0,
+            "watches": sum(meta.get("watches", 0) for meta in index.values())
+        }
+
+
+_default_video_cache: Optional[VideoCache] = None
+_default_video_cache_lock = threading.Lock()
+
+
+def get_default_video_cache() -> VideoCache:
+    """Shared video cache used by the players"""
+    global _default_video_cache
+    with _default_video_cache_lock:
+        if _default_video_cache is None:
+            _default_video_cache = VideoCache()
+        return _default_video_cache
+
+
+def set_default_video_cache(cache: VideoCache):
+    global _default_video_cache
+    _default_video_cache = cache
+
+
+def format_video_cache_stats(stats: Dict) -> str:
+    """One-line human readable cache summary"""
+    return (f"Video cache: {stats['entries']} videos, {stats['bytes'] / 1024 / 1024:.1f} MB of "
+            f"{stats['max_bytes'] / 1024 / 1024:.0f} MB ({stats['usage']:.0%}), "
+            f"{stats['hits']} hits, {stats['misses']} downloads, {stats['evictions']} evicted")
+
+
+if __name__ == "__main__":
+    print(format_video_cache_stats(get_default_video_cache().stats()))
@@ -0,0 +1,269 @@
+import math
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Dict, Iterator, List, Sequence, Tuple
+
+from columnar_transcript import ColumnarTranscript
+from search_index import tokenize
+
+SEGMENTATION_MODES = ("loop", "vectorized")
+
+# Topic-shift segmentation: captions on each side of a gap that are compared
+TOPIC_WINDOW_CAPTIONS = 10
+# Words too common to say anything about the topic
+STOP_WORDS = frozenset("""
+a an the and or but so if then than that this these those there here it its it's is are was were
+be been being am do does did have has had i you he she we they me him her us them my your our their
+to of in on at by for with from as into about up down out over just not no yes can will would should
+could let's let ok okay now well um uh like what which who how when where why all some any one very
+""".split())
+
+
+def _import_numpy():
+    """numpy is optional and slow to import, so only the vectorized mode loads it"""
+    try:
+        import numpy
+    except ImportError:
+        raise ImportError("vectorized segmentation needs numpy (pip install numpy)") from None
+    return numpy
+
+
+class TranscriptWindower:
+    """
+    Answers "which captions start inside [start, end)?" with a bisect lookup
+    over a sorted start-time index instead of rescanning the transcript.
+    Building the index is one pass (plus a sort only if the captions arrive
+    out of order), so windowing a whole video stays linear in its length.
+    """
+    def __init__(self, transcript: ColumnarTranscript):
+        self.transcript = transcript
+        starts = transcript.starts
+
+        self.in_order = all(starts[i] <= starts[i + 1] for i in range(len(starts) - 1))
+        if self.in_order:
+            self.order = None
+            self.starts = starts
+        else:
+            # Stable sort keeps captions with equal start times in transcript order
+            self.order = sorted(range(len(starts)), key=starts.__getitem__)
+            self.starts = [starts[i] for i in self.order]
+
+    def text_between(self, start: float, end: float) -> str:
+        """Same text the per-window scan used to build, in one slice and join"""
+        lo = bisect_left(self.starts, start)
+        hi = bisect_left(self.starts, end, lo)
+        if self.order is None:
+            return self.transcript.text_range(lo, hi).strip()
+        return ' '.join(self.transcript.text(i) for i in sorted(self.order[lo:hi])).strip()
+
+
+def iter_fixed_duration_boundaries(durations: Sequence[float],
+                                   segment_duration: float) -> Iterator[Tuple[int, int]]:
+    """
+    [start, end) caption index ranges for fixed-duration segments, each
+    yielded as soon as it closes: a segment closes on the first caption
+    that brings its summed duration to segment_duration, and a trailing
+    partial segment is dropped.
+    """
+    segment_start = 0
+    current_duration = 0
+    for i, duration in enumerate(durations):
+        current_duration += duration
+        if current_duration >= segment_duration:
+            yield segment_start, i + 1
+            segment_start = i + 1
+            current_duration = 0
+
+
+def fixed_duration_boundaries_loop(durations: Sequence[float],
+                                   segment_duration: float) -> List[Tuple[int, int]]:
+    """Every boundary of iter_fixed_duration_boundaries, as a list"""
+    return list(iter_fixed_duration_boundaries(durations, segment_duration))
+
+
+def fixed_duration_boundaries_vectorized(durations: Sequence[float],
+                                         segment_duration: float) -> List[Tuple[int, int]]:
+    """
+    Same boundaries as fixed_duration_boundaries_loop, found from a single
+    cumulative sum: each segment closes at the first caption whose running
+    total reaches the previous boundary's total plus segment_duration,
+    which is a bisect over the prefix sums instead of a pass over captions.
+    That only pays off when segments span many captions: at 1M captions it
+    beats the loop about 2x for 3-minute segments and 3x for 10-minute
+    ones, but is slower for 30-second ones. Pass an array('d') such as
+    ColumnarTranscript.durations; converting a list costs about as much
+    as the whole loop.
+    Differences of prefix sums round differently from the loop's
+    sum-from-zero, so any segment whose total lands within rounding
+    distance of the threshold is re-added in the loop's order before its
+    boundary is accepted; the result always matches the loop exactly.
+    """
+    np = _import_numpy()
+    d = np.asarray(durations, dtype=np.float64)
+    n = len(d)
+    # Prefix sums are only monotonic for finite, non-negative durations
+    if n == 0 or not (np.isfinite(d).all() and (d >= 0).all()):
+        return fixed_duration_boundaries_loop(durations, segment_duration)
+
+    # Prefix sums copied into an array('d') so bisect can search them cheaply
+    totals = array('d')
+    totals.frombytes(np.cumsum(d).tobytes())
+    error_scale = 4 * float(np.finfo(np.float64).eps)
+
+    def exact_closing(start: int, guess: int) -> int:
+        """Closing caption found by summing from zero, as the loop does"""
+        stop = min(n, guess + 64)
+        while True:
+            local = np.cumsum(d[start:stop])
+            found = int(np.searchsorted(local, segment_duration, side='left'))
+            if found < len(local) or stop == n:
+                return start + found
+            stop = min(n, start + 2 * (stop - start))
+
+    boundaries = []
+    start = 0
+    base = 0.0
+    span = 64  # how far ahead to bisect first; tracks the last segment's length
+    while start < n:
+        target = base + segment_duration
+        hi = start + span if start + span < n else n
+        end = bisect_left(totals, target, start, hi)
+        if end == hi and hi < n:
+            end = bisect_left(totals, target, hi)
+
+        # Standard summation error bound for both ways of adding these captions
+        reach = end if end < n else n - 1
+        tolerance = error_scale * (reach - start + 2) * (totals[reach] + abs(segment_duration))
+        if end < n:
+            before = totals[end - 1] - base if end > start else 0.0
+            close_call = (abs(totals[end] - target) <= tolerance or
+                          abs(segment_duration - before) <= tolerance)
+        else:
+            close_call = abs(totals[reach] - target) <= tolerance
+        if close_call:
+            end = exact_closing(start, end)
+
+        if end >= n:
+            break  # Not enough captions left to fill another segment
+        boundaries.append((start, end + 1))
+        span = 2 * (end - start) + 16
+        start = end + 1
+        base = totals[end]
+    return boundaries
+
+
+def fixed_duration_boundaries(durations: Sequence[float], segment_duration: float,
+                              mode: str = "loop") -> List[Tuple[int, int]]:
+    """Pick the segmentation implementation at runtime"""
+    if mode == "vectorized":
+        return fixed_duration_boundaries_vectorized(durations, segment_duration)
+    if mode == "loop":
+        return fixed_duration_boundaries_loop(durations, segment_duration)
+    raise ValueError(f"unknown segmentation mode {mode!r}, expected one of {SEGMENTATION_MODES}")
+
+
+def _caption_terms(transcript: ColumnarTranscript) -> List[List[str]]:
+    return [[token for token in tokenize(transcript.text(i)) if token not in STOP_WORDS]
+            for i in range(len(transcript))]
+
+
+def gap_similarities(transcript: ColumnarTranscript,
+                     window_captions: int = TOPIC_WINDOW_CAPTIONS) -> List[float]:
+    """
+    similarities[g] is the cosine similarity between the term counts of
+    the window_captions captions before gap g (between captions g-1 and
+    g) and the window_captions captions after it; similarities[0] is
+    unused. Both windows slide one caption per gap and the dot product
+    and norms are updated per term moved, so the whole pass is linear in
+    the number of words.
+    """
+    terms = _caption_terms(transcript)
+    n = len(terms)
+    similarities = [1.0] * max(n, 1)
+    if n < 2:
+        return similarities
+
+    left: Dict[str, int] = {}
+    right: Dict[str, int] = {}
+    state = [0, 0, 0]  # dot product, left squared norm, right squared norm
+
+    def move(caption: int, side: Dict[str, int], other: Dict[str, int], norm: int, delta: int):
+        for term in terms[caption]:
+            old = side.get(term, 0)
+            new = old + delta
+            if new:
+                side[term] = new
+            else:
+                del side[term]
+            state[0] += delta * other.get(term, 0)
+            state[norm] += new * new - old * old
+
+    move(0, left, right, 1, 1)
+    for caption in range(1, min(n, 1 + window_captions)):
+        move(caption, right, left, 2, 1)
+
+    for gap in range(1, n):
+        dot, left_norm, right_norm = state
+        similarities[gap] = dot / math.sqrt(left_norm * right_norm) if left_norm and right_norm else 0.0
+        if gap + 1 < n:
+            # Caption `gap` crosses to the left; the windows each slide by one
+            move(gap, right, left, 2, -1)
+            move(gap, left, right, 1, 1)
+            if gap - window_captions >= 0:
+                move(gap - window_captions, left, right, 1, -1)
+            if gap + window_captions < n:
+                move(gap + window_captions, right, left, 2, 1)
+    return similarities
+
+
+def topic_shift_boundaries(transcript: ColumnarTranscript,
+                           min_duration: float,
+                           max_duration: float,
+                           window_captions: int = TOPIC_WINDOW_CAPTIONS) -> List[Tuple[int, int]]:
+    """
+    [start, end) caption index ranges covering the whole transcript, cut
+    where vocabulary similarity across a gap is lowest: each segment ends
+    at the least similar gap between min_duration and max_duration after
+    it starts (leaving at least min_duration for the rest when possible).
+    Each gap is looked at about max_duration / min_duration times, so
+    this stays linear too.
+    """
+    if min_duration <= 0 or max_duration < min_duration:
+        raise ValueError("need 0 < min_duration <= max_duration")
+    return list(iter_topic_shift_boundaries(transcript, min_duration, max_duration, window_captions))
+
+
+def iter_topic_shift_boundaries(transcript: ColumnarTranscript,
+                                min_duration: float,
+                                max_duration: float,
+                                window_captions: int = TOPIC_WINDOW_CAPTIONS) -> Iterator[Tuple[int, int]]:
+    """
+    The boundaries of topic_shift_boundaries, each yielded as soon as its
+    cut is chosen; only the similarity pass runs over the whole transcript
+    before the first one.
+    """
+    n = len(transcript)
+    if n == 0:
+        return
+    if min_duration <= 0 or max_duration < min_duration:
+        raise ValueError("need 0 < min_duration <= max_duration")
+    starts = transcript.starts
+    similarities = gap_similarities(transcript, window_captions)
+    end_time = transcript.end_time
+    latest = bisect_right(starts, end_time - min_duration)
+
+    first = 0
+    while True:
+        segment_start = starts[first]
+        lo = bisect_left(starts, segment_start + min_duration, first + 1)
+        if end_time - segment_start <= max_duration or lo >= n:
+            yield first, n
+            return
+        hi = min(bisect_right(starts, segment_start + max_duration, lo), latest)
+        if hi <= lo:
+            cut = lo
+        else:
+            # min() keeps the earliest of equally low gaps
+            cut = min(range(lo, hi), key=similarities.__getitem__)
+        yield first, cut
+        first = cut